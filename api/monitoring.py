@@ -1,10 +1,11 @@
 """모니터링 API"""
 
+from datetime import datetime
 from flask import Blueprint, jsonify, request
-from models import ProxyServer, MonitoringConfig, db, SessionRecord, ProxyGroup
+from models import ProxyServer, MonitoringConfig, db, SessionRecord, ProxyGroup, SessionSnapshot
 from backend import ProxyMonitor
 import logging
-from backend import monitoring_service
+from backend import monitoring_service, ssh_pool, reachability_prober, circuit_breakers, snmp_engine, SNMP_TABLES, session_history
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +13,17 @@ monitoring_bp = Blueprint('monitoring', __name__)
 
 @monitoring_bp.route('/resources', methods=['GET'])
 def get_resources():
-    """모든 활성 프록시의 리소스 사용률 조회 (group_id 필터 지원)"""
+    """모든 활성 프록시의 리소스 사용률 조회 (group_id, max_workers, host_timeout, deadline 지원)"""
     try:
         group_id = request.args.get('group_id', type=int)
-        resources_data = monitoring_service.collect_resources(group_id)
-        return jsonify({'success': True, 'data': resources_data, 'total_proxies': len(resources_data)})
+        resources_data = monitoring_service.collect_resources(
+            group_id,
+            max_workers=request.args.get('max_workers', type=int),
+            host_timeout=request.args.get('host_timeout', type=float),
+            deadline=request.args.get('deadline', type=float)
+        )
+        partial = any(item['status'] != 'ok' for item in resources_data)
+        return jsonify({'success': True, 'data': resources_data, 'total_proxies': len(resources_data), 'partial': partial})
         
     except Exception as e:
         logger.error(f"리소스 데이터 조회 실패: {e}")
@@ -182,13 +189,96 @@ def get_monitoring_summary():
                     'offline': stat.total - (stat.active or 0)
                 }
                 for stat in group_stats
-            ]
+            ],
+            'circuit_breakers': circuit_breakers.summary()
         })
         
     except Exception as e:
         logger.error(f"모니터링 요약 조회 실패: {e}")
         return jsonify({'error': str(e)}), 500
 
+@monitoring_bp.route('/ssh-pool', methods=['GET'])
+def get_ssh_pool_stats():
+    """SSH 연결 풀 통계 조회 (hit/miss, 유휴 연결 등)"""
+    try:
+        return jsonify({'success': True, 'stats': ssh_pool.get_stats()})
+    except Exception as e:
+        logger.error(f"SSH 풀 통계 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/snmp-engine', methods=['GET'])
+def get_snmp_engine_stats():
+    """공유 SNMP 엔진 통계 조회 (요청 수, 캐시된 전송 대상 등)"""
+    try:
+        return jsonify({'success': True, 'stats': snmp_engine.get_stats()})
+    except Exception as e:
+        logger.error(f"SNMP 엔진 통계 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/snmp-table/<int:proxy_id>', methods=['GET'])
+def get_snmp_table(proxy_id):
+    """SNMP 테이블 조회 (GETBULK). ?table=processes|interfaces, max_repetitions, count_by=<컬럼> 지원"""
+    try:
+        proxy = ProxyServer.query.get_or_404(proxy_id)
+        table_name = request.args.get('table', default='processes')
+        if table_name not in SNMP_TABLES:
+            return jsonify({'error': f'알 수 없는 SNMP 테이블: {table_name}'}), 400
+        max_repetitions = request.args.get('max_repetitions', type=int)
+        count_by = request.args.get('count_by')
+
+        monitor = ProxyMonitor(
+            host=proxy.host,
+            snmp_port=proxy.snmp_port,
+            snmp_community=proxy.snmp_community
+        )
+        table = monitor.walk_snmp_table(table_name, max_repetitions=max_repetitions)
+        result = {
+            'success': True,
+            'proxy_id': proxy.id,
+            'host': proxy.host,
+            'table': table_name,
+            'data': table.to_dict()
+        }
+        if count_by:
+            if count_by not in table.columns:
+                return jsonify({'error': f'알 수 없는 컬럼: {count_by}'}), 400
+            result['counts'] = table.count_by(count_by)
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"SNMP 테이블 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/reachability', methods=['GET'])
+def get_reachability():
+    """프록시별 SSH 포트 도달성 RTT 통계 (p50/p95/p99). ?probe=1 시 즉시 전체 점검 후 반환 (group_id 필터 지원)"""
+    try:
+        group_id = request.args.get('group_id', type=int)
+        probe = request.args.get('probe', default='0') == '1'
+        query = ProxyServer.query
+        if group_id:
+            query = query.filter(ProxyServer.group_id == group_id)
+        proxies = query.all()
+
+        results = {}
+        if probe:
+            results = reachability_prober.sweep({p.id: (p.host, p.ssh_port or 22) for p in proxies})
+
+        data = []
+        for proxy in proxies:
+            item = {
+                'proxy_id': proxy.id,
+                'proxy_name': proxy.name,
+                'group_name': proxy.group.name if proxy.group else None,
+                'latency': reachability_prober.get_host_stats(proxy.host, proxy.ssh_port or 22)
+            }
+            if proxy.id in results:
+                item['result'] = results[proxy.id]
+            data.append(item)
+        return jsonify({'success': True, 'data': data, 'last_sweep': reachability_prober.last_sweep})
+    except Exception as e:
+        logger.error(f"도달성 통계 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @monitoring_bp.route('/config', methods=['GET'])
 def get_monitoring_config():
     """활성 모니터링 설정 조회"""
@@ -226,7 +316,7 @@ def get_sessions():
         # 선택적으로 그룹 전체를 DB에 저장 (조회 시 자동 저장 옵션)
         saved = 0
         if group_id and persist:
-            saved = monitoring_service.collect_sessions_by_group(group_id, persist=True)
+            saved = monitoring_service.collect_sessions_by_group(group_id, persist=True)['saved']
 
         results = []
         for proxy in active_proxies:
@@ -251,7 +341,9 @@ def get_sessions():
                     'unique_clients': info.get('unique_clients', 0),
                     'total_sessions': info.get('total_sessions', 0),
                     'headers': info.get('headers') or [],
-                    'sessions': info.get('sessions', [])
+                    'sessions': info.get('sessions', []),
+                    'transfer': info.get('transfer'),
+                    'error': info.get('error')
                 })
             except Exception as e:
                 logger.error(f"세션 조회 실패 ({proxy.name}): {e}")
@@ -273,8 +365,17 @@ def get_sessions_by_proxy(proxy_id):
         # 옵션: 조회 시 저장
         persist = request.args.get('persist', default='0') == '1'
         saved = 0
+        ingest = None
         if persist:
-            saved = monitoring_service.collect_sessions_by_proxy(proxy_id, replace=True)
+            ingest = monitoring_service.collect_sessions_by_proxy(proxy_id, replace=True)
+            saved = ingest['saved']
+
+        # 라이브 조회 필터 (장비에서 먼저 필터링)
+        filters = {
+            key: request.args.get(key)
+            for key in ('client_ip', 'user', 'url')
+            if request.args.get(key)
+        }
 
         monitor = ProxyMonitor(
             host=proxy.host,
@@ -284,8 +385,10 @@ def get_sessions_by_proxy(proxy_id):
             snmp_port=proxy.snmp_port,
             snmp_community=proxy.snmp_community
         )
-        info = monitor.get_session_info()
-        return jsonify({
+        # format=columnar: 행 목록 대신 컬럼별 값 목록으로 응답
+        columnar = request.args.get('format') == 'columnar'
+        info = monitor.get_session_info(filters=filters, columnar=columnar)
+        result = {
             'proxy_id': proxy.id,
             'proxy_name': proxy.name,
             'host': proxy.host,
@@ -294,24 +397,118 @@ def get_sessions_by_proxy(proxy_id):
             'unique_clients': info.get('unique_clients', 0),
             'total_sessions': info.get('total_sessions', 0),
             'headers': info.get('headers') or [],
-            'sessions': info.get('sessions', []),
-            'saved': saved
-        })
+            'transfer': info.get('transfer'),
+            'strings': info.get('strings'),
+            'error': info.get('error'),
+            'filters': filters,
+            'saved': saved,
+            'ingest': ingest
+        }
+        if columnar:
+            result['columns'] = info['sessions'].to_columns()
+        else:
+            result['sessions'] = info.get('sessions', [])
+        return jsonify(result)
     except Exception as e:
         logger.error(f"특정 프록시 세션 조회 실패: {e}")
         return jsonify({'error': str(e)}), 500
 
 @monitoring_bp.route('/sessions/group/<int:group_id>', methods=['GET'])
 def collect_sessions_by_group(group_id):
-    """그룹 단위 세션 수집 및 임시저장. ?persist=1 시 기존 그룹 데이터 삭제 후 저장"""
+    """그룹 단위 세션 수집 및 임시저장. ?persist=1 시 그룹 저장 레코드를 프록시별 새 덤프와 증분 동기화(조회 실패 프록시의 레코드는 유지), ?batch_size=N 저장 배치 크기"""
     try:
         persist = request.args.get('persist', default='1') == '1'
-        saved = monitoring_service.collect_sessions_by_group(group_id, persist=persist)
-        return jsonify({'success': True, 'group_id': group_id, 'saved': saved})
+        batch_size = request.args.get('batch_size', type=int)
+        if batch_size is not None and batch_size < 1:
+            return jsonify({'error': 'batch_size는 1 이상이어야 합니다.'}), 400
+        ingest = monitoring_service.collect_sessions_by_group(group_id, persist=persist, batch_size=batch_size)
+        return jsonify({
+            'success': True,
+            'group_id': group_id,
+            'saved': ingest['saved'],
+            'ingest': ingest
+        })
     except Exception as e:
         logger.error(f"그룹 세션 수집 실패: {e}")
         return jsonify({'error': str(e)}), 500
 
+@monitoring_bp.route('/sessions/history', methods=['GET'])
+def get_session_history():
+    """세션 스냅샷 세대 목록. 파라미터: group_id, proxy_id, start/end(ISO 시각, UTC), limit, rows=1(행 포함), row_limit, offset"""
+    try:
+        group_id = request.args.get('group_id', type=int)
+        proxy_id = request.args.get('proxy_id', type=int)
+        limit = request.args.get('limit', default=100, type=int)
+        try:
+            start = datetime.fromisoformat(request.args['start']) if request.args.get('start') else None
+            end = datetime.fromisoformat(request.args['end']) if request.args.get('end') else None
+        except ValueError:
+            return jsonify({'error': 'start/end는 ISO 형식 시각이어야 합니다.'}), 400
+
+        snapshots = session_history.list_snapshots(group_id=group_id, proxy_id=proxy_id,
+                                                   start=start, end=end, limit=limit)
+        result = {
+            'success': True,
+            'snapshots': [snapshot.to_dict() for snapshot in snapshots],
+            'stats': session_history.stats()
+        }
+        if request.args.get('rows') == '1':
+            result['rows'] = session_history.snapshot_rows(
+                snapshots,
+                limit=request.args.get('row_limit', default=1000, type=int),
+                offset=request.args.get('offset', default=0, type=int),
+                proxy_id=proxy_id
+            )
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"세션 이력 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/sessions/history/latest', methods=['GET'])
+def get_latest_session_snapshot():
+    """최신 세대의 세션 행. 파라미터: group_id 또는 proxy_id, limit, offset"""
+    try:
+        group_id = request.args.get('group_id', type=int)
+        proxy_id = request.args.get('proxy_id', type=int)
+        snapshot = session_history.latest_snapshot(group_id=group_id, proxy_id=proxy_id)
+        if snapshot is None:
+            return jsonify({'error': '저장된 스냅샷이 없습니다.'}), 404
+        rows = session_history.snapshot_rows(
+            [snapshot],
+            limit=request.args.get('limit', default=1000, type=int),
+            offset=request.args.get('offset', default=0, type=int)
+        )
+        return jsonify({'success': True, 'snapshot': snapshot.to_dict(), 'rows': rows})
+    except Exception as e:
+        logger.error(f"최신 세션 스냅샷 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/sessions/history/<int:snapshot_id>', methods=['GET'])
+def get_session_snapshot(snapshot_id):
+    """특정 세대의 세션 행. 파라미터: limit, offset"""
+    try:
+        snapshot = SessionSnapshot.query.get(snapshot_id)
+        if snapshot is None:
+            return jsonify({'error': '스냅샷을 찾을 수 없습니다.'}), 404
+        rows = session_history.snapshot_rows(
+            [snapshot],
+            limit=request.args.get('limit', default=1000, type=int),
+            offset=request.args.get('offset', default=0, type=int)
+        )
+        return jsonify({'success': True, 'snapshot': snapshot.to_dict(), 'rows': rows})
+    except Exception as e:
+        logger.error(f"세션 스냅샷 조회 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/sessions/history/retention', methods=['POST'])
+def apply_session_history_retention():
+    """보존 정책 즉시 적용 (만료/예산 초과 파티션 삭제)"""
+    try:
+        return jsonify({'success': True, 'result': session_history.apply_retention()})
+    except Exception as e:
+        logger.error(f"세션 이력 정리 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @monitoring_bp.route('/sessions/datatables', methods=['GET'])
 def get_sessions_datatables():
     """DataTables 서버 사이드 처리 API"""
@@ -4,9 +4,31 @@ from flask import Blueprint, request, jsonify
 from models import db, ProxyGroup, ProxyServer
 from backend import proxy_manager
 from backend import device_manager
+from backend import ssh_pool
+from backend import reachability_prober
+from backend import snmp_engine
 
 proxy_bp = Blueprint('proxy', __name__)
 
+
+def _release_connections(host, ssh_port, username):
+    """다른 프록시가 같은 (host, port, user)를 쓰지 않으면 풀의 SSH 연결 정리"""
+    if not ProxyServer.query.filter_by(host=host, ssh_port=ssh_port, username=username).count():
+        ssh_pool.invalidate(host, ssh_port, username)
+
+
+def _forget_reachability(host, ssh_port):
+    """다른 프록시가 같은 (host, port)를 쓰지 않으면 도달성(RTT) 이력 삭제"""
+    if not ProxyServer.query.filter_by(host=host, ssh_port=ssh_port).count():
+        reachability_prober.forget(host, ssh_port or 22)
+
+
+def _forget_snmp_target(host, snmp_port):
+    """다른 프록시가 같은 (host, SNMP port)를 쓰지 않으면 캐시된 SNMP 전송 대상 제거"""
+    if not ProxyServer.query.filter_by(host=host, snmp_port=snmp_port).count():
+        snmp_engine.invalidate_target(host, snmp_port)
+
+
 # ==================== 프록시 그룹 관리 ====================
 
 @proxy_bp.route('/groups', methods=['GET'])
@@ -162,6 +184,8 @@ def update_proxy(proxy_id):
     try:
         proxy = ProxyServer.query.get_or_404(proxy_id)
         data = request.get_json()
+        previous = (proxy.host, proxy.ssh_port, proxy.username, proxy.password)
+        previous_snmp = (proxy.host, proxy.snmp_port)
         
         # 그룹 ID 검증
         if data.get('group_id'):
@@ -199,6 +223,16 @@ def update_proxy(proxy_id):
         
         db.session.commit()
         
+        # 접속 정보가 바뀌면 이전 정보로 맺은 풀 연결 정리
+        if previous[:3] != (proxy.host, proxy.ssh_port, proxy.username):
+            _release_connections(*previous[:3])
+        elif previous[3] != proxy.password:
+            ssh_pool.invalidate(proxy.host, proxy.ssh_port, proxy.username)
+        if previous[:2] != (proxy.host, proxy.ssh_port):
+            _forget_reachability(*previous[:2])
+        if previous_snmp != (proxy.host, proxy.snmp_port):
+            _forget_snmp_target(*previous_snmp)
+        
         # 장비 매니저 반영
         device_manager.add_or_update(proxy)
         
@@ -216,8 +250,13 @@ def delete_proxy(proxy_id):
         # 장비 매니저에서 제거
         device_manager.remove(proxy_id)
         
+        target = (proxy.host, proxy.ssh_port, proxy.username)
+        snmp_target = (proxy.host, proxy.snmp_port)
         db.session.delete(proxy)
         db.session.commit()
+        _release_connections(*target)
+        _forget_reachability(*target[:2])
+        _forget_snmp_target(*snmp_target)
         
         return jsonify({'message': '프록시가 삭제되었습니다.'})
     except Exception as e:
@@ -11,10 +11,22 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///ppat.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # SQLite 연결 PRAGMA 프로필 (default / concurrent / durable, backend.storage 참고)
+    app.config['STORAGE_PROFILE'] = os.environ.get('STORAGE_PROFILE', 'concurrent')
+    # 세션 스냅샷 이력 (시간 버킷별 파티션, 보존 기간/행 수 예산 초과분은 파티션 단위 삭제)
+    app.config['SESSION_HISTORY_ENABLED'] = os.environ.get('SESSION_HISTORY_ENABLED', '0') == '1'
+    app.config['SESSION_HISTORY_BUCKET_SECONDS'] = int(os.environ.get('SESSION_HISTORY_BUCKET_SECONDS', '3600'))
+    app.config['SESSION_HISTORY_RETENTION_HOURS'] = float(os.environ.get('SESSION_HISTORY_RETENTION_HOURS', '168'))
+    app.config['SESSION_HISTORY_MAX_ROWS'] = int(os.environ.get('SESSION_HISTORY_MAX_ROWS', '5000000'))
     
     # 데이터베이스 초기화
     from models import db
     db.init_app(app)
+
+    # SQLite 이면 새 연결마다 저장소 프로필 PRAGMA 적용 (WAL 등, 연결이 열리기 전에 등록)
+    from backend.storage import install_storage_profile
+    with app.app_context():
+        install_storage_profile(db.engine, app.config['STORAGE_PROFILE'])
     
     # 블루프린트 등록
     from api.proxy import proxy_bp
@@ -78,19 +90,21 @@ def create_app():
             if 'url_host' not in cols:
                 db.session.execute(db.text('ALTER TABLE session_records ADD COLUMN url_host VARCHAR(255)'))
                 db.session.commit()
+            config_cols = [c['name'] for c in insp.get_columns('monitoring_configs')]
+            if 'session_compression' not in config_cols:
+                db.session.execute(db.text("ALTER TABLE monitoring_configs ADD COLUMN session_compression VARCHAR(16) DEFAULT 'none'"))
+                db.session.commit()
+            session_indexes = [i['name'] for i in insp.get_indexes('session_records')]
+            if 'ix_session_records_sync_key' not in session_indexes:
+                db.session.execute(db.text('CREATE INDEX ix_session_records_sync_key ON session_records (proxy_id, "transaction", creation_time)'))
+                db.session.commit()
             # 백필: policy -> url, 그리고 url_host 파생
-            from urllib.parse import urlparse
+            from backend.session_ingest import extract_host
             records = SessionRecord.query.all()
             changed = 0
             for r in records:
                 src_url = r.url or r.policy
-                host = None
-                if src_url:
-                    try:
-                        parsed = urlparse(src_url if '://' in src_url else f'//{src_url}', allow_fragments=True)
-                        host = parsed.hostname
-                    except Exception:
-                        host = None
+                host = extract_host(src_url) or None
                 updated = False
                 if (not r.url) and r.policy:
                     r.url = r.policy
@@ -220,9 +234,9 @@ def create_app():
             saved = 0
             if persist:
                 if group_id:
-                    saved = monitoring_service.collect_sessions_by_group(group_id, persist=True)
+                    saved = monitoring_service.collect_sessions_by_group(group_id, persist=True)['saved']
                 elif proxy_id:
-                    saved = monitoring_service.collect_sessions_by_proxy(proxy_id, replace=True)
+                    saved = monitoring_service.collect_sessions_by_proxy(proxy_id, replace=True)['saved']
             # 현재 저장된 총 레코드 (필터 적용)
             query = SessionRecord.query
             if group_id:
@@ -3,6 +3,15 @@
 from .proxy_client import ProxyClient
 from .proxy_manager import ProxyManager, proxy_manager
 from .monitoring import ProxyMonitor
+from .ssh_pool import SSHConnectionPool, ssh_pool
+from .probe import ProbeBundle
+from .session_parser import SessionTableParser, SessionColumns, StringInterner
+from .session_ingest import SessionFieldMapping, extract_host, host_cache_stats
+from .session_history import SessionHistoryStore, session_history
+from .storage import STORAGE_PROFILES, install_storage_profile
+from .reachability import ReachabilityProber, reachability_prober
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, circuit_breakers
+from .snmp import SharedSnmpEngine, SnmpTable, SNMP_TABLES, snmp_engine
 from .services import DeviceManager, device_manager, MonitoringService, monitoring_service
 from . import utils
 
@@ -11,6 +20,28 @@ __all__ = [
     'ProxyManager',
     'proxy_manager',
     'ProxyMonitor',
+    'SSHConnectionPool',
+    'ssh_pool',
+    'ProbeBundle',
+    'SessionTableParser',
+    'SessionColumns',
+    'StringInterner',
+    'SessionFieldMapping',
+    'extract_host',
+    'host_cache_stats',
+    'SessionHistoryStore',
+    'session_history',
+    'STORAGE_PROFILES',
+    'install_storage_profile',
+    'ReachabilityProber',
+    'reachability_prober',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'circuit_breakers',
+    'SharedSnmpEngine',
+    'SnmpTable',
+    'SNMP_TABLES',
+    'snmp_engine',
     'DeviceManager',
     'device_manager',
     'MonitoringService',
@@ -0,0 +1,209 @@
+"""장비별 회로 차단기 모듈 (platform)
+
+연결 실패가 연속되면 해당 장비로의 연결 시도를 일정 시간 즉시 실패시켜
+응답 없는 장비 하나가 요청 스레드를 수십 초씩 붙잡지 않도록 한다.
+
+상태 전이:
+    closed --(연속 실패 failure_threshold회)--> open
+    open --(probe 간격 경과)--> half_open (시험 요청 1건만 허용)
+    half_open --(성공)--> closed
+    half_open --(실패)--> open (probe 간격을 multiplier배로 늘림, max_interval 상한)
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .utils import logger
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(ConnectionError):
+    """회로가 열려 있어 연결을 시도하지 않고 즉시 실패
+
+    probing=True 는 half_open 상태에서 다른 호출의 시험 연결이 진행 중이라 거절된 경우이며,
+    retry_after 는 그 시험 요청이 결과 없이 만료될 때까지의 최대 대기 시간이다.
+    """
+
+    def __init__(self, host: str, retry_after: float, probing: bool = False):
+        self.host = host
+        self.retry_after = retry_after
+        self.probing = probing
+        if probing:
+            message = f"{host} 회로 차단 중: 시험 연결 진행 중 (최대 {retry_after:.0f}초 후 재시도)"
+        else:
+            message = f"{host} 회로 차단 중: {retry_after:.0f}초 후 재시도"
+        super().__init__(message)
+
+
+class CircuitBreaker:
+    """장비 하나에 대한 회로 차단기"""
+
+    def __init__(self, host: str, failure_threshold: int = 3, base_interval: float = 5.0,
+                 max_interval: float = 300.0, multiplier: float = 2.0, probe_timeout: float = 120.0):
+        """
+        Args:
+            host: 대상 장비
+            failure_threshold: open으로 전환할 연속 실패 횟수
+            base_interval: 처음 open된 뒤 시험 요청까지 대기 시간 (초)
+            max_interval: 시험 요청 간격 상한 (초)
+            multiplier: half_open 시험 실패 시 간격 증가 배수
+            probe_timeout: half_open 시험 요청이 결과를 보고하지 않을 때 다음 시험을 허용할 시간 (초)
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.probe_timeout = probe_timeout
+
+        self._lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.current_interval = base_interval
+        self.next_probe_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.last_failure: Optional[str] = None
+        self.last_state_change = datetime.now().isoformat()
+
+    def _transition(self, state: str) -> None:
+        if self.state != state:
+            logger.info(f"회로 상태 변경 ({self.host}): {self.state} -> {state}")
+            self.state = state
+            self.last_state_change = datetime.now().isoformat()
+
+    def _open(self, now: float) -> None:
+        self.next_probe_at = now + self.current_interval
+        self._probe_started_at = None
+        self._transition(STATE_OPEN)
+
+    def allow_request(self) -> bool:
+        """연결 시도 허용 여부. open 상태에서 간격이 지나면 시험 요청 1건을 허용한다"""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and now >= self.next_probe_at:
+                self._transition(STATE_HALF_OPEN)
+                self._probe_started_at = now
+                return True
+            if (self.state == STATE_HALF_OPEN and self._probe_started_at is not None
+                    and now - self._probe_started_at >= self.probe_timeout):
+                # 결과를 보고하지 않은 시험 요청은 버리고 새 시험을 허용
+                self._probe_started_at = now
+                return True
+            self.total_rejections += 1
+            return False
+
+    def _retry_after(self, now: float) -> float:
+        if self.state == STATE_OPEN:
+            return max(0.0, self.next_probe_at - now)
+        if self.state == STATE_HALF_OPEN and self._probe_started_at is not None:
+            # 진행 중인 시험 요청이 결과 없이 만료되는 시점 (그 전에 결과가 나오면 더 빨라진다)
+            return max(0.0, self._probe_started_at + self.probe_timeout - now)
+        return 0.0
+
+    def retry_after(self) -> float:
+        """다음 시험 요청까지 남은 시간 (초, half_open이면 진행 중인 시험 요청의 최대 대기 시간)"""
+        with self._lock:
+            return self._retry_after(time.monotonic())
+
+    def rejection(self) -> CircuitOpenError:
+        """현재 상태로 거절할 때의 CircuitOpenError"""
+        with self._lock:
+            return CircuitOpenError(self.host, self._retry_after(time.monotonic()),
+                                    probing=self.state == STATE_HALF_OPEN)
+
+    def check(self) -> None:
+        """허용되지 않으면 CircuitOpenError 발생"""
+        if not self.allow_request():
+            raise self.rejection()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.current_interval = self.base_interval
+            self._probe_started_at = None
+            self._transition(STATE_CLOSED)
+
+    def record_failure(self, error: Any = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            if error is not None:
+                self.last_failure = str(error)
+            if self.state == STATE_HALF_OPEN:
+                self.current_interval = min(self.current_interval * self.multiplier, self.max_interval)
+                self._open(now)
+            elif self.state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self.current_interval = self.base_interval
+                self._open(now)
+
+    def reset(self) -> None:
+        """수동 초기화 (closed)"""
+        self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_after = self._retry_after(time.monotonic())
+            return {
+                'host': self.host,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'total_failures': self.total_failures,
+                'total_rejections': self.total_rejections,
+                'probe_interval': self.current_interval,
+                'retry_after': round(retry_after, 1),
+                'last_failure': self.last_failure,
+                'last_state_change': self.last_state_change,
+            }
+
+
+class CircuitBreakerRegistry:
+    """장비별 회로 차단기 저장소 (ProxyMonitor, ProxyClient, DeviceManager 공용)"""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, **self.breaker_options)
+                self._breakers[host] = breaker
+            return breaker
+
+    def reset(self, host: str) -> None:
+        with self._lock:
+            breaker = self._breakers.get(host)
+        if breaker is not None:
+            breaker.reset()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+    def summary(self) -> Dict[str, Any]:
+        """상태별 개수와 closed가 아닌 차단기 목록"""
+        items = self.snapshot()
+        counts = {STATE_CLOSED: 0, STATE_OPEN: 0, STATE_HALF_OPEN: 0}
+        for item in items:
+            counts[item['state']] += 1
+        return {
+            'counts': counts,
+            'tripped': [item for item in items if item['state'] != STATE_CLOSED],
+        }
+
+
+# 전역 회로 차단기 저장소
+circuit_breakers = CircuitBreakerRegistry()
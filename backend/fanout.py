@@ -0,0 +1,209 @@
+"""장비 일괄 작업 병렬 실행 모듈 (platform)
+
+여러 장비에 같은 작업을 동시에 실행하고, 장비별 제한 시간과 전체 제한 시간을 적용한다.
+제한 시간을 넘긴 장비는 결과를 기다리지 않고 상태만 표시해 부분 결과를 반환한다.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from .utils import logger
+
+# 장비별 결과 상태
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+STATUS_TIMEOUT = 'timeout'
+STATUS_SKIPPED = 'skipped'
+STATUS_CANCELLED = 'cancelled'
+
+# 대기 중인 작업이 아직 시작되지 않았거나 취소 여부를 확인할 때의 폴링 주기 (초)
+_POLL_INTERVAL = 0.1
+
+Outcome = Dict[str, Any]
+
+
+def _iter_outcomes(executor: ThreadPoolExecutor,
+                   tasks: Dict[Hashable, Callable[[], Any]],
+                   host_timeout: Optional[float],
+                   deadline: Optional[float],
+                   cancel_event: Optional[threading.Event]) -> Iterator[Tuple[Hashable, Outcome]]:
+    """작업을 executor에 제출하고 끝나는 순서대로 (key, outcome)을 내보낸다
+
+    outcome: {'status', 'result', 'error', 'elapsed'}
+    소비자가 중간에 반복을 멈추면 아직 시작하지 않은 작업은 취소된다.
+    """
+    if not tasks:
+        return
+
+    started_at: Dict[Hashable, float] = {}
+    started_lock = threading.Lock()
+    global_end = time.monotonic() + deadline if deadline else None
+
+    def run(key, fn):
+        with started_lock:
+            started_at[key] = time.monotonic()
+        return fn()
+
+    def start_of(key):
+        with started_lock:
+            return started_at.get(key)
+
+    def elapsed_of(key, now):
+        start = start_of(key)
+        return round(now - start, 3) if start is not None else 0.0
+
+    futures = {executor.submit(run, key, fn): key for key, fn in tasks.items()}
+    pending = set(futures)
+    reason = None
+    try:
+        while pending:
+            now = time.monotonic()
+            if cancel_event is not None and cancel_event.is_set():
+                reason = STATUS_CANCELLED
+                break
+            if global_end is not None and now >= global_end:
+                reason = STATUS_TIMEOUT
+                break
+
+            # 다음으로 깨어날 시점: 가장 먼저 만료되는 장비 제한 시간 또는 전체 제한 시간
+            wake_points = []
+            if global_end is not None:
+                wake_points.append(global_end - now)
+            if cancel_event is not None:
+                wake_points.append(_POLL_INTERVAL)
+            if host_timeout:
+                with started_lock:
+                    running = [started_at[futures[f]] for f in pending if futures[f] in started_at]
+                if running:
+                    wake_points.append(min(running) + host_timeout - now)
+                else:
+                    wake_points.append(_POLL_INTERVAL)
+            timeout = max(0.0, min(wake_points)) if wake_points else None
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for fut in done:
+                key = futures[fut]
+                try:
+                    outcome = {'status': STATUS_OK, 'result': fut.result(),
+                               'error': None, 'elapsed': elapsed_of(key, now)}
+                except Exception as e:
+                    outcome = {'status': STATUS_ERROR, 'result': None,
+                               'error': str(e), 'elapsed': elapsed_of(key, now)}
+                yield key, outcome
+
+            if host_timeout:
+                for fut in list(pending):
+                    key = futures[fut]
+                    start = start_of(key)
+                    if start is not None and now - start >= host_timeout:
+                        pending.discard(fut)
+                        yield key, {'status': STATUS_TIMEOUT, 'result': None,
+                                    'error': f'장비 제한 시간 초과 ({host_timeout}s)',
+                                    'elapsed': round(now - start, 3)}
+
+        if pending:
+            logger.warning(f"일괄 작업 부분 완료: {len(tasks) - len(pending)}/{len(tasks)} ({reason})")
+        # 중단된 작업: 실행 중이면 timeout/cancelled, 시작 전이면 skipped/cancelled
+        now = time.monotonic()
+        for fut in list(pending):
+            key = futures[fut]
+            fut.cancel()
+            pending.discard(fut)
+            if reason == STATUS_CANCELLED:
+                yield key, {'status': STATUS_CANCELLED, 'result': None,
+                            'error': '작업이 취소되었습니다.', 'elapsed': elapsed_of(key, now)}
+            elif start_of(key) is not None:
+                yield key, {'status': STATUS_TIMEOUT, 'result': None,
+                            'error': f'전체 제한 시간 초과 ({deadline}s)',
+                            'elapsed': elapsed_of(key, now)}
+            else:
+                yield key, {'status': STATUS_SKIPPED, 'result': None,
+                            'error': f'전체 제한 시간 초과로 실행하지 않음 ({deadline}s)',
+                            'elapsed': 0.0}
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+class FanOutExecutor:
+    """공유 작업 스레드 풀 기반 일괄 실행기
+
+    여러 일괄 작업이 같은 스레드 풀을 나눠 쓰므로 전체 동시 실행 수가 max_workers로 제한된다.
+    제한 시간을 넘긴 작업의 스레드는 작업이 스스로 끝날 때까지 풀의 자리를 차지한다.
+    """
+
+    def __init__(self, max_workers: int = 16, thread_name_prefix: str = 'fanout'):
+        self.thread_name_prefix = thread_name_prefix
+        self._lock = threading.Lock()
+        self._max_workers = max(1, int(max_workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """동시 실행 수 변경 (진행 중인 작업은 기존 풀에서 끝까지 실행)"""
+        with self._lock:
+            old = self._executor
+            self._max_workers = max(1, int(max_workers))
+            self._executor = None
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                    thread_name_prefix=self.thread_name_prefix)
+            return self._executor
+
+    def iter_completed(self, tasks: Dict[Hashable, Callable[[], Any]],
+                       host_timeout: Optional[float] = None,
+                       deadline: Optional[float] = None,
+                       cancel_event: Optional[threading.Event] = None) -> Iterator[Tuple[Hashable, Outcome]]:
+        """완료 순서대로 (key, outcome)을 내보내는 반복자"""
+        return _iter_outcomes(self._get_executor(), tasks, host_timeout, deadline, cancel_event)
+
+    def run(self, tasks: Dict[Hashable, Callable[[], Any]],
+            host_timeout: Optional[float] = None,
+            deadline: Optional[float] = None,
+            cancel_event: Optional[threading.Event] = None) -> Dict[Hashable, Outcome]:
+        """모든 작업의 outcome을 {key: outcome} 으로 반환"""
+        return dict(self.iter_completed(tasks, host_timeout, deadline, cancel_event))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fan_out(tasks: Dict[Hashable, Callable[[], Any]],
+            max_workers: int = 16,
+            host_timeout: Optional[float] = None,
+            deadline: Optional[float] = None) -> Dict[Hashable, Outcome]:
+    """작업들을 제한된 동시성으로 실행 (호출마다 전용 스레드 풀 사용)
+
+    Args:
+        tasks: {key: 인자 없는 호출 가능 객체}
+        max_workers: 최대 동시 실행 수
+        host_timeout: 작업 하나가 시작된 뒤 기다릴 최대 시간 (초, None이면 무제한)
+        deadline: 전체 실행에 허용할 최대 시간 (초, None이면 무제한)
+
+    Returns:
+        {key: {'status', 'result', 'error', 'elapsed'}}
+        status는 ok / error / timeout / skipped 중 하나. timeout·skipped 작업은
+        백그라운드에서 계속 실행될 수 있지만 결과는 버려진다.
+    """
+    if not tasks:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))),
+                                  thread_name_prefix='fanout')
+    try:
+        return dict(_iter_outcomes(executor, tasks, host_timeout, deadline, None))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,20 +1,164 @@
 """통합 프록시 모니터링 클래스 (platform)"""
 
 import paramiko
+import asyncio
+import codecs
+import shlex
+import socket
 import time
+import zlib
 import logging
 import re
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from .utils import get_current_timestamp, validate_resource_data, logger, split_line
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from .utils import get_current_timestamp, validate_resource_data, logger
+from .ssh_pool import ssh_pool
+from .probe import ProbeBundle
+from .session_parser import iter_sessions, iter_session_cells, SessionColumns, StringInterner
+from .circuit_breaker import circuit_breakers, STATE_HALF_OPEN, STATE_OPEN
+from .snmp import snmp_engine, compile_metric_plan, SnmpTable, SNMP_TABLES, SNMP_AVAILABLE
+
+
+# 스트리밍 명령 출력 읽기 단위 (바이트)
+STREAM_CHUNK_SIZE = 64 * 1024
+# 스트리밍 중 stdout이 조용할 때 stderr를 비우는 주기 (초)
+STREAM_POLL_INTERVAL = 1.0
+# 경고 로그용으로 보관할 stderr 최대 크기 (바이트)
+STREAM_STDERR_LIMIT = 64 * 1024
+# stdout이 끝난 뒤 원격 명령의 종료 상태를 기다리는 최대 시간 (초)
+STREAM_EXIT_STATUS_TIMEOUT = 10.0
+
+# 세션 덤프 전송 압축 방식 (MonitoringConfig.session_compression)
+COMPRESSION_NONE = 'none'
+COMPRESSION_GZIP = 'gzip'
+SESSION_COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP)
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _pipe_remote_command(command: str, consumer: str) -> str:
+    """``( command ) | consumer`` 와 같지만 종료 코드는 consumer가 아니라 command의 것을 돌려주는 명령
+
+    장비 셸이 pipefail 을 지원하지 않을 수 있으므로(POSIX sh), command 의 종료 코드를
+    fd 3 으로 빼내 받고 consumer 출력은 fd 4 로 원래 stdout 에 보낸다.
+    """
+    return (
+        f"{{ ppat_rc=$( {{ {{ ( {command} ) 3>&- 4>&-; echo $? >&3; }} | {consumer} >&4; }} 3>&1 ); "
+        "exit \"${ppat_rc:-1}\"; } 4>&1"
+    )
+
+
+def _gzip_remote_command(command: str) -> str:
+    """장비에서 명령 출력을 gzip으로 압축하도록 감싼 명령 (gzip이 없으면 그대로 실행)
+
+    종료 코드는 gzip이 아니라 원래 명령의 것이다.
+    """
+    return (
+        "if command -v gzip >/dev/null 2>&1; "
+        f"then {_pipe_remote_command(command, 'gzip -c -1')}; "
+        f"else ( {command} ); fi"
+    )
+
+
+# 세션 조회 필터 키 -> 세션 표 컬럼 (대소문자 무시 부분 일치)
+SESSION_FILTER_COLUMNS = {
+    'client_ip': 'Client IP',
+    'user': 'User Name',
+    'url': 'URL',
+}
+
+# 장비에서 실행하는 세션 표 필터 (awk)
+# - 헤더를 찾기 전까지의 라인은 그대로 통과시키고, 헤더에서 필터 컬럼 위치를 찾는다.
+#   헤더 판정은 수집기 파서와 같이 Transaction / Creation Time / URL 셀이 정확히 있는 라인이다
+# - 헤더 이후에는 구분선과 조건에 맞는 데이터 라인만 출력한다
+# - 마지막 컬럼(URL)은 값에 파이프가 섞일 수 있어 나머지 셀을 합쳐 비교한다.
+#   수집기 파서(split_cells 후 ' | ' 로 병합)와 같은 문자열이 되도록 셀마다 공백을 떼고 ' | ' 로 잇는다
+# - 필터 값은 환경 변수로 전달해 셸/awk 이스케이프 문제를 피한다
+_SESSION_FILTER_AWK = r"""
+function trim(s) { gsub(/^[ \t\r]+|[ \t\r]+$/, "", s); return s }
+function cell(k,   i, v) {
+    if (k < 1 || fs + k - 1 > fe) return ""
+    v = trim(f[fs + k - 1])
+    if (k == hn) for (i = fs + k; i <= fe; i++) v = v " | " trim(f[i])
+    return tolower(v)
+}
+function want(name,   key) {
+    key = ENVIRON["PPAT_F_" name]
+    if (key == "") return 1
+    return index(cell(col[name]), key) > 0
+}
+function bounds(line) {
+    n = split(trim(line), f, "|")
+    fs = (n >= 1 && trim(f[1]) == "") ? 2 : 1
+    fe = (n >= fs && trim(f[n]) == "") ? n - 1 : n
+}
+!found {
+    print
+    if (!index($0, "|") || $0 ~ /^[ \t\r|+=-]*$/) next
+    bounds($0)
+    t = c = u = 0
+    for (i = fs; i <= fe; i++) {
+        h = trim(f[i])
+        if (h == "Transaction") t = 1
+        else if (h == "Creation Time") c = 1
+        else if (h == "URL") u = 1
+    }
+    if (!(t && c && u)) next
+    hn = fe - fs + 1
+    for (i = fs; i <= fe; i++) {
+        h = trim(f[i])
+        if (h == "Client IP") col["CLIENT_IP"] = i - fs + 1
+        else if (h == "User Name") col["USER"] = i - fs + 1
+        else if (h == "URL") col["URL"] = i - fs + 1
+    }
+    found = 1
+    next
+}
+/^[ \t\r|+=-]*$/ { print; next }
+index($0, "|") {
+    bounds($0)
+    if (want("CLIENT_IP") && want("USER") && want("URL")) print
+}
+"""
+
+
+def _normalize_session_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """비어 있지 않은 세션 필터만 남기고 값은 소문자로 정규화
+
+    url 값의 파이프는 파서가 병합한 URL과 같은 형태(앞뒤 공백 없는 조각을 ' | ' 로 연결)로 맞춘다.
+    """
+    normalized = {}
+    for key, value in (filters or {}).items():
+        if key not in SESSION_FILTER_COLUMNS:
+            raise ValueError(f"지원하지 않는 세션 필터: {key}")
+        value = str(value or '').strip().lower()
+        if key == 'url' and '|' in value:
+            value = ' | '.join(part.strip() for part in value.split('|'))
+        if value:
+            normalized[key] = value
+    return normalized
+
+
+def _filter_remote_command(command: str, filters: Dict[str, str]) -> str:
+    """세션 명령 출력을 장비에서 먼저 필터링하도록 감싼 명령
+    
+    ASCII가 아닌 필터 값은 장비 awk의 로케일에 따라 대소문자 변환이 다를 수 있어
+    전달하지 않고 수집기 쪽 필터에만 맡긴다. 종료 코드는 awk가 아니라 원래 명령의 것이다.
+    """
+    pushed = {key: value for key, value in filters.items() if value.isascii()}
+    if not pushed:
+        return command
+    env = ' '.join(f"PPAT_F_{key.upper()}={shlex.quote(value)}" for key, value in pushed.items())
+    return _pipe_remote_command(command, f"{env} awk {shlex.quote(_SESSION_FILTER_AWK)}")
+
+
+def _session_matches(session: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    """세션이 모든 필터 조건(대소문자 무시 부분 일치)을 만족하는지 확인"""
+    for key, value in filters.items():
+        if value not in str(session.get(SESSION_FILTER_COLUMNS[key]) or '').lower():
+            return False
+    return True
 
-# SNMP import with error handling
-try:
-    from pysnmp.hlapi import *  # type: ignore
-    SNMP_AVAILABLE = True
-except ImportError:
-    SNMP_AVAILABLE = False
-    logger.warning("SNMP 라이브러리를 사용할 수 없습니다. SNMP 모니터링이 비활성화됩니다.")
 
 class ProxyMonitor:
     """통합 프록시 모니터링 클래스
@@ -62,88 +206,274 @@ class ProxyMonitor:
         """더 이상 사용하지 않음: 하드코딩 기본값 제거"""
         return None
     
-    def _create_ssh_connection(self):
-        """SSH 연결 생성"""
+    def _create_ssh_connection(self) -> paramiko.SSHClient:
+        """SSH 연결 생성 (재시도 포함). 풀이 새 연결을 만들 때 사용
+        
+        장비별 회로 차단기가 열려 있으면 연결을 시도하지 않고 즉시 CircuitOpenError를 발생시킨다.
+        회로 차단기에는 시도 횟수가 아니라 호출 단위로 결과를 기록한다 (재시도를 모두 소진하면 실패 1회).
+        """
         if not self.username or not self.password:
             raise ValueError("SSH 사용자명과 비밀번호가 필요합니다.")
         
+        breaker = circuit_breakers.get(self.host)
+        breaker.check()
+        # half_open 시험 요청은 재시도 없이 한 번만 시도
+        attempts = 1 if breaker.state == STATE_HALF_OPEN else self.max_retries
         last_exception = None
         
-        for attempt in range(self.max_retries):
+        for attempt in range(attempts):
+            client = paramiko.SSHClient()
             try:
-                if self._ssh_client:
-                    self._ssh_client.close()
-                
-                self._ssh_client = paramiko.SSHClient()
-                self._ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                self._ssh_client.connect(
+                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                client.connect(
                     self.host,
                     username=self.username,
                     password=self.password,
                     port=self.ssh_port,
                     timeout=30
                 )
+                breaker.record_success()
                 logger.info(f"SSH 연결 성공: {self.host}")
-                return self._ssh_client
+                return client
                 
             except Exception as e:
+                client.close()
                 last_exception = e
-                logger.warning(f"SSH 연결 실패 ({attempt+1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
+                logger.warning(f"SSH 연결 실패 ({attempt+1}/{attempts}): {e}")
+                if attempt < attempts - 1:
+                    if breaker.state == STATE_OPEN:
+                        # 재시도 중 다른 호출의 실패로 회로가 열리면 남은 재시도 없이 즉시 실패
+                        breaker.record_failure(e)
+                        raise breaker.rejection()
                     time.sleep(self.retry_delay)
         
+        breaker.record_failure(last_exception)
         logger.error(f"SSH 연결 최대 재시도 횟수 초과: {last_exception}")
         raise ConnectionError(f"SSH 연결 실패: {last_exception}")
     
+    @contextmanager
+    def _ssh_session(self) -> Iterator[paramiko.SSHClient]:
+        """풀에서 인증된 SSH 연결을 빌려 옴 (없으면 새로 연결)
+        
+        블록이 끝날 때까지 풀은 연결을 사용 중으로 보고 유휴 정리에서 제외한다.
+        """
+        if not self.username or not self.password:
+            raise ValueError("SSH 사용자명과 비밀번호가 필요합니다.")
+        with ssh_pool.lease(self.host, self.ssh_port, self.username, self.password,
+                            self._create_ssh_connection) as client:
+            self._ssh_client = client
+            yield client
+    
+    def _invalidate_ssh_client(self) -> None:
+        """끊어진 연결을 풀에서 제거 (살아 있는 공유 트랜스포트는 유지)"""
+        self._ssh_client = None
+        ssh_pool.invalidate(self.host, self.ssh_port, self.username, only_if_dead=True)
+    
     def _execute_ssh_command(self, command: str) -> Tuple[List[str], str]:
-        """SSH 명령어 실행"""
-        try:
-            ssh = self._create_ssh_connection()
-            stdin, stdout, stderr = ssh.exec_command(command)
-            
-            # 결과 읽기
-            output_lines = stdout.readlines()
-            error_output = stderr.read().decode('utf-8')
-            
-            if error_output:
-                logger.warning(f"SSH 명령어 실행 시 경고: {error_output}")
-            
-            return output_lines, error_output
-            
-        except Exception as e:
-            logger.error(f"SSH 명령어 실행 실패: {e}")
-            raise
-        finally:
-            if self._ssh_client:
-                self._ssh_client.close()
-                self._ssh_client = None
+        """SSH 명령어 실행 (풀링된 트랜스포트에 채널만 새로 연다)"""
+        with self._ssh_session() as ssh:
+            try:
+                stdin, stdout, stderr = ssh.exec_command(command)
+                
+                # 결과 읽기
+                output_lines = stdout.readlines()
+                error_output = stderr.read().decode('utf-8')
+                
+                if error_output:
+                    logger.warning(f"SSH 명령어 실행 시 경고: {error_output}")
+                
+                return output_lines, error_output
+                
+            except Exception as e:
+                logger.error(f"SSH 명령어 실행 실패: {e}")
+                self._invalidate_ssh_client()
+                raise
+    
+    def _iter_ssh_command_chunks(self, command: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """SSH 명령어 stdout을 바이트 청크 단위로 스트리밍
+        
+        stderr는 채널 윈도우가 막히지 않도록 함께 비우고, 앞부분만 보관했다가 종료 시 경고로 남긴다.
+        스트리밍이 끝날 때까지 풀 연결을 빌려 두므로 긴 덤프 중에 유휴 정리로 닫히지 않는다.
+        
+        recv()가 빈 값을 돌려주는 것은 정상 종료뿐 아니라 트랜스포트가 끊긴 경우도 같으므로,
+        출력을 다 읽은 뒤 종료 상태를 확인해 잘린 출력을 정상 결과로 넘기지 않는다.
+        
+        Raises:
+            ConnectionError: 종료 상태를 받지 못함 (연결 끊김 등으로 출력이 잘렸을 수 있음)
+            RuntimeError: 원격 명령이 0이 아닌 종료 코드로 끝남
+        """
+        with self._ssh_session() as ssh:
+            channel = None
+            try:
+                channel = ssh.get_transport().open_session()
+                channel.settimeout(STREAM_POLL_INTERVAL)
+                channel.exec_command(command)
+                
+                stderr_chunks: List[bytes] = []
+                stderr_size = 0
+                
+                def drain_stderr():
+                    nonlocal stderr_size
+                    while channel.recv_stderr_ready():
+                        data = channel.recv_stderr(chunk_size)
+                        if not data:
+                            break
+                        if stderr_size < STREAM_STDERR_LIMIT:
+                            stderr_chunks.append(data)
+                            stderr_size += len(data)
+                
+                while True:
+                    try:
+                        data = channel.recv(chunk_size)
+                    except socket.timeout:
+                        drain_stderr()
+                        continue
+                    drain_stderr()
+                    if not data:
+                        break
+                    yield data
+                
+                drain_stderr()
+                error_output = b''.join(stderr_chunks).decode('utf-8', errors='replace')
+                if error_output:
+                    logger.warning(f"SSH 명령어 실행 시 경고: {error_output}")
+                
+                # 종료 상태 없이 닫힌 채널은 -1 (recv_exit_status 규약)
+                exit_status = -1
+                if channel.status_event.wait(STREAM_EXIT_STATUS_TIMEOUT):
+                    exit_status = channel.recv_exit_status()
+                if exit_status < 0:
+                    raise ConnectionError("원격 명령 종료 상태를 받지 못했습니다 (출력이 중간에 끊겼을 수 있음)")
+                if exit_status != 0:
+                    detail = error_output.strip()[:200]
+                    raise RuntimeError(f"원격 명령 실패 (종료 코드 {exit_status})" + (f": {detail}" if detail else ''))
+                    
+            except GeneratorExit:
+                raise
+            except Exception as e:
+                logger.error(f"SSH 명령어 실행 실패: {e}")
+                self._invalidate_ssh_client()
+                raise
+            finally:
+                if channel is not None:
+                    channel.close()
+    
+    def _iter_ssh_command_lines(self, command: str, chunk_size: int = STREAM_CHUNK_SIZE,
+                                compression: str = COMPRESSION_NONE,
+                                stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """SSH 명령어 출력을 라인 단위로 스트리밍
+        
+        채널에서 chunk_size 단위로 읽어 완성된 라인부터 바로 내보낸다. 메모리에는
+        읽는 중인 청크와 미완성 라인 하나만 남는다.
+        
+        Args:
+            compression: 'gzip'이면 장비에서 출력을 gzip으로 압축해 보내고 받는 즉시 해제한다.
+                         장비에 gzip이 없으면 평문으로 받는다. gzip 스트림이 끝나지 않은 채
+                         출력이 끝나면 ConnectionError를 발생시킨다.
+            stats: 전달하면 전송 통계를 채운다
+                   (wire_bytes, decoded_bytes, elapsed, compression, ratio)
+        """
+        if compression == COMPRESSION_GZIP:
+            command = _gzip_remote_command(command)
+        if stats is None:
+            stats = {}
+        stats.update({'compression': COMPRESSION_NONE, 'wire_bytes': 0, 'decoded_bytes': 0})
+        
+        started = time.perf_counter()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        inflater = None
+        sniffed = compression != COMPRESSION_GZIP
+        head = b''
+        partial = ''
+        
+        def decode(data: bytes) -> Iterator[str]:
+            nonlocal partial
+            stats['decoded_bytes'] += len(data)
+            text = partial + decoder.decode(data)
+            lines = text.split('\n')
+            partial = lines.pop()
+            for line in lines:
+                yield line + '\n'
+        
+        def inflate(data: bytes) -> Iterator[str]:
+            # 압축 해제 결과가 한 번에 커지지 않도록 출력 크기를 제한해 나눠 푼다
+            while data:
+                out = inflater.decompress(data, chunk_size * 4)
+                data = inflater.unconsumed_tail
+                yield from decode(out)
+        
+        for data in self._iter_ssh_command_chunks(command, chunk_size):
+            stats['wire_bytes'] += len(data)
+            if not sniffed:
+                # 첫 2바이트로 gzip 스트림 여부 판별 (gzip 미설치 장비는 평문)
+                head += data
+                if len(head) < 2:
+                    continue
+                data, head, sniffed = head, b'', True
+                if data[:2] == GZIP_MAGIC:
+                    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    stats['compression'] = COMPRESSION_GZIP
+            if inflater is not None:
+                yield from inflate(data)
+            else:
+                yield from decode(data)
+        
+        if head:
+            yield from decode(head)
+        if inflater is not None:
+            yield from decode(inflater.flush())
+            if not inflater.eof:
+                # gzip 트레일러까지 받지 못함: 장비의 gzip이 중간에 끝났거나 출력이 잘렸다
+                raise ConnectionError("gzip 스트림이 끝나기 전에 출력이 끊겼습니다")
+        partial += decoder.decode(b'', final=True)
+        if partial:
+            yield partial
+        
+        stats['elapsed'] = round(time.perf_counter() - started, 3)
+        stats['ratio'] = round(stats['wire_bytes'] / stats['decoded_bytes'], 4) if stats['decoded_bytes'] else None
+    
+    def _execute_ssh_bundle(self, bundle: ProbeBundle) -> Dict[str, Dict[str, Any]]:
+        """명령 번들을 한 채널에서 실행하고 명령별 결과로 분리"""
+        with self._ssh_session() as ssh:
+            try:
+                stdin, stdout, stderr = ssh.exec_command(bundle.build_script())
+                results = bundle.parse(stdout.read().decode('utf-8'), stderr.read().decode('utf-8'))
+            except Exception as e:
+                logger.error(f"SSH 명령 번들 실행 실패: {e}")
+                self._invalidate_ssh_client()
+                raise
+
+        for key, result in results.items():
+            if result.get('error'):
+                logger.warning(f"SSH 명령어 실행 시 경고 ({key}): {result['error']}")
+        return results
     
     def test_connection(self) -> bool:
         """프록시 서버 연결 테스트"""
         try:
-            self._create_ssh_connection()
-            return True
+            with self._ssh_session():
+                return True
         except Exception as e:
             logger.error(f"연결 테스트 실패: {e}")
             return False
-        finally:
-            if self._ssh_client:
-                self._ssh_client.close()
-                self._ssh_client = None
     
     def get_system_status(self) -> Dict[str, Any]:
         """시스템 기본 상태 정보 조회"""
         try:
-            # 시스템 업타임 조회
-            uptime_lines, _ = self._execute_ssh_command("uptime")
+            bundle = ProbeBundle()
+            # 시스템 업타임 / 로드 / 디스크 사용량을 한 번에 조회
+            bundle.add('uptime', "uptime")
+            bundle.add('loadavg', "cat /proc/loadavg")
+            bundle.add('disk', "df -h / | tail -1")
+            results = self._execute_ssh_bundle(bundle)
+            
+            uptime_lines = results['uptime']['output'].splitlines(True)
             uptime = uptime_lines[0].strip() if uptime_lines else "Unknown"
             
-            # 시스템 로드 조회
-            load_lines, _ = self._execute_ssh_command("cat /proc/loadavg")
+            load_lines = results['loadavg']['output'].splitlines(True)
             load_avg = load_lines[0].split()[:3] if load_lines else ["0", "0", "0"]
             
-            # 디스크 사용량 조회
-            disk_lines, _ = self._execute_ssh_command("df -h / | tail -1")
+            disk_lines = results['disk']['output'].splitlines(True)
             disk_info = disk_lines[0].split() if disk_lines else []
             disk_usage = disk_info[4] if len(disk_info) > 4 else "0%"
             
@@ -181,111 +511,92 @@ class ProxyMonitor:
             logger.error(f"메모리 사용률 조회 실패: {e}")
             return -1
     
-    def get_session_info(self) -> Dict[str, Any]:
-        """세션 정보 조회"""
+    def get_session_info(self, filters: Optional[Dict[str, Any]] = None,
+                         columnar: bool = False) -> Dict[str, Any]:
+        """세션 정보 조회
+        
+        세션 덤프는 채널에서 청크 단위로 읽으면서 바로 파싱하므로
+        전체 출력을 메모리에 올려 두지 않는다.
+        
+        Args:
+            filters: {'client_ip', 'user', 'url'} 중 일부. 대소문자 무시 부분 일치 조건으로
+                     장비에서 먼저 걸러 보내고, 파싱 후 같은 조건으로 다시 확인한다.
+            columnar: True이면 'sessions'를 행 dict 목록 대신 SessionColumns(컬럼 단위 저장)로 반환
+
+        조회에 실패하면(세션 명령 미설정, SSH 연결/명령 실패, 회로 차단) 빈 'sessions'와 함께
+        'error'를 담아 반환한다. 저장 측은 'error'가 있으면 기존 레코드를 그대로 둔다.
+        """
+        filters = _normalize_session_filters(filters)
+        empty_sessions = (lambda: SessionColumns([])) if columnar else list
         try:
             config = self.get_monitoring_config()
             if not config or not config.session_cmd:
                 logger.warning("session_cmd 미설정: 세션 조회를 건너뜁니다.")
-                return {'unique_clients': 0, 'total_sessions': 0, 'sessions': []}
-            session_lines, _ = self._execute_ssh_command(config.session_cmd)
-            
-            if not session_lines:
-                return {'unique_clients': 0, 'total_sessions': 0, 'sessions': []}
-            
-            # 마지막 빈 줄 제거
-            if session_lines and session_lines[-1].strip() == '':
-                session_lines.pop()
-            
-            if len(session_lines) < 2:
-                return {'unique_clients': 0, 'total_sessions': 0, 'sessions': []}
-            
-            # 기대 헤더 목록 (순서 고정)
-            expected_headers = [
-                'Transaction', 'Creation Time', 'Protocol', 'Cust ID', 'User Name', 'Client IP',
-                'Client Side MWG IP', 'Server Side MWG IP', 'Server IP',
-                'CL Bytes Received', 'CL Bytes Sent', 'SRV Bytes Received', 'SRV Bytes Sent',
-                'Trxn Index', 'Age(seconds)', 'Status', 'In use', 'URL'
-            ]
-
-            def is_separator_line(line: str) -> bool:
-                stripped = line.strip()
-                if not stripped:
-                    return True
-                # 제거: 구분선 같은 라인 (대시/플러스/이퀄스/스페이스/파이프만 구성)
-                without_pipes = stripped.replace('|', '').replace('+', '').replace('=', '').replace('-', '').strip()
-                return without_pipes == ''
-
-            # 헤더 라인 탐색: 파이프 포함, 기대 컬럼 일부 키워드 존재
-            header_idx: Optional[int] = None
-            header: List[str] = []
-            for idx, ln in enumerate(session_lines):
-                if '|' not in ln:
-                    continue
-                if is_separator_line(ln):
-                    continue
-                cols = split_line(ln)
-                # 헤더 식별: 필수 키워드 포함 검사
-                if {'Transaction', 'Creation Time', 'URL'}.issubset(set(cols)):
-                    header_idx = idx
-                    header = cols
-                    break
-            
-            if header_idx is None:
-                # 폴백: 최초의 파이프 포함 라인을 헤더로 간주
-                for idx, ln in enumerate(session_lines):
-                    if '|' in ln:
-                        header_idx = idx
-                        header = split_line(ln)
-                        break
-            
-            if header_idx is None:
-                return {'unique_clients': 0, 'total_sessions': 0, 'sessions': []}
-
-            data_lines = session_lines[header_idx + 1:]
+                return {'unique_clients': 0, 'total_sessions': 0, 'sessions': empty_sessions(),
+                        'error': 'session_cmd 미설정'}
             
-            sessions: List[Dict[str, Any]] = []
+            meta: Dict[str, Any] = {}
+            transfer: Dict[str, Any] = {}
+            interner = StringInterner()
             client_ips = set()
-            
-            for line in data_lines:
-                if '|' not in line:
-                    continue
-                if is_separator_line(line):
-                    continue
-                try:
-                    data = split_line(line)
-                    # 컬럼 수 보정: 부족하면 패딩, 초과하면 마지막 컬럼으로 병합
-                    if len(data) < len(header):
-                        data = data + [''] * (len(header) - len(data))
-                    elif len(data) > len(header):
-                        data = data[:len(header) - 1] + [' | '.join(data[len(header) - 1:])]
-
-                    session: Dict[str, Any] = {}
-                    for i, column in enumerate(header):
-                        # 헤더 공백 정상화
-                        col_name = column.strip()
-                        session[col_name] = data[i] if i < len(data) else ''
+            compression = getattr(config, 'session_compression', None) or COMPRESSION_NONE
+            command = _filter_remote_command(config.session_cmd, filters) if filters else config.session_cmd
+            lines = self._iter_ssh_command_lines(command, compression=compression, stats=transfer)
+            
+            if columnar:
+                sessions: Any = None
+                client_ip_pos = None
+                for cells in iter_session_cells(lines, meta, interner):
+                    if sessions is None:
+                        sessions = SessionColumns(meta['headers'], interner=interner)
+                        client_ip_pos = sessions.position('Client IP')
+                    if filters and not _session_matches(dict(zip(sessions.names, cells)), filters):
+                        continue
+                    sessions.append(cells)
+                    # Client IP 추출 (포트 구분자 ':' 제거)
+                    client_ip = cells[client_ip_pos].strip() if client_ip_pos is not None else ''
+                    if client_ip:
+                        client_ips.add(client_ip.split(':')[0])
+                if sessions is None:
+                    sessions = SessionColumns(meta['headers'] or [], interner=interner)
+            else:
+                sessions = []
+                for session in self.iter_sessions(lines, meta, interner):
+                    if filters and not _session_matches(session, filters):
+                        continue
                     sessions.append(session)
-                    
                     # Client IP 추출 (포트 구분자 ':' 제거)
                     client_ip = (session.get('Client IP') or '').strip()
                     if client_ip:
                         client_ips.add(client_ip.split(':')[0])
-                    
-                except Exception as e:
-                    logger.error(f"세션 데이터 파싱 오류: {e}")
-                    continue
+            
+            logger.info(
+                f"세션 덤프 수신 ({self.host}): {transfer['wire_bytes']} bytes "
+                f"(해제 후 {transfer['decoded_bytes']} bytes, {transfer['compression']}, {transfer['elapsed']}s)"
+            )
+            
+            # 마지막 빈 줄을 제외하고 2줄 미만이거나 헤더가 없으면 빈 결과
+            if meta['line_count'] < 2 or meta['headers'] is None:
+                return {'unique_clients': 0, 'total_sessions': 0, 'sessions': empty_sessions(), 'transfer': transfer}
             
             return {
                 'unique_clients': len(client_ips),
                 'total_sessions': len(sessions),
-                'headers': header,
-                'sessions': sessions
+                'headers': meta['headers'],
+                'sessions': sessions,
+                'transfer': transfer,
+                'strings': interner.stats()
             }
             
         except Exception as e:
             logger.error(f"세션 정보 조회 실패: {e}")
-            return {'unique_clients': 0, 'total_sessions': 0, 'sessions': []}
+            return {'unique_clients': 0, 'total_sessions': 0, 'sessions': empty_sessions(), 'error': str(e)}
+    
+    @staticmethod
+    def iter_sessions(lines: Iterable[str], meta: Optional[Dict[str, Any]] = None,
+                      interner: Optional[StringInterner] = None) -> Iterator[Dict[str, Any]]:
+        """세션 표 라인을 받아 세션 dict를 하나씩 내보낸다 (session_parser.iter_sessions 참고)"""
+        return iter_sessions(lines, meta, interner)
     
     def get_snmp_data(self) -> Dict[str, int]:
         """SNMP 데이터 수집"""
@@ -300,61 +611,53 @@ class ProxyMonitor:
                 logger.warning("SNMP OIDs 미설정: SNMP 수집을 건너뜁니다.")
                 return self._get_empty_snmp_data()
             
-            # OID 객체 생성
-            oids = [ObjectType(ObjectIdentity(oid)) for oid in snmp_oids.values()]
-            
-            # SNMP 요청
-            errorIndication, errorStatus, errorIndex, varBinds = next(
-                getCmd(SnmpEngine(),
-                      CommunityData(self.snmp_community, mpModel=1),
-                      UdpTransportTarget((self.host, self.snmp_port)),
-                      ContextData(),
-                      *oids)
+            # SNMP 요청 (공유 엔진, 캐시된 전송 대상/OID 객체 사용, 중복 OID는 한 번만 요청)
+            response = snmp_engine.get(
+                self.host, self.snmp_port, self.snmp_community,
+                compile_metric_plan(snmp_oids).wire_oids
             )
-            
-            if errorIndication:
-                logger.error(f"SNMP 에러: {errorIndication}")
-                return self._get_empty_snmp_data()
-            elif errorStatus:
-                logger.error(f"SNMP 에러 상태: {errorStatus}")
-                return self._get_empty_snmp_data()
-            
-            # 결과 처리
-            result = {}
-            for varBind in varBinds:
-                try:
-                    oid, value = varBind
-                    oid_str = str(oid)
-                    
-                    # OID에 해당하는 메트릭 찾기
-                    metric = next((desc for desc, cfg_oid in snmp_oids.items() 
-                                if str(cfg_oid) in oid_str), None)
-                    
-                    if metric:
-                        try:
-                            int_value = int(value)
-                            if metric in ['CPU', 'Memory'] and not (0 <= int_value <= 100):
-                                logger.warning(f"잘못된 {metric} 값: {int_value}")
-                                int_value = -1
-                            result[metric.lower()] = int_value
-                        except (ValueError, TypeError):
-                            result[metric.lower()] = -1
-                            
-                except Exception as e:
-                    logger.error(f"SNMP 응답 처리 중 에러: {e}")
-                    continue
-            
-            # 누락된 메트릭 처리
-            for metric in snmp_oids.keys():
-                if metric.lower() not in result:
-                    result[metric.lower()] = -1
-            
-            return result
+            return self.parse_snmp_response(response, snmp_oids)
             
         except Exception as e:
             logger.error(f"SNMP 데이터 수집 실패: {e}")
             return self._get_empty_snmp_data()
     
+    def parse_snmp_response(self, response: Tuple[Any, Any, Any, Any], snmp_oids: Dict[str, str]) -> Dict[str, int]:
+        """SNMP GET 응답 (errorIndication, errorStatus, errorIndex, varBinds)을 메트릭 dict로 변환"""
+        errorIndication, errorStatus, errorIndex, varBinds = response
+        
+        if errorIndication:
+            logger.error(f"SNMP 에러: {errorIndication}")
+            return self._get_empty_snmp_data()
+        elif errorStatus:
+            logger.error(f"SNMP 에러 상태: {errorStatus}")
+            return self._get_empty_snmp_data()
+        
+        return compile_metric_plan(snmp_oids).parse(varBinds)
+    
+    def walk_snmp_table(self, table: Any, max_repetitions: Optional[int] = None) -> SnmpTable:
+        """SNMP 테이블 조회 (GETBULK)
+        
+        Args:
+            table: SNMP_TABLES의 테이블 이름('processes', 'interfaces') 또는 {컬럼 이름: 컬럼 OID}
+            max_repetitions: GETBULK 한 번에 받을 행 수 (기본값은 공유 엔진 설정)
+        """
+        if not SNMP_AVAILABLE:
+            raise RuntimeError("SNMP 라이브러리를 사용할 수 없습니다.")
+        if isinstance(table, str):
+            if table not in SNMP_TABLES:
+                raise ValueError(f"알 수 없는 SNMP 테이블: {table}")
+            columns = SNMP_TABLES[table]
+        else:
+            columns = dict(table)
+        return snmp_engine.walk_table(self.host, self.snmp_port, self.snmp_community,
+                                      columns, max_repetitions=max_repetitions)
+    
+    def get_process_counts(self, max_repetitions: Optional[int] = None) -> Dict[str, int]:
+        """프로세스 이름별 실행 개수 (hrSWRunName)"""
+        table = self.walk_snmp_table({'name': SNMP_TABLES['processes']['name']}, max_repetitions)
+        return table.count_by('name')
+    
     def _get_empty_snmp_data(self) -> Dict[str, int]:
         """빈 SNMP 데이터 반환"""
         return {
@@ -367,8 +670,12 @@ class ProxyMonitor:
             'ftp': -1
         }
     
-    def get_resource_data(self) -> Dict[str, Any]:
-        """통합 리소스 데이터 수집"""
+    def get_resource_data(self, snmp_data: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """통합 리소스 데이터 수집
+        
+        Args:
+            snmp_data: 일괄 폴링(poll_snmp_fleet)으로 미리 받은 SNMP 데이터. 없으면 직접 조회
+        """
         try:
             timestamp = get_current_timestamp()
             
@@ -379,7 +686,8 @@ class ProxyMonitor:
             session_info = self.get_session_info()
             
             # SNMP 데이터 수집
-            snmp_data = self.get_snmp_data()
+            if snmp_data is None:
+                snmp_data = self.get_snmp_data()
             
             # 결과 데이터 생성
             result = {
@@ -415,21 +723,25 @@ class ProxyMonitor:
             
         except Exception as e:
             logger.error(f"리소스 데이터 수집 중 오류: {e}")
-            timestamp = get_current_timestamp()
-            return {
-                'date': timestamp['date'],
-                'time': timestamp['time'],
-                'device': self.host,
-                'cpu': 'error',
-                'memory': 'error',
-                'uc': 'error',
-                'cc': 'error',
-                'cs': 'error',
-                'http': 'error',
-                'https': 'error',
-                'ftp': 'error',
-                'total_sessions': 0
-            }
+            return self.get_error_resource_data()
+    
+    def get_error_resource_data(self) -> Dict[str, Any]:
+        """수집 실패 시 반환하는 리소스 데이터"""
+        timestamp = get_current_timestamp()
+        return {
+            'date': timestamp['date'],
+            'time': timestamp['time'],
+            'device': self.host,
+            'cpu': 'error',
+            'memory': 'error',
+            'uc': 'error',
+            'cc': 'error',
+            'cs': 'error',
+            'http': 'error',
+            'https': 'error',
+            'ftp': 'error',
+            'total_sessions': 0
+        }
     
     def get_comprehensive_status(self) -> Dict[str, Any]:
         """포괄적인 프록시 상태 정보"""
@@ -457,11 +769,58 @@ class ProxyMonitor:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """컨텍스트 매니저 종료"""
-        if self._ssh_client:
-            try:
-                self._ssh_client.close()
-            except Exception as e:
-                logger.error(f"SSH 연결 종료 중 오류: {e}")
-            finally:
-                self._ssh_client = None
\ No newline at end of file
+        """컨텍스트 매니저 종료 (연결은 풀이 소유하므로 참조만 해제)"""
+        self._ssh_client = None
+
+
+def poll_snmp_fleet(monitors: Dict[Any, ProxyMonitor],
+                    snmp_oids: Optional[Dict[str, str]] = None,
+                    timeout: Optional[float] = None,
+                    retries: Optional[int] = None) -> Dict[Any, Dict[str, int]]:
+    """여러 장비의 SNMP 데이터를 공유 엔진의 asyncio 루프에서 동시에 수집
+    
+    Args:
+        monitors: {key: ProxyMonitor}
+        snmp_oids: {메트릭: OID}. 없으면 활성 모니터링 설정에서 조회
+        timeout: 장비별 응답 대기 시간 (초, 기본값은 공유 엔진 설정)
+        retries: 장비별 재전송 횟수 (기본값은 공유 엔진 설정)
+    
+    Returns:
+        {key: get_snmp_data()와 같은 형태의 dict}
+    """
+    if not monitors:
+        return {}
+    empty = {key: monitor._get_empty_snmp_data() for key, monitor in monitors.items()}
+    if not SNMP_AVAILABLE:
+        logger.warning("SNMP 라이브러리가 없어 SNMP 데이터를 수집할 수 없습니다.")
+        return empty
+    
+    if snmp_oids is None:
+        config = next(iter(monitors.values())).get_monitoring_config()
+        snmp_oids = config.snmp_oids if config and config.snmp_oids else {}
+    if not snmp_oids:
+        logger.warning("SNMP OIDs 미설정: SNMP 수집을 건너뜁니다.")
+        return empty
+    
+    targets = {
+        key: (monitor.host, monitor.snmp_port, monitor.snmp_community)
+        for key, monitor in monitors.items()
+    }
+    try:
+        responses = snmp_engine.get_many(targets, compile_metric_plan(snmp_oids).wire_oids,
+                                         timeout=timeout, retries=retries)
+    except Exception as e:
+        logger.error(f"SNMP 일괄 폴링 실패: {e}")
+        return empty
+    
+    results = {}
+    for key, monitor in monitors.items():
+        response = responses.get(key)
+        if isinstance(response, tuple):
+            results[key] = monitor.parse_snmp_response(response, snmp_oids)
+        else:
+            if isinstance(response, asyncio.TimeoutError):
+                response = '응답 시간 초과'
+            logger.error(f"SNMP 데이터 수집 실패 ({monitor.host}): {response}")
+            results[key] = empty[key]
+    return results
@@ -0,0 +1,112 @@
+"""원격 명령 번들 모듈 (platform)
+
+여러 개의 진단 명령을 구분자가 들어간 하나의 셸 스크립트로 묶어 한 채널에서 실행하고,
+출력을 다시 명령별 결과로 분리한다. 명령 N개를 실행할 때 N번 왕복하던 것을 1번으로 줄인다.
+"""
+
+import re
+import uuid
+from typing import Dict, Any, List, Tuple
+
+
+class ProbeBundle:
+    """명령 번들
+
+    각 명령은 서브셸에서 실행되며 stdout/stderr 양쪽에 시작/종료 마커를 남긴다.
+    종료 마커에는 해당 명령의 종료 코드가 기록된다.
+
+    사용 예::
+
+        bundle = ProbeBundle()
+        bundle.add('uptime', 'uptime')
+        bundle.add('load', 'cat /proc/loadavg')
+        results = bundle.parse(stdout_text, stderr_text)
+        results['uptime']['output']
+    """
+
+    def __init__(self):
+        self._commands: List[Tuple[str, str]] = []
+        self._marker = f"__PPAT_{uuid.uuid4().hex[:12]}__"
+
+    def add(self, key: str, command: str) -> 'ProbeBundle':
+        """번들에 명령 추가 (key는 결과 dict의 키)"""
+        if not re.fullmatch(r'[A-Za-z0-9_.-]+', key):
+            raise ValueError(f"잘못된 번들 키: {key}")
+        if any(k == key for k, _ in self._commands):
+            raise ValueError(f"중복된 번들 키: {key}")
+        self._commands.append((key, command))
+        return self
+
+    @property
+    def keys(self) -> List[str]:
+        return [key for key, _ in self._commands]
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def build_script(self) -> str:
+        """원격에서 실행할 단일 스크립트 생성
+
+        명령 출력이 개행으로 끝나지 않아도 마커가 같은 줄에 붙지 않도록
+        종료 마커 앞에 개행을 하나 추가하고, 파싱 시 그 개행을 제거한다.
+        """
+        m = self._marker
+        parts = []
+        for key, command in self._commands:
+            parts.append(
+                f"echo '{m}:BEGIN:{key}'; echo '{m}:BEGIN:{key}' >&2\n"
+                f"( {command}\n)\n"
+                f"printf '\\n{m}:END:{key}:%s\\n' \"$?\"; printf '\\n{m}:END:{key}\\n' >&2"
+            )
+        return '\n'.join(parts) + '\n'
+
+    def _split_stream(self, text: str, with_status: bool) -> Dict[str, Tuple[str, int]]:
+        m = re.escape(self._marker)
+        if with_status:
+            pattern = re.compile(
+                rf"{m}:BEGIN:(?P<key>[^\n]+)\n(?P<body>.*?)\n{m}:END:(?P=key):(?P<rc>-?\d+)\n",
+                re.S
+            )
+        else:
+            pattern = re.compile(
+                rf"{m}:BEGIN:(?P<key>[^\n]+)\n(?P<body>.*?)\n{m}:END:(?P=key)\n",
+                re.S
+            )
+        sections = {}
+        for match in pattern.finditer(text or ''):
+            rc = int(match.group('rc')) if with_status else 0
+            sections[match.group('key')] = (match.group('body'), rc)
+        return sections
+
+    def parse(self, stdout_text: str, stderr_text: str = '') -> Dict[str, Dict[str, Any]]:
+        """번들 출력을 명령별 결과로 분리
+
+        Returns:
+            {key: {'success', 'output', 'error', 'exit_code'}} - ``ProxyClient.execute_command`` 와 동일한 형태.
+            출력이 잘려 마커를 찾지 못한 명령은 실패로 처리한다.
+        """
+        out_sections = self._split_stream(stdout_text, with_status=True)
+        err_sections = self._split_stream(stderr_text, with_status=False)
+        results: Dict[str, Dict[str, Any]] = {}
+        for key in self.keys:
+            if key not in out_sections:
+                results[key] = {
+                    'success': False,
+                    'output': '',
+                    'error': '번들 출력에서 결과를 찾을 수 없습니다.',
+                    'exit_code': -1
+                }
+                continue
+            output, exit_code = out_sections[key]
+            error = err_sections.get(key, ('', 0))[0]
+            results[key] = {
+                'success': exit_code == 0,
+                'output': output,
+                'error': error,
+                'exit_code': exit_code
+            }
+        return results
+
+    def failed(self, error: str) -> Dict[str, Dict[str, Any]]:
+        """번들 전체 실행 실패 시 모든 명령을 같은 오류로 채운 결과"""
+        return {key: {'success': False, 'error': error} for key in self.keys}
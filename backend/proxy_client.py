@@ -3,8 +3,11 @@
 import paramiko
 import socket
 import subprocess
+import threading
 import time
 from typing import Dict, Any, Optional
+from .probe import ProbeBundle
+from .circuit_breaker import circuit_breakers
 
 class ProxyClient:
     """프록시 서버 연결 및 관리 클라이언트"""
@@ -16,36 +19,75 @@ class ProxyClient:
         self.password = password
         self.ssh_client = None
         self.connected = False
+        # 여러 요청 스레드가 같은 클라이언트를 공유하므로 연결 생성/해제를 직렬화
+        self._connect_lock = threading.RLock()
+    
+    def same_target(self, host: str, port: int, username: str, password: str) -> bool:
+        """접속 정보가 같은지 확인 (같으면 기존 연결을 계속 사용)"""
+        return (self.host, self.port, self.username, self.password) == (host, port, username, password)
+    
+    def is_alive(self) -> bool:
+        """트랜스포트가 살아 있는지 확인"""
+        if not self.connected or self.ssh_client is None:
+            return False
+        transport = self.ssh_client.get_transport()
+        return transport is not None and transport.is_active()
     
     def connect(self) -> bool:
-        """SSH 연결 시도"""
-        try:
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            self.ssh_client.connect(
-                hostname=self.host,
-                port=self.port,
-                username=self.username,
-                password=self.password,
-                timeout=10
-            )
-            self.connected = True
-            return True
+        """SSH 연결 시도 (회로 차단 중이면 시도하지 않음)"""
+        with self._connect_lock:
+            breaker = circuit_breakers.get(self.host)
+            if not breaker.allow_request():
+                print(f"SSH 연결 생략 ({self.host}:{self.port}): {breaker.rejection()}")
+                self.connected = False
+                return False
             
-        except Exception as e:
-            print(f"SSH 연결 실패 ({self.host}:{self.port}): {e}")
-            self.connected = False
-            return False
+            if self.ssh_client:
+                self.ssh_client.close()
+            try:
+                self.ssh_client = paramiko.SSHClient()
+                self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                
+                self.ssh_client.connect(
+                    hostname=self.host,
+                    port=self.port,
+                    username=self.username,
+                    password=self.password,
+                    timeout=10
+                )
+                self.connected = True
+                breaker.record_success()
+                return True
+                
+            except Exception as e:
+                print(f"SSH 연결 실패 ({self.host}:{self.port}): {e}")
+                breaker.record_failure(e)
+                self.connected = False
+                return False
+    
+    def ensure_connected(self) -> bool:
+        """연결이 살아 있으면 그대로 쓰고, 끊어졌으면 한 스레드만 다시 연결"""
+        if self.is_alive():
+            return True
+        with self._connect_lock:
+            if self.is_alive():
+                return True
+            return self.connect()
     
     def disconnect(self):
         """SSH 연결 해제"""
-        if self.ssh_client:
-            self.ssh_client.close()
-            self.connected = False
+        with self._connect_lock:
+            if self.ssh_client:
+                self.ssh_client.close()
+                self.connected = False
     
     def test_connection(self) -> Dict[str, Any]:
-        """연결 테스트"""
+        """연결 테스트
+        
+        사용자가 명시적으로 요청하는 점검이므로 회로 차단 중에도 시도한다.
+        TCP 실패는 회로 차단기에 실패로 기록하지만, TCP 성공만으로는 SSH 인증/명령 성공을
+        알 수 없으므로 SSH 세션이 살아 있을 때만 성공으로 기록한다 (connect()가 성공 시 기록).
+        """
         result = {
             'success': False,
             'message': '',
@@ -73,14 +115,19 @@ class ProxyClient:
         except Exception as e:
             result['message'] = f'연결 테스트 오류: {str(e)}'
             result['response_time'] = round((time.time() - start_time) * 1000, 2)
+        
+        breaker = circuit_breakers.get(self.host)
+        if not result['success']:
+            breaker.record_failure(result['message'])
+        elif self.is_alive():
+            breaker.record_success()
             
         return result
     
     def execute_command(self, command: str) -> Dict[str, Any]:
         """원격 명령 실행"""
-        if not self.connected:
-            if not self.connect():
-                return {'success': False, 'error': '연결되지 않음'}
+        if not self.ensure_connected():
+            return {'success': False, 'error': '연결되지 않음'}
         
         try:
             stdin, stdout, stderr = self.ssh_client.exec_command(command)
@@ -99,6 +146,22 @@ class ProxyClient:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def execute_bundle(self, bundle: ProbeBundle) -> Dict[str, Dict[str, Any]]:
+        """명령 번들을 한 채널에서 실행하고 명령별 결과로 분리"""
+        if not self.ensure_connected():
+            return bundle.failed('연결되지 않음')
+        
+        try:
+            stdin, stdout, stderr = self.ssh_client.exec_command(bundle.build_script())
+            
+            output = stdout.read().decode('utf-8')
+            error = stderr.read().decode('utf-8')
+            
+            return bundle.parse(output, error)
+            
+        except Exception as e:
+            return bundle.failed(str(e))
+    
     def get_system_info(self) -> Dict[str, Any]:
         """시스템 정보 조회"""
         commands = {
@@ -110,10 +173,15 @@ class ProxyClient:
             'network_interfaces': 'ip addr show'
         }
         
+        bundle = ProbeBundle()
+        for key, command in commands.items():
+            bundle.add(key, command)
+        results = self.execute_bundle(bundle)
+        
         system_info = {}
         
-        for key, command in commands.items():
-            result = self.execute_command(command)
+        for key in commands:
+            result = results[key]
             if result['success']:
                 system_info[key] = result['output'].strip()
             else:
@@ -124,19 +192,22 @@ class ProxyClient:
     def get_resource_usage(self) -> Dict[str, Any]:
         """리소스 사용률 조회"""
         try:
+            bundle = ProbeBundle()
             # CPU 사용률
-            cpu_cmd = "top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1"
-            cpu_result = self.execute_command(cpu_cmd)
+            bundle.add('cpu', "top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1")
+            # 메모리 사용률
+            bundle.add('memory', "free | grep Mem | awk '{printf \"%.2f\", $3/$2 * 100.0}'")
+            # 디스크 사용률
+            bundle.add('disk', "df / | grep -vE '^Filesystem' | awk '{print $5}' | cut -d'%' -f1")
+            results = self.execute_bundle(bundle)
+            
+            cpu_result = results['cpu']
             cpu_usage = float(cpu_result['output'].strip()) if cpu_result['success'] else 0
             
-            # 메모리 사용률
-            mem_cmd = "free | grep Mem | awk '{printf \"%.2f\", $3/$2 * 100.0}'"
-            mem_result = self.execute_command(mem_cmd)
+            mem_result = results['memory']
             memory_usage = float(mem_result['output'].strip()) if mem_result['success'] else 0
             
-            # 디스크 사용률
-            disk_cmd = "df / | grep -vE '^Filesystem' | awk '{print $5}' | cut -d'%' -f1"
-            disk_result = self.execute_command(disk_cmd)
+            disk_result = results['disk']
             disk_usage = float(disk_result['output'].strip()) if disk_result['success'] else 0
             
             return {
@@ -160,20 +231,24 @@ class ProxyClient:
         # 일반적인 프록시 서비스들 확인
         services = ['squid', 'nginx', 'apache2', 'httpd']
         
+        bundle = ProbeBundle()
+        for service in services:
+            bundle.add(service, f"systemctl is-active {service}")
+        # 네트워크 포트 확인
+        bundle.add('port_80', "netstat -tlnp | grep :80")
+        results = self.execute_bundle(bundle)
+        
         status = {}
         
         for service in services:
-            cmd = f"systemctl is-active {service}"
-            result = self.execute_command(cmd)
+            result = results[service]
             
             if result['success'] and 'active' in result['output']:
                 status[service] = 'running'
             else:
                 status[service] = 'stopped'
         
-        # 네트워크 포트 확인
-        port_cmd = "netstat -tlnp | grep :80"
-        port_result = self.execute_command(port_cmd)
+        port_result = results['port_80']
         
         status['port_80_open'] = bool(port_result['success'] and port_result['output'])
         
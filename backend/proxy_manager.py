@@ -2,17 +2,25 @@
 
 import threading
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
 from .proxy_client import ProxyClient
+from .fanout import FanOutExecutor, STATUS_OK
+from .reachability import reachability_prober
 
 class ProxyManager:
     """프록시 서버 통합 관리자"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 16, host_timeout: float = 60):
         self.clients = {}  # proxy_id: ProxyClient
         self.monitoring_active = False
         self.monitoring_thread = None
         self.monitoring_interval = 30  # 30초 간격
+        
+        # 일괄 작업 설정: 공유 작업 풀, 장비별 제한 시간 (초)
+        self.host_timeout = host_timeout
+        self._executor = FanOutExecutor(max_workers=max_workers, thread_name_prefix='proxy-bulk')
+        self._cancel_events = set()
+        self._cancel_lock = threading.Lock()
     
     def add_proxy(self, proxy_server) -> bool:
         """프록시 서버 추가"""
@@ -44,14 +52,15 @@ class ProxyManager:
         
         return self.clients[proxy_id].test_connection()
     
-    def test_all_connections(self) -> Dict[int, Dict[str, Any]]:
+    def test_all_connections(self, timeout: Optional[float] = None,
+                             as_completed: bool = False) -> Union[Dict[int, Dict[str, Any]], Iterator[Tuple[int, Dict[str, Any]]]]:
         """모든 프록시 연결 테스트"""
-        results = {}
-        
-        for proxy_id, client in self.clients.items():
-            results[proxy_id] = client.test_connection()
-        
-        return results
+        results = self.iter_bulk(
+            lambda client: client.test_connection(),
+            lambda error: {'success': False, 'message': error, 'response_time': 0},
+            timeout=timeout
+        )
+        return results if as_completed else dict(results)
     
     def get_proxy_system_info(self, proxy_id: int) -> Dict[str, Any]:
         """특정 프록시 시스템 정보 조회"""
@@ -67,14 +76,16 @@ class ProxyManager:
         
         return self.clients[proxy_id].get_resource_usage()
     
-    def get_all_resource_usage(self) -> Dict[int, Dict[str, Any]]:
+    def get_all_resource_usage(self, timeout: Optional[float] = None,
+                               as_completed: bool = False) -> Union[Dict[int, Dict[str, Any]], Iterator[Tuple[int, Dict[str, Any]]]]:
         """모든 프록시 리소스 사용률 조회"""
-        results = {}
-        
-        for proxy_id, client in self.clients.items():
-            results[proxy_id] = client.get_resource_usage()
-        
-        return results
+        results = self.iter_bulk(
+            lambda client: client.get_resource_usage(),
+            lambda error: {'cpu_usage': 0, 'memory_usage': 0, 'disk_usage': 0,
+                           'timestamp': time.time(), 'error': error},
+            timeout=timeout
+        )
+        return results if as_completed else dict(results)
     
     def check_proxy_services(self, proxy_id: int) -> Dict[str, Any]:
         """특정 프록시 서비스 상태 확인"""
@@ -90,14 +101,61 @@ class ProxyManager:
         
         return self.clients[proxy_id].execute_command(command)
     
-    def execute_command_on_all(self, command: str) -> Dict[int, Dict[str, Any]]:
+    def execute_command_on_all(self, command: str, timeout: Optional[float] = None,
+                               as_completed: bool = False) -> Union[Dict[int, Dict[str, Any]], Iterator[Tuple[int, Dict[str, Any]]]]:
         """모든 프록시에서 명령 실행"""
-        results = {}
-        
-        for proxy_id, client in self.clients.items():
-            results[proxy_id] = client.execute_command(command)
-        
-        return results
+        results = self.iter_bulk(
+            lambda client: client.execute_command(command),
+            lambda error: {'success': False, 'error': error},
+            timeout=timeout
+        )
+        return results if as_completed else dict(results)
+    
+    def iter_bulk(self, operation: Callable[[ProxyClient], Dict[str, Any]],
+                  on_failure: Callable[[str], Dict[str, Any]],
+                  timeout: Optional[float] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """모든 프록시에 작업을 병렬 실행하고 완료 순서대로 (proxy_id, 결과)를 내보냄
+        
+        Args:
+            operation: ProxyClient를 받아 결과 dict를 반환하는 함수
+            on_failure: 오류/제한 시간 초과/취소 메시지를 받아 결과 dict를 만드는 함수
+            timeout: 장비별 제한 시간 (초, None이면 self.host_timeout)
+        """
+        tasks = {
+            proxy_id: (lambda client=client: operation(client))
+            for proxy_id, client in list(self.clients.items())
+        }
+        cancel_event = threading.Event()
+        with self._cancel_lock:
+            self._cancel_events.add(cancel_event)
+        try:
+            for proxy_id, outcome in self._executor.iter_completed(
+                tasks,
+                host_timeout=timeout if timeout is not None else self.host_timeout,
+                cancel_event=cancel_event
+            ):
+                if outcome['status'] == STATUS_OK:
+                    yield proxy_id, outcome['result']
+                else:
+                    yield proxy_id, on_failure(outcome['error'])
+        finally:
+            with self._cancel_lock:
+                self._cancel_events.discard(cancel_event)
+    
+    def cancel_bulk_operations(self) -> int:
+        """진행 중인 모든 일괄 작업 취소. 취소한 작업 수를 반환
+        
+        아직 시작하지 않은 장비 작업은 실행되지 않고, 실행 중인 작업의 결과는 버려진다.
+        """
+        with self._cancel_lock:
+            events = list(self._cancel_events)
+        for event in events:
+            event.set()
+        return len(events)
+    
+    def set_parallelism(self, max_workers: int):
+        """일괄 작업 동시 실행 수 설정"""
+        self._executor.set_max_workers(max_workers)
     
     def start_monitoring(self):
         """모니터링 시작"""
@@ -132,21 +190,23 @@ class ProxyManager:
                 time.sleep(5)  # 오류 발생 시 5초 대기
     
     def _update_proxy_status(self):
-        """프록시 상태 업데이트"""
+        """프록시 상태 업데이트 (전체 SSH 포트를 동시에 점검)"""
         # 순환 임포트 방지를 위해 함수 내부에서 임포트
         from models import ProxyServer, db
         
-        for proxy_id, client in self.clients.items():
+        targets = {
+            proxy_id: (client.host, client.port)
+            for proxy_id, client in list(self.clients.items())
+        }
+        connection_results = reachability_prober.sweep(targets)
+        
+        for proxy_id, connection_result in connection_results.items():
             try:
-                # 연결 테스트
-                connection_result = client.test_connection()
-                
                 # 데이터베이스에서 프록시 서버 조회
                 proxy_server = ProxyServer.query.get(proxy_id)
                 if proxy_server:
                     # 상태 업데이트
                     proxy_server.is_active = connection_result['success']
-                    db.session.commit()
                     
                     if connection_result['success']:
                         print(f"프록시 {proxy_server.name} ({proxy_server.host}) - 온라인")
@@ -155,6 +215,7 @@ class ProxyManager:
                         
             except Exception as e:
                 print(f"프록시 {proxy_id} 상태 업데이트 오류: {e}")
+        db.session.commit()
     
     def reload_proxies(self):
         """데이터베이스에서 프록시 목록 다시 로드"""
@@ -179,6 +240,8 @@ class ProxyManager:
         return {
             'active': self.monitoring_active,
             'interval': self.monitoring_interval,
+            'max_workers': self._executor.max_workers,
+            'host_timeout': self.host_timeout,
             'proxy_count': len(self.clients),
             'connected_proxies': len([
                 client for client in self.clients.values() 
@@ -0,0 +1,182 @@
+"""TCP 도달성 점검 모듈 (platform)
+
+asyncio로 전체 장비의 SSH 포트에 동시에 TCP 연결을 시도하고,
+장비별 최근 응답 시간(RTT) 이력과 p50/p95/p99 통계를 유지한다.
+응답 없는 장비가 있어도 한 번의 점검은 제한 시간 1회 정도로 끝난다.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple
+
+from .utils import logger
+
+Target = Tuple[str, int]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """정렬된 값에서 선형 보간 백분위수 계산"""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+class _HostHistory:
+    """장비별 RTT 이력"""
+
+    __slots__ = ('rtts', 'probes', 'failures', 'last')
+
+    def __init__(self, size: int):
+        self.rtts: Deque[float] = deque(maxlen=size)
+        self.probes = 0
+        self.failures = 0
+        self.last: Dict[str, Any] = {}
+
+
+class ReachabilityProber:
+    """asyncio 기반 TCP 도달성 점검기
+
+    - 한 번의 점검(sweep)에서 모든 대상에 동시에 연결 시도 (동시성 상한 ``concurrency``)
+    - 성공한 연결의 RTT를 대상별로 최근 ``history_size`` 개까지 보관
+    """
+
+    def __init__(self, timeout: float = 3.0, concurrency: int = 256, history_size: int = 120):
+        """
+        Args:
+            timeout: 대상별 연결 제한 시간 (초)
+            concurrency: 동시에 열 수 있는 연결 수 상한
+            history_size: 대상별 보관할 RTT 샘플 수
+        """
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.history_size = history_size
+        self._history: Dict[Target, _HostHistory] = {}
+        self._lock = threading.Lock()
+        self.last_sweep: Dict[str, Any] = {}
+
+    async def _probe(self, host: str, port: int, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=self.timeout)
+                response_time = round((time.perf_counter() - start) * 1000, 2)
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+                return {
+                    'success': True,
+                    'message': f'연결 성공 (응답시간: {response_time}ms)',
+                    'response_time': response_time
+                }
+            except asyncio.TimeoutError:
+                message = f'연결 실패: {self.timeout}초 내에 포트 {port}에 응답이 없습니다'
+            except Exception as e:
+                message = f'연결 실패: 포트 {port}에 접근할 수 없습니다 ({e})'
+            return {
+                'success': False,
+                'message': message,
+                'response_time': round((time.perf_counter() - start) * 1000, 2)
+            }
+
+    async def probe_many(self, targets: Dict[Hashable, Target]) -> Dict[Hashable, Dict[str, Any]]:
+        """대상 전체를 동시에 점검 (이벤트 루프 안에서 사용)
+
+        Args:
+            targets: {key: (host, port)}
+
+        Returns:
+            {key: {'success', 'message', 'response_time'}} - ``ProxyClient.test_connection`` 과 같은 형태
+        """
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        keys = list(targets.keys())
+        outcomes = await asyncio.gather(
+            *(self._probe(targets[key][0], int(targets[key][1]), semaphore) for key in keys)
+        )
+        checked_at = datetime.now().isoformat()
+        results = {}
+        with self._lock:
+            for key, outcome in zip(keys, outcomes):
+                target = (targets[key][0], int(targets[key][1]))
+                history = self._history.get(target)
+                if history is None:
+                    history = _HostHistory(self.history_size)
+                    self._history[target] = history
+                history.probes += 1
+                if outcome['success']:
+                    history.rtts.append(outcome['response_time'])
+                else:
+                    history.failures += 1
+                history.last = dict(outcome, checked_at=checked_at)
+                results[key] = outcome
+        return results
+
+    def sweep(self, targets: Dict[Hashable, Target]) -> Dict[Hashable, Dict[str, Any]]:
+        """동기 코드(Flask 요청, 모니터링 스레드)에서 전체 점검 실행"""
+        if not targets:
+            return {}
+        start = time.perf_counter()
+        results = asyncio.run(self.probe_many(targets))
+        elapsed = round(time.perf_counter() - start, 3)
+        reachable = sum(1 for r in results.values() if r['success'])
+        self.last_sweep = {
+            'targets': len(targets),
+            'reachable': reachable,
+            'unreachable': len(targets) - reachable,
+            'elapsed': elapsed,
+            'finished_at': datetime.now().isoformat()
+        }
+        logger.info(f"도달성 점검 완료: {reachable}/{len(targets)} ({elapsed}s)")
+        return results
+
+    def get_host_stats(self, host: str, port: int) -> Dict[str, Any]:
+        """대상 하나의 RTT 통계 (ms)"""
+        with self._lock:
+            history = self._history.get((host, int(port)))
+            if history is None:
+                return {'host': host, 'port': int(port), 'samples': 0, 'probes': 0}
+            rtts = sorted(history.rtts)
+            probes, failures, last = history.probes, history.failures, dict(history.last)
+        stats = {
+            'host': host,
+            'port': int(port),
+            'samples': len(rtts),
+            'probes': probes,
+            'failures': failures,
+            'success_rate': round((probes - failures) / probes, 4) if probes else None,
+            'last': last,
+        }
+        if rtts:
+            stats.update({
+                'min': rtts[0],
+                'max': rtts[-1],
+                'p50': round(_percentile(rtts, 50), 2),
+                'p95': round(_percentile(rtts, 95), 2),
+                'p99': round(_percentile(rtts, 99), 2),
+            })
+        return stats
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """이력이 있는 모든 대상의 RTT 통계"""
+        with self._lock:
+            targets = list(self._history.keys())
+        return [self.get_host_stats(host, port) for host, port in targets]
+
+    def forget(self, host: str, port: int) -> None:
+        """대상의 이력 삭제 (장비 삭제 시)"""
+        with self._lock:
+            self._history.pop((host, int(port)), None)
+
+
+# 전역 도달성 점검기 인스턴스
+reachability_prober = ReachabilityProber()
@@ -1,77 +1,149 @@
-from typing import Dict, Any, List
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterable, Iterator, List
 
 from .proxy_client import ProxyClient
-from .monitoring import ProxyMonitor
+from .monitoring import ProxyMonitor, SESSION_COMPRESSIONS, poll_snmp_fleet
+from .session_ingest import compile_field_mapping, host_cache_stats
+from .session_history import session_history
+from .fanout import fan_out, STATUS_OK
+from .circuit_breaker import circuit_breakers, STATE_OPEN
+from .utils import logger
+
+# 증분 동기화에서 DELETE ... WHERE id IN (...) 한 번에 넣을 id 수 (SQLite 바인드 변수 한도 고려)
+SESSION_DELETE_CHUNK = 500
 
 
 class DeviceManager:
-    def __init__(self):
+    """API 요청 스레드가 공유하는 장비 클라이언트 관리자
+
+    - 클라이언트 맵은 잠금으로 보호하고, 접속 정보가 바뀌지 않으면 기존 연결을 재사용
+    - 장비(host)별 세마포어로 동시에 여는 SSH 채널 수를 max_channels_per_host로 제한
+    - 요청이 끝나도 연결을 끊지 않으므로 동시 요청이 서로의 연결을 끊지 않는다
+    """
+
+    def __init__(self, max_channels_per_host: int = 4, channel_wait_timeout: float = 30):
+        """
+        Args:
+            max_channels_per_host: 장비별 동시 SSH 채널 수 상한
+            channel_wait_timeout: 채널 자리를 기다리는 최대 시간 (초)
+        """
         self.clients: Dict[int, ProxyClient] = {}
+        self.max_channels_per_host = max_channels_per_host
+        self.channel_wait_timeout = channel_wait_timeout
+        self._lock = threading.RLock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
 
     def add_or_update(self, proxy) -> None:
-        client = ProxyClient(
-            host=proxy.host,
-            port=proxy.ssh_port,
-            username=proxy.username,
-            password=proxy.password
-        )
-        self.clients[proxy.id] = client
+        with self._lock:
+            current = self.clients.get(proxy.id)
+            if current and current.same_target(proxy.host, proxy.ssh_port, proxy.username, proxy.password):
+                return
+            self.clients[proxy.id] = ProxyClient(
+                host=proxy.host,
+                port=proxy.ssh_port,
+                username=proxy.username,
+                password=proxy.password
+            )
+        if current:
+            current.disconnect()
 
     def remove(self, proxy_id: int) -> None:
-        client = self.clients.pop(proxy_id, None)
+        with self._lock:
+            client = self.clients.pop(proxy_id, None)
         if client:
             client.disconnect()
 
     def reload(self) -> int:
-        for client in self.clients.values():
-            client.disconnect()
-        self.clients.clear()
+        """DB와 동기화 (접속 정보가 그대로인 장비의 연결은 유지)"""
         from models import ProxyServer  # local import
         proxies = ProxyServer.query.all()
-        for proxy in proxies:
-            self.add_or_update(proxy)
+        with self._lock:
+            removed = [pid for pid in self.clients if pid not in {p.id for p in proxies}]
+            for proxy in proxies:
+                self.add_or_update(proxy)
+        for proxy_id in removed:
+            self.remove(proxy_id)
         return len(proxies)
 
+    def set_max_channels_per_host(self, max_channels: int) -> None:
+        """장비별 동시 채널 수 변경 (진행 중인 작업은 기존 상한으로 끝까지 실행)"""
+        with self._lock:
+            self.max_channels_per_host = max(1, int(max_channels))
+            self._host_slots.clear()
+
+    def _get_client(self, proxy_id: int) -> ProxyClient | None:
+        with self._lock:
+            return self.clients.get(proxy_id)
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_channels_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _run(self, proxy_id: int, operation: Callable[[ProxyClient], Dict[str, Any]],
+             **error_fields) -> Dict[str, Any]:
+        """장비별 채널 상한 안에서 클라이언트 작업 실행"""
+        client = self._get_client(proxy_id)
+        if not client:
+            return {**error_fields, 'error': '프록시 클라이언트가 없습니다.'}
+        circuit_error = self._circuit_error(client)
+        if circuit_error:
+            return {**error_fields, 'error': circuit_error}
+        slot = self._host_slot(client.host)
+        if not slot.acquire(timeout=self.channel_wait_timeout):
+            return {**error_fields, 'error': f'{client.host} 동시 채널 한도({self.max_channels_per_host}) 초과: 잠시 후 다시 시도하세요.'}
+        try:
+            return operation(client)
+        finally:
+            slot.release()
+
     def test_connection(self, proxy_id: int) -> Dict[str, Any]:
-        client = self.clients.get(proxy_id)
+        client = self._get_client(proxy_id)
         if not client:
             return {'success': False, 'message': '프록시 클라이언트가 없습니다.'}
         return client.test_connection()
 
+    def _circuit_error(self, client: ProxyClient) -> str | None:
+        """회로 차단 중이면 오류 메시지, 아니면 None (연결이 살아 있으면 차단과 무관)"""
+        if client.is_alive():
+            return None
+        breaker = circuit_breakers.get(client.host)
+        if breaker.state == STATE_OPEN and breaker.retry_after() > 0:
+            return str(breaker.rejection())
+        return None
+
     def execute_command(self, proxy_id: int, command: str) -> Dict[str, Any]:
-        client = self.clients.get(proxy_id)
-        if not client:
-            return {'success': False, 'error': '프록시 클라이언트가 없습니다.'}
-        return client.execute_command(command)
+        return self._run(proxy_id, lambda client: client.execute_command(command), success=False)
 
     def get_system_info(self, proxy_id: int) -> Dict[str, Any]:
-        client = self.clients.get(proxy_id)
-        if not client:
-            return {'error': '프록시 클라이언트가 없습니다.'}
-        info = client.get_system_info()
-        client.disconnect()
-        return info
+        return self._run(proxy_id, lambda client: client.get_system_info())
 
     def get_resource_usage(self, proxy_id: int) -> Dict[str, Any]:
-        client = self.clients.get(proxy_id)
-        if not client:
-            return {'error': '프록시 클라이언트가 없습니다.'}
-        usage = client.get_resource_usage()
-        client.disconnect()
-        return usage
+        return self._run(proxy_id, lambda client: client.get_resource_usage())
 
     def check_services(self, proxy_id: int) -> Dict[str, Any]:
-        client = self.clients.get(proxy_id)
-        if not client:
-            return {'error': '프록시 클라이언트가 없습니다.'}
-        status = client.check_proxy_status()
-        client.disconnect()
-        return status
+        return self._run(proxy_id, lambda client: client.check_proxy_status())
 
 
 class MonitoringService:
     def __init__(self):
-        pass
+        # 리소스 일괄 수집 동시성/제한 시간 설정
+        self.max_workers = 32
+        self.host_timeout = 60
+        self.collect_deadline = 120
+        # 세션 저장 배치 크기 (Core insert executemany 1회당 행 수)
+        self.session_batch_size = 1000
+        # 그룹 세션 수집: 동시 조회 장비 수, 조회 결과 대기열 크기, 전체 제한 시간 (None이면 무제한)
+        self.session_fetch_workers = 8
+        self.session_queue_size = 4
+        self.session_collect_deadline: float | None = None
 
     def get_active_config(self):
         from models import MonitoringConfig  # local import
@@ -86,6 +158,10 @@ class MonitoringService:
             config.snmp_oids = data['snmp_oids']
         if 'session_cmd' in data and isinstance(data['session_cmd'], str):
             config.session_cmd = data['session_cmd']
+        if 'session_compression' in data:
+            if data['session_compression'] not in SESSION_COMPRESSIONS:
+                raise ValueError(f"지원하지 않는 session_compression: {data['session_compression']}")
+            config.session_compression = data['session_compression']
         if 'cpu_threshold' in data:
             config.cpu_threshold = int(data['cpu_threshold'])
         if 'memory_threshold' in data:
@@ -95,13 +171,26 @@ class MonitoringService:
         db.session.commit()
         return config
 
-    def collect_resources(self, group_id: int | None = None) -> List[Dict[str, Any]]:
+    def collect_resources(self, group_id: int | None = None,
+                          max_workers: int | None = None,
+                          host_timeout: float | None = None,
+                          deadline: float | None = None) -> List[Dict[str, Any]]:
+        """활성 프록시 리소스를 병렬 수집
+
+        장비별 제한 시간(host_timeout)과 전체 제한 시간(deadline)을 넘긴 장비는
+        status가 timeout/skipped로 표시되고 resource_data는 오류 값으로 채워진다.
+        """
+        from flask import current_app
         from models import ProxyServer  # local import
         query = ProxyServer.query.filter_by(is_active=True)
         if group_id:
             query = query.filter(ProxyServer.group_id == group_id)
-        results = []
-        for proxy in query.all():
+        proxies = query.all()
+
+        app = current_app._get_current_object()
+        monitors: Dict[int, ProxyMonitor] = {}
+        tasks = {}
+        for proxy in proxies:
             monitor = ProxyMonitor(
                 host=proxy.host,
                 username=proxy.username,
@@ -110,29 +199,266 @@ class MonitoringService:
                 snmp_port=proxy.snmp_port,
                 snmp_community=proxy.snmp_community
             )
-            data = monitor.get_resource_data()
+            monitors[proxy.id] = monitor
+
+        # SNMP는 전체 장비를 한 번에 비동기 폴링하고, 장비별 작업에는 결과만 넘긴다
+        sweep_started = time.monotonic()
+        snmp_results = poll_snmp_fleet(monitors)
+        deadline = deadline if deadline is not None else self.collect_deadline
+        if deadline:
+            deadline = max(deadline - (time.monotonic() - sweep_started), 0.001)
+
+        for proxy_id, monitor in monitors.items():
+            def task(monitor=monitor, snmp_data=snmp_results.get(proxy_id)):
+                # 작업 스레드에서도 DB 설정 조회가 가능하도록 앱 컨텍스트 생성
+                with app.app_context():
+                    return monitor.get_resource_data(snmp_data=snmp_data)
+            tasks[proxy_id] = task
+
+        outcomes = fan_out(
+            tasks,
+            max_workers=max_workers or self.max_workers,
+            host_timeout=host_timeout if host_timeout is not None else self.host_timeout,
+            deadline=deadline
+        )
+
+        results = []
+        for proxy in proxies:
+            outcome = outcomes[proxy.id]
+            if outcome['status'] == STATUS_OK:
+                data = outcome['result']
+            else:
+                data = monitors[proxy.id].get_error_resource_data()
             results.append({
                 'proxy_id': proxy.id,
                 'proxy_name': proxy.name,
                 'host': proxy.host,
                 'group_name': proxy.group.name if proxy.group else None,
                 'is_main': proxy.is_main,
-                'resource_data': data
+                'resource_data': data,
+                'status': outcome['status'],
+                'error': outcome['error'],
+                'elapsed': outcome['elapsed']
             })
         return results
 
-    def collect_sessions_by_group(self, group_id: int, persist: bool = True) -> int:
+    def _insert_session_records(self, records: Iterable[Dict[str, Any]], batch_size: int,
+                                stats: Dict[str, Any]) -> int:
+        """SessionRecord 행 dict를 Core insert(executemany)로 batch_size개씩 저장
+
+        ORM 객체를 만들지 않으므로 unit-of-work 비용이 없다. 커밋은 호출자가 한다.
+        stats의 rows/batches/elapsed를 누적한다.
+        """
+        from models import SessionRecord, db  # local import
+        statement = SessionRecord.__table__.insert()
+        started = time.perf_counter()
+        saved = 0
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                db.session.execute(statement, batch)
+                saved += len(batch)
+                stats['batches'] += 1
+                batch = []
+        if batch:
+            db.session.execute(statement, batch)
+            saved += len(batch)
+            stats['batches'] += 1
+        stats['rows'] += saved
+        stats['inserted'] += saved
+        stats['elapsed'] += time.perf_counter() - started
+        return saved
+
+    def _sync_session_records(self, scope: Dict[str, Any], records: Iterable[Dict[str, Any]],
+                              batch_size: int, stats: Dict[str, Any]) -> int:
+        """scope(group_id/proxy_id 조건)의 저장 레코드를 새 덤프와 증분 동기화
+
+        (transaction, creation_time)으로 행을 식별하고, 같은 키가 여러 번 나오면 등장 순서(id 순)로 짝짓는다.
+        새 행은 insert, 값이 바뀐 행만 update, 덤프에서 사라진 행은 delete 한다.
+        커밋은 호출자가 한다. 덤프의 행 수를 반환한다.
+        """
+        from models import SessionRecord, db  # local import
+        table = SessionRecord.__table__
+        started = time.perf_counter()
+
+        existing: Dict[tuple, deque] = {}
+        compare_cols: List[str] = []
+        loaded = False
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        insert_statement = table.insert()
+        update_statement = table.update().where(table.c.id == db.bindparam('_id'))
+        rows = 0
+
+        for record in records:
+            if not loaded:
+                # 첫 행의 키 목록으로 비교 대상 컬럼을 정하고 기존 행을 한 번에 읽는다
+                compare_cols = [col for col in record if col in table.c]
+                select = db.select(table.c.id, *(table.c[col] for col in compare_cols)).where(
+                    *(table.c[col] == value for col, value in scope.items())
+                ).order_by(table.c.id)
+                for row in db.session.execute(select):
+                    values = dict(zip(compare_cols, row[1:]))
+                    key = (values.get('transaction'), values.get('creation_time'))
+                    existing.setdefault(key, deque()).append((row[0], values))
+                loaded = True
+            rows += 1
+            matches = existing.get((record.get('transaction'), record.get('creation_time')))
+            if not matches:
+                inserts.append(record)
+                if len(inserts) >= batch_size:
+                    db.session.execute(insert_statement, inserts)
+                    stats['inserted'] += len(inserts)
+                    stats['batches'] += 1
+                    inserts = []
+                continue
+            record_id, values = matches.popleft()
+            if any(values[col] != record[col] for col in compare_cols):
+                updates.append(dict(record, _id=record_id))
+                if len(updates) >= batch_size:
+                    db.session.execute(update_statement, updates)
+                    stats['updated'] += len(updates)
+                    stats['batches'] += 1
+                    updates = []
+            else:
+                stats['unchanged'] += 1
+
+        if inserts:
+            db.session.execute(insert_statement, inserts)
+            stats['inserted'] += len(inserts)
+            stats['batches'] += 1
+        if updates:
+            db.session.execute(update_statement, updates)
+            stats['updated'] += len(updates)
+            stats['batches'] += 1
+
+        if loaded:
+            stale_ids = [record_id for matches in existing.values() for record_id, _ in matches]
+        else:
+            # 빈 덤프: scope의 기존 행은 모두 사라진 것으로 본다
+            stale_ids = [row[0] for row in db.session.execute(
+                db.select(table.c.id).where(*(table.c[col] == value for col, value in scope.items()))
+            )]
+        chunk_size = min(batch_size, SESSION_DELETE_CHUNK)
+        for start in range(0, len(stale_ids), chunk_size):
+            chunk = stale_ids[start:start + chunk_size]
+            db.session.execute(table.delete().where(table.c.id.in_(chunk)))
+            stats['deleted'] += len(chunk)
+            stats['batches'] += 1
+
+        stats['rows'] += rows
+        stats['elapsed'] += time.perf_counter() - started
+        return rows
+
+    def _close_history(self, history, stats: Dict[str, Any]) -> None:
+        """이력 세대를 마감(남은 행 저장, 행 수 기록)하고 보존 정책 적용"""
+        from models import db  # local import
+        history.close()
+        db.session.commit()
+        stats['snapshot_id'] = history.snapshot_id
+        stats['snapshot_rows'] = history.row_count
+        session_history.apply_retention()
+
+    def _start_ingest_stats(self, batch_size: int | None) -> Dict[str, Any]:
+        if batch_size is None:
+            batch_size = self.session_batch_size
+        if batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+        return {'rows': 0, 'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0,
+                'batches': 0, 'batch_size': batch_size, 'elapsed': 0.0, 'strings_bytes_saved': 0,
+                'failed': 0, 'errors': {}, 'timed_out': 0}
+
+    @staticmethod
+    def _count_interned(sessions, stats: Dict[str, Any]) -> None:
+        """덤프 하나의 문자열 공유로 절약한 메모리 (파싱 + 적재 단계) 누적"""
+        interner = getattr(sessions, 'interner', None)
+        if interner is not None:
+            stats['strings_bytes_saved'] += interner.bytes_saved
+            logger.debug(f"세션 문자열 공유: 고유 {len(interner)}개, 중복 {interner.hits}건, "
+                         f"{interner.bytes_saved} bytes 절약")
+
+    def _finish_ingest_stats(self, stats: Dict[str, Any], scope: str) -> None:
+        elapsed = stats['elapsed']
+        stats['elapsed'] = round(elapsed, 3)
+        stats['rows_per_sec'] = round(stats['rows'] / elapsed, 1) if elapsed > 0 else 0.0
+        stats['host_cache'] = host_cache_stats()
+        stats['scope'] = scope
+        logger.info(f"세션 저장 ({scope}): {stats['rows']}건 (추가 {stats['inserted']}, 변경 {stats['updated']}, "
+                    f"삭제 {stats['deleted']}, 유지 {stats['unchanged']}, 조회 실패 프록시 {stats['failed']}, 시간 초과 {stats['timed_out']}), "
+                    f"{stats['batches']}회 배치, "
+                    f"{stats['elapsed']}s ({stats['rows_per_sec']} rows/s), "
+                    f"문자열 공유 {stats['strings_bytes_saved']} bytes 절약, "
+                    f"url_host 캐시 적중률 {stats['host_cache']['hit_rate']:.1%}")
+
+    def _iter_session_dumps(self, monitors: Dict[int, ProxyMonitor],
+                            deadline: float | None) -> Iterator[tuple]:
+        """프록시별 세션 덤프를 병렬로 조회/파싱하고, 끝나는 순서대로 (proxy_id, info)를 내보낸다
+
+        조회 스레드는 크기가 제한된 대기열에 결과를 넣으므로, 소비(DB 저장)가 늦으면
+        조회 쪽이 기다려 메모리에 쌓이는 덤프 수가 제한된다. 조회에 실패한 프록시의 info에는
+        'error'가 담긴다. deadline 안에 끝나지 않은 프록시는 내보내지 않는다.
+        """
+        from flask import current_app
+        if not monitors:
+            return
+        app = current_app._get_current_object()
+        results: queue.Queue = queue.Queue(maxsize=max(1, self.session_queue_size))
+        stop = threading.Event()
+
+        def fetch(proxy_id: int, monitor: ProxyMonitor) -> None:
+            # 작업 스레드에서도 DB 설정 조회가 가능하도록 앱 컨텍스트 생성
+            with app.app_context():
+                try:
+                    info = monitor.get_session_info(columnar=True)
+                except Exception as e:
+                    # 조회 실패는 get_session_info 가 'error'로 돌려주므로 예상 밖 오류만 여기로 온다.
+                    # 결과를 넣지 않으면 소비 측이 제한 시간까지 기다리므로 같은 형태로 보고한다
+                    info = {'error': str(e)}
+            if info.get('error'):
+                logger.error(f"세션 조회 실패 ({monitor.host}): {info['error']}")
+            while not stop.is_set():
+                try:
+                    results.put((proxy_id, info), timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.session_fetch_workers, len(monitors))),
+                                      thread_name_prefix='session-fetch')
+        try:
+            for proxy_id, monitor in monitors.items():
+                executor.submit(fetch, proxy_id, monitor)
+            end = time.monotonic() + deadline if deadline else None
+            for received in range(len(monitors)):
+                try:
+                    timeout = max(0.0, end - time.monotonic()) if end is not None else None
+                    yield results.get(timeout=timeout)
+                except queue.Empty:
+                    logger.warning(f"세션 조회 제한 시간 초과: {received}/{len(monitors)} 완료 ({deadline}s)")
+                    return
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def collect_sessions_by_group(self, group_id: int, persist: bool = True,
+                                  batch_size: int | None = None) -> Dict[str, Any]:
+        """그룹 세션 수집 및 저장. 이번 호출의 저장 통계(saved 포함)를 반환
+
+        프록시별 조회/파싱은 병렬로 실행하고, DB 저장은 현재 스레드 하나가 끝나는 순서대로 처리한다.
+        persist=True이면 그룹의 저장 레코드를 프록시별로 새 덤프와 증분 동기화한다
+        (삭제 후 재적재하지 않으므로 조회 측에 빈 테이블이 보이지 않는다).
+        persist=False이면 기존 레코드는 두고 새 덤프를 추가만 한다.
+        조회에 실패했거나 제한 시간 안에 조회가 끝나지 않은 프록시의 레코드는 그대로 둔다
+        (일시적인 장애로 저장된 세션이 지워졌다가 다시 적재되지 않도록).
+        """
         from models import ProxyServer, SessionRecord, db  # local import
-        if persist:
-            SessionRecord.query.filter_by(group_id=group_id).delete()
-            db.session.commit()
+        stats = self._start_ingest_stats(batch_size)
         proxies = ProxyServer.query.filter_by(group_id=group_id).all()
-        saved = 0
-        # 현재 테이블 컬럼 조회 (마이그레이션 미적용 상황 대비)
-        insp = db.inspect(db.engine)
-        existing_cols = {c['name'] for c in insp.get_columns('session_records')}
-        for proxy in proxies:
-            monitor = ProxyMonitor(
+        proxy_ids = [proxy.id for proxy in proxies]
+        # 조회 스레드가 ORM 객체에 접근하지 않도록 모니터는 현재 스레드에서 만든다
+        monitors = {
+            proxy.id: ProxyMonitor(
                 host=proxy.host,
                 username=proxy.username,
                 password=proxy.password,
@@ -140,131 +466,69 @@ class MonitoringService:
                 snmp_port=proxy.snmp_port,
                 snmp_community=proxy.snmp_community
             )
-            try:
-                info = monitor.get_session_info()
-            except Exception:
-                # 개별 프록시 실패는 무시하고 다음으로 진행
+            for proxy in proxies
+        }
+        saved = 0
+        # 현재 테이블 컬럼 조회 (마이그레이션 미적용 상황 대비)
+        insp = db.inspect(db.engine)
+        existing_cols = {c['name'] for c in insp.get_columns('session_records')}
+        history = None
+        received = 0
+        for proxy_id, info in self._iter_session_dumps(monitors, self.session_collect_deadline):
+            received += 1
+            scope = {'group_id': group_id, 'proxy_id': proxy_id}
+            if info.get('error'):
+                # 개별 프록시 실패는 기존 레코드를 건드리지 않고 다음으로 진행
+                stats['failed'] += 1
+                stats['errors'][proxy_id] = info['error']
                 continue
 
-            def pick(session: dict, keys: list[str]) -> str:
-                # 후보 키들 중 첫번째로 값이 존재하는 것을 선택 (대소문자/공백 차이 보정)
-                if not session:
-                    return ''
-                # 키 정규화 맵
-                normalized = {}
-                for k, v in session.items():
-                    normalized[''.join(k.lower().split())] = v
-                for key in keys:
-                    nk = ''.join(key.lower().split())
-                    if nk in normalized and normalized[nk] not in (None, ''):
-                        return str(normalized[nk])
-                return ''
-
-            def pick_fuzzy(session: dict, candidates: list[str]) -> str:
-                """느슨한 키 탐색: 부분 문자열 매칭으로 첫 값 선택"""
-                if not session:
-                    return ''
-                lowered = {k.lower(): v for k, v in session.items() if v not in (None, '')}
-                # 1) 우선 엄격 매칭
-                strict = pick(session, candidates)
-                if strict:
-                    return strict
-                # 2) 부분 문자열 매칭
-                for want in candidates:
-                    tokens = [t for t in want.lower().split() if t]
-                    for key, val in lowered.items():
-                        if all(tok in key.replace('_',' ').replace('-', ' ') for tok in tokens):
-                            return str(val)
-                return ''
-
-            def to_int(v: str) -> int | None:
-                try:
-                    return int(v)
-                except Exception:
-                    return None
-
-            def to_bigint(v: str) -> int | None:
-                try:
-                    return int(v)
-                except Exception:
-                    return None
-
-            def to_dt(v: str):
-                from datetime import datetime
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M:%S']:
-                    try:
-                        return datetime.strptime(v, fmt)
-                    except Exception:
-                        continue
-                return None
-
-            def strip_port(ip: str) -> str:
-                if not ip:
-                    return ''
-                return ip.split(':')[0]
-
-            def extract_host(url: str) -> str:
-                if not url:
-                    return ''
-                try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url if '://' in url else f'//{url}', allow_fragments=True)
-                    host = parsed.hostname or ''
-                    return host
-                except Exception:
-                    return ''
-
-            for s in info.get('sessions', []):
-                client_ip = strip_port(pick_fuzzy(s, ['Client IP', 'ClientIP', 'Client Address', 'Client']))
-                server_ip = strip_port(pick_fuzzy(s, ['Server IP', 'ServerIP', 'Server Address', 'Server']))
-                protocol = pick_fuzzy(s, ['Protocol', 'Proto'])
-                user = pick_fuzzy(s, ['User Name', 'User', 'Username', 'UserName'])
-                url_full = pick_fuzzy(s, ['URL', 'Uri', 'Request URL'])
-                status = pick_fuzzy(s, ['Status', 'Age(seconds) Status', 'In use'])
-
-                rec_kwargs = {
-                    'group_id': group_id,
-                    'proxy_id': proxy.id,
-                    'client_ip': client_ip,
-                    'server_ip': server_ip,
-                    'protocol': protocol,
-                    'user': user,
-                    'category': status,
-                    'transaction': pick(s, ['Transaction']),
-                    'creation_time': to_dt(pick(s, ['Creation Time'])),
-                    'cust_id': pick(s, ['Cust ID']),
-                    'user_name': pick(s, ['User Name', 'User']),
-                    'client_side_mwg_ip': pick(s, ['Client Side MWG IP']),
-                    'server_side_mwg_ip': pick(s, ['Server Side MWG IP']),
-                    'cl_bytes_received': to_bigint(pick(s, ['CL Bytes Received'])),
-                    'cl_bytes_sent': to_bigint(pick(s, ['CL Bytes Sent'])),
-                    'srv_bytes_received': to_bigint(pick(s, ['SRV Bytes Received'])),
-                    'srv_bytes_sent': to_bigint(pick(s, ['SRV Bytes Sent'])),
-                    'trxn_index': to_int(pick(s, ['Trxn Index'])),
-                    'age_seconds': to_int(pick(s, ['Age(seconds)'])),
-                    'in_use': pick(s, ['In use']),
-                    'url': url_full,
-                }
-                if 'url_host' in existing_cols:
-                    rec_kwargs['url_host'] = extract_host(url_full)
-                try:
-                    rec = SessionRecord(**rec_kwargs)
-                    db.session.add(rec)
-                    saved += 1
-                except Exception:
-                    db.session.rollback()
-                    continue
+            # 헤더 -> 컬럼 매핑은 덤프마다 한 번만 컴파일 (주요 필드는 느슨한 매칭)
+            sessions = info['sessions']
+            mapping = compile_field_mapping(sessions.names, fuzzy=True, url_host='url_host' in existing_cols)
+            records = mapping.records(sessions.iter_cells(), interner=sessions.interner, **scope)
+            if history is None and persist and session_history.enabled:
+                # 이번 수집을 새 세대로 이력에 남긴다. 첫 조회 성공 시점에 열어 그 프록시의 저장과
+                # 함께 커밋하므로, 모든 조회가 실패한 수집은 빈 세대를 남기지 않는다
+                history = session_history.open_snapshot(group_id=group_id, batch_size=stats['batch_size'])
+            if history is not None:
+                records = history.tee(records)
+            if persist:
+                saved += self._sync_session_records(scope, records, stats['batch_size'], stats)
+            else:
+                saved += self._insert_session_records(records, stats['batch_size'], stats)
             db.session.commit()
-        return saved
+            self._count_interned(sessions, stats)
+        stats['timed_out'] = len(monitors) - received
+        if persist:
+            # 그룹에서 빠진 프록시의 레코드 정리
+            stale = SessionRecord.query.filter(SessionRecord.group_id == group_id)
+            if proxy_ids:
+                stale = stale.filter(db.or_(
+                    SessionRecord.proxy_id.is_(None),
+                    SessionRecord.proxy_id.notin_(proxy_ids)
+                ))
+            stats['deleted'] += stale.delete(synchronize_session=False)
+            db.session.commit()
+        if history is not None:
+            self._close_history(history, stats)
+        stats['saved'] = saved
+        self._finish_ingest_stats(stats, f'group {group_id}')
+        return stats
 
-    def collect_sessions_by_proxy(self, proxy_id: int, replace: bool = True) -> int:
-        from models import ProxyServer, SessionRecord, db  # local import
+    def collect_sessions_by_proxy(self, proxy_id: int, replace: bool = True,
+                                  batch_size: int | None = None) -> Dict[str, Any]:
+        """프록시 세션 수집 및 저장 (replace=True이면 해당 프록시의 저장 레코드와 증분 동기화)
+
+        이번 호출의 저장 통계(saved 포함)를 반환한다.
+        """
+        from models import ProxyServer, db  # local import
+        stats = self._start_ingest_stats(batch_size)
+        stats['saved'] = 0
         proxy = ProxyServer.query.get(proxy_id)
         if not proxy or not proxy.is_active:
-            return 0
-        if replace:
-            SessionRecord.query.filter_by(proxy_id=proxy_id).delete()
-            db.session.commit()
+            return stats
+        scope = {'proxy_id': proxy_id}
         monitor = ProxyMonitor(
             host=proxy.host,
             username=proxy.username,
@@ -273,103 +537,37 @@ class MonitoringService:
             snmp_port=proxy.snmp_port,
             snmp_community=proxy.snmp_community
         )
-        try:
-            info = monitor.get_session_info()
-        except Exception:
-            return 0
-
-        # 재사용: 그룹 저장 로직과 동일한 매핑
-        def pick(session: dict, keys: list[str]) -> str:
-            if not session:
-                return ''
-            normalized = {''.join(k.lower().split()): v for k, v in session.items()}
-            for key in keys:
-                nk = ''.join(key.lower().split())
-                if nk in normalized and normalized[nk] not in (None, ''):
-                    return str(normalized[nk])
-            return ''
-
-        def to_int(v: str) -> int | None:
-            try:
-                return int(v)
-            except Exception:
-                return None
-
-        def to_bigint(v: str) -> int | None:
-            try:
-                return int(v)
-            except Exception:
-                return None
-
-        def to_dt(v: str):
-            from datetime import datetime
-            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M:%S']:
-                try:
-                    return datetime.strptime(v, fmt)
-                except Exception:
-                    continue
-            return None
-
-        def strip_port(ip: str) -> str:
-            if not ip:
-                return ''
-            return ip.split(':')[0]
-
-        def extract_host(url: str) -> str:
-            if not url:
-                return ''
-            try:
-                from urllib.parse import urlparse
-                parsed = urlparse(url if '://' in url else f'//{url}', allow_fragments=True)
-                host = parsed.hostname or ''
-                return host
-            except Exception:
-                return ''
-
-        saved = 0
+        info = monitor.get_session_info(columnar=True)
+        if info.get('error'):
+            # 조회 실패 시 기존 레코드는 그대로 둔다
+            stats['failed'] += 1
+            stats['error'] = info['error']
+            self._finish_ingest_stats(stats, f'proxy {proxy_id}')
+            return stats
+
+        # 그룹 저장 로직과 같은 필드 목록, 단 엄격 매칭만 사용
         insp = db.inspect(db.engine)
         existing_cols = {c['name'] for c in insp.get_columns('session_records')}
-        for s in info.get('sessions', []):
-            client_ip = strip_port(pick(s, ['Client IP', 'ClientIP', 'Client Address', 'Client']))
-            server_ip = strip_port(pick(s, ['Server IP', 'ServerIP', 'Server Address', 'Server']))
-            protocol = pick(s, ['Protocol', 'Proto'])
-            user = pick(s, ['User Name', 'User', 'Username', 'UserName'])
-            url_full = pick(s, ['URL', 'Uri', 'Request URL'])
-            status = pick(s, ['Status', 'Age(seconds) Status', 'In use'])
-            rec_kwargs = {
-                'group_id': proxy.group_id,
-                'proxy_id': proxy.id,
-                'client_ip': client_ip,
-                'server_ip': server_ip,
-                'protocol': protocol,
-                'user': user,
-                'category': status,
-                'transaction': pick(s, ['Transaction']),
-                'creation_time': to_dt(pick(s, ['Creation Time'])),
-                'cust_id': pick(s, ['Cust ID']),
-                'user_name': pick(s, ['User Name', 'User']),
-                'client_side_mwg_ip': pick(s, ['Client Side MWG IP']),
-                'server_side_mwg_ip': pick(s, ['Server Side MWG IP']),
-                'cl_bytes_received': to_bigint(pick(s, ['CL Bytes Received'])),
-                'cl_bytes_sent': to_bigint(pick(s, ['CL Bytes Sent'])),
-                'srv_bytes_received': to_bigint(pick(s, ['SRV Bytes Received'])),
-                'srv_bytes_sent': to_bigint(pick(s, ['SRV Bytes Sent'])),
-                'trxn_index': to_int(pick(s, ['Trxn Index'])),
-                'age_seconds': to_int(pick(s, ['Age(seconds)'])),
-                'in_use': pick(s, ['In use']),
-                'url': url_full,
-            }
-            if 'url_host' in existing_cols:
-                rec_kwargs['url_host'] = extract_host(url_full)
-            try:
-                rec = SessionRecord(**rec_kwargs)
-                db.session.add(rec)
-                saved += 1
-            except Exception:
-                db.session.rollback()
-                continue
+        sessions = info['sessions']
+        mapping = compile_field_mapping(sessions.names, fuzzy=False, url_host='url_host' in existing_cols)
+        records = mapping.records(sessions.iter_cells(), interner=sessions.interner,
+                                  group_id=proxy.group_id, proxy_id=proxy.id)
+        history = None
+        if replace and session_history.enabled:
+            history = session_history.open_snapshot(group_id=proxy.group_id, proxy_id=proxy.id,
+                                                    batch_size=stats['batch_size'])
+            records = history.tee(records)
+        if replace:
+            saved = self._sync_session_records(scope, records, stats['batch_size'], stats)
+        else:
+            saved = self._insert_session_records(records, stats['batch_size'], stats)
         db.session.commit()
-        return saved
+        self._count_interned(sessions, stats)
+        if history is not None:
+            self._close_history(history, stats)
+        stats['saved'] = saved
+        self._finish_ingest_stats(stats, f'proxy {proxy_id}')
+        return stats
 
     def search_sessions(self, group_id: int | None, keyword: str | None, limit: int = 1000) -> List[Dict[str, Any]]:
         from models import SessionRecord, db  # local import
@@ -0,0 +1,259 @@
+"""세션 스냅샷 이력 모듈 (platform)
+
+세션 수집 결과를 세대(SessionSnapshot) 단위로 보관한다.
+행은 생성 시각의 시간 버킷별 테이블(session_history_p<버킷 시작 UTC>)에 나눠 저장하고,
+보존 기간이 지나거나 행 수 예산을 넘으면 가장 오래된 버킷 테이블을 통째로 DROP 한다.
+조회는 세대 목록에서 대상 버킷 테이블을 찾아 그 테이블만 읽는다.
+
+설정 (app.config):
+    SESSION_HISTORY_ENABLED: 이력 저장 여부 (기본 False, 필요할 때 켠다)
+    SESSION_HISTORY_BUCKET_SECONDS: 버킷(파티션) 크기 (초, 기본 3600)
+    SESSION_HISTORY_RETENTION_HOURS: 보존 기간 (시간, 기본 168)
+    SESSION_HISTORY_MAX_ROWS: 전체 이력 행 수 예산 (기본 5,000,000, 0이면 무제한)
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import sqlalchemy as sa
+
+from .utils import logger
+
+PARTITION_PREFIX = 'session_history_p'
+
+DEFAULT_SETTINGS = {
+    'SESSION_HISTORY_ENABLED': False,
+    'SESSION_HISTORY_BUCKET_SECONDS': 3600,
+    'SESSION_HISTORY_RETENTION_HOURS': 168,
+    'SESSION_HISTORY_MAX_ROWS': 5_000_000,
+}
+
+# SessionRecord 컬럼 중 이력에 남기지 않는 컬럼
+_EXCLUDED_COLUMNS = frozenset({'id', 'created_at', 'policy'})
+
+
+def _setting(name: str) -> Any:
+    from flask import current_app
+    return current_app.config.get(name, DEFAULT_SETTINGS[name])
+
+
+class SnapshotWriter:
+    """세대 하나의 행을 버킷 테이블에 배치 단위로 저장 (커밋은 호출자가 한다)"""
+
+    def __init__(self, snapshot, table: sa.Table, batch_size: int):
+        self.snapshot = snapshot
+        self.snapshot_id = snapshot.id
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self._columns = [column.name for column in table.columns if column.name != 'id']
+        self._batch: List[Dict[str, Any]] = []
+        self.row_count = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        row = {column: record.get(column) for column in self._columns}
+        row['snapshot_id'] = self.snapshot_id
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def tee(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """레코드를 그대로 내보내면서 이력에도 저장"""
+        append = self.append
+        for record in records:
+            append(record)
+            yield record
+
+    def _flush(self) -> None:
+        from models import db  # local import
+        if self._batch:
+            db.session.execute(self.table.insert(), self._batch)
+            self.row_count += len(self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        self._flush()
+        self.snapshot.row_count = self.row_count
+
+
+class SessionHistoryStore:
+    """시간 버킷으로 나눈 세션 스냅샷 이력 저장소"""
+
+    def __init__(self):
+        # 버킷 테이블 정의는 모델 메타데이터와 분리해 db.create_all 대상에서 제외
+        self._metadata = sa.MetaData()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(_setting('SESSION_HISTORY_ENABLED'))
+
+    def bucket_start(self, when: datetime) -> datetime:
+        seconds = max(60, int(_setting('SESSION_HISTORY_BUCKET_SECONDS')))
+        epoch = int((when - datetime(1970, 1, 1)).total_seconds())
+        return datetime(1970, 1, 1) + timedelta(seconds=epoch - epoch % seconds)
+
+    @staticmethod
+    def partition_name(bucket_start: datetime) -> str:
+        return f"{PARTITION_PREFIX}{bucket_start:%Y%m%d%H%M}"
+
+    def partition_table(self, name: str) -> sa.Table:
+        """버킷 테이블 정의 (SessionRecord 데이터 컬럼 + snapshot_id)"""
+        from models import SessionRecord  # local import
+        with self._lock:
+            table = self._metadata.tables.get(name)
+            if table is None:
+                columns = [
+                    sa.Column(column.name, column.type)
+                    for column in SessionRecord.__table__.columns
+                    if column.name not in _EXCLUDED_COLUMNS
+                ]
+                table = sa.Table(
+                    name, self._metadata,
+                    sa.Column('id', sa.Integer, primary_key=True),
+                    sa.Column('snapshot_id', sa.Integer, nullable=False, index=True),
+                    *columns
+                )
+            return table
+
+    def open_snapshot(self, group_id: Optional[int] = None, proxy_id: Optional[int] = None,
+                      batch_size: int = 1000) -> SnapshotWriter:
+        """새 세대를 만들고 해당 버킷 테이블이 없으면 생성한 뒤 writer를 반환"""
+        from models import SessionSnapshot, db  # local import
+        now = datetime.utcnow()
+        bucket_start = self.bucket_start(now)
+        name = self.partition_name(bucket_start)
+        table = self.partition_table(name)
+        # 세션의 연결에서 생성해야 진행 중인 트랜잭션과 잠금이 충돌하지 않는다
+        table.create(bind=db.session.connection(), checkfirst=True)
+        snapshot = SessionSnapshot(group_id=group_id, proxy_id=proxy_id, partition=name,
+                                   bucket_start=bucket_start, row_count=0, created_at=now)
+        db.session.add(snapshot)
+        db.session.flush()
+        return SnapshotWriter(snapshot, table, batch_size)
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """보존 기간이 지난 버킷과 행 수 예산을 넘는 오래된 버킷을 DROP (가장 최근 버킷은 유지)"""
+        from models import SessionSnapshot, db  # local import
+        now = now or datetime.utcnow()
+        bucket_seconds = max(60, int(_setting('SESSION_HISTORY_BUCKET_SECONDS')))
+        cutoff = now - timedelta(hours=float(_setting('SESSION_HISTORY_RETENTION_HOURS')))
+        max_rows = int(_setting('SESSION_HISTORY_MAX_ROWS'))
+
+        partitions = db.session.execute(
+            sa.select(
+                SessionSnapshot.partition,
+                sa.func.max(SessionSnapshot.bucket_start),
+                sa.func.coalesce(sa.func.sum(SessionSnapshot.row_count), 0)
+            ).group_by(SessionSnapshot.partition).order_by(sa.func.max(SessionSnapshot.bucket_start))
+        ).all()
+        total_rows = sum(rows for _, _, rows in partitions)
+
+        dropped: List[str] = []
+        dropped_rows = 0
+        for position, (name, bucket_start, rows) in enumerate(partitions):
+            if position == len(partitions) - 1:
+                break
+            expired = bucket_start + timedelta(seconds=bucket_seconds) <= cutoff
+            over_budget = max_rows > 0 and total_rows > max_rows
+            if not (expired or over_budget):
+                break
+            self.partition_table(name).drop(bind=db.session.connection(), checkfirst=True)
+            SessionSnapshot.query.filter_by(partition=name).delete(synchronize_session=False)
+            with self._lock:
+                self._metadata.remove(self._metadata.tables[name])
+            dropped.append(name)
+            dropped_rows += rows
+            total_rows -= rows
+        db.session.commit()
+        if dropped:
+            logger.info(f"세션 이력 정리: 파티션 {len(dropped)}개, {dropped_rows}행 삭제")
+        return {'dropped_partitions': dropped, 'dropped_rows': dropped_rows, 'remaining_rows': total_rows}
+
+    def latest_snapshot(self, group_id: Optional[int] = None, proxy_id: Optional[int] = None):
+        """범위별 최신 세대 (proxy_id 지정 시 프록시 단위, 아니면 그룹 단위 세대)"""
+        from models import SessionSnapshot  # local import
+        query = SessionSnapshot.query
+        if proxy_id:
+            query = query.filter(SessionSnapshot.proxy_id == proxy_id)
+        else:
+            query = query.filter(SessionSnapshot.proxy_id.is_(None))
+            if group_id:
+                query = query.filter(SessionSnapshot.group_id == group_id)
+        return query.order_by(SessionSnapshot.id.desc()).first()
+
+    def list_snapshots(self, group_id: Optional[int] = None, proxy_id: Optional[int] = None,
+                       start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       limit: int = 100) -> List[Any]:
+        """세대 목록 (최신순). 기간은 세대 생성 시각 기준 [start, end)"""
+        from models import SessionSnapshot  # local import
+        query = SessionSnapshot.query
+        if group_id:
+            query = query.filter(SessionSnapshot.group_id == group_id)
+        if proxy_id:
+            query = query.filter(SessionSnapshot.proxy_id == proxy_id)
+        if start:
+            query = query.filter(SessionSnapshot.created_at >= start)
+        if end:
+            query = query.filter(SessionSnapshot.created_at < end)
+        return query.order_by(SessionSnapshot.id.desc()).limit(limit).all()
+
+    def snapshot_rows(self, snapshots: List[Any], limit: int = 1000, offset: int = 0,
+                      proxy_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """세대들의 행 (세대 최신순). 세대가 속한 버킷 테이블만 읽는다"""
+        from models import db  # local import
+        by_partition: Dict[str, List[int]] = {}
+        created: Dict[int, str] = {}
+        for snapshot in sorted(snapshots, key=lambda s: s.id, reverse=True):
+            by_partition.setdefault(snapshot.partition, []).append(snapshot.id)
+            created[snapshot.id] = snapshot.created_at.isoformat() if snapshot.created_at else None
+
+        rows: List[Dict[str, Any]] = []
+        for name, snapshot_ids in by_partition.items():
+            if len(rows) >= offset + limit:
+                break
+            table = self.partition_table(name)
+            query = sa.select(table).where(table.c.snapshot_id.in_(snapshot_ids))
+            if proxy_id:
+                query = query.where(table.c.proxy_id == proxy_id)
+            query = query.order_by(table.c.snapshot_id.desc(), table.c.id).limit(offset + limit - len(rows))
+            try:
+                result = db.session.execute(query)
+            except sa.exc.OperationalError:
+                # 정리 중 DROP 된 파티션
+                db.session.rollback()
+                continue
+            for row in result.mappings():
+                item = dict(row)
+                item.pop('id', None)
+                if item.get('creation_time'):
+                    item['creation_time'] = item['creation_time'].isoformat()
+                item['snapshot_created_at'] = created.get(item['snapshot_id'])
+                rows.append(item)
+        return rows[offset:offset + limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """파티션별 세대 수/행 수"""
+        from models import SessionSnapshot, db  # local import
+        partitions = db.session.execute(
+            sa.select(
+                SessionSnapshot.partition,
+                sa.func.count(SessionSnapshot.id),
+                sa.func.coalesce(sa.func.sum(SessionSnapshot.row_count), 0)
+            ).group_by(SessionSnapshot.partition).order_by(SessionSnapshot.partition)
+        ).all()
+        return {
+            'enabled': self.enabled,
+            'bucket_seconds': int(_setting('SESSION_HISTORY_BUCKET_SECONDS')),
+            'retention_hours': float(_setting('SESSION_HISTORY_RETENTION_HOURS')),
+            'max_rows': int(_setting('SESSION_HISTORY_MAX_ROWS')),
+            'total_rows': sum(rows for _, _, rows in partitions),
+            'partitions': [
+                {'partition': name, 'snapshots': count, 'rows': rows}
+                for name, count, rows in partitions
+            ],
+        }
+
+
+# 전역 세션 이력 저장소
+session_history = SessionHistoryStore()
@@ -0,0 +1,369 @@
+"""세션 적재 매핑 모듈 (platform)
+
+세션 표 헤더를 SessionRecord 컬럼으로 옮기는 매핑을 덤프(헤더)마다 한 번만 컴파일한다.
+행마다 키 정규화와 부분 문자열 탐색을 반복하던 기존 pick/pick_fuzzy 와 같은 값을 만든다.
+
+- 엄격 매칭(pick): 소문자화 + 공백 제거한 이름이 같은 컬럼 (같은 이름이 여럿이면 마지막 컬럼)
+- 느슨한 매칭(pick_fuzzy): 엄격 매칭 후, 후보 이름의 단어가 모두 포함된 컬럼을 헤더 순서로
+- 행에서는 후보 컬럼 위치를 순서대로 보며 처음 값이 있는 셀을 고른다
+"""
+
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse, urlsplit
+
+from .session_parser import StringInterner
+
+# (SessionRecord 컬럼, 후보 헤더 이름, 그룹 수집 시 느슨한 매칭 여부, 변환 함수 이름)
+SESSION_FIELDS: Tuple[Tuple[str, Tuple[str, ...], bool, Optional[str]], ...] = (
+    ('client_ip', ('Client IP', 'ClientIP', 'Client Address', 'Client'), True, 'strip_port'),
+    ('server_ip', ('Server IP', 'ServerIP', 'Server Address', 'Server'), True, 'strip_port'),
+    ('protocol', ('Protocol', 'Proto'), True, None),
+    ('user', ('User Name', 'User', 'Username', 'UserName'), True, None),
+    ('category', ('Status', 'Age(seconds) Status', 'In use'), True, None),
+    ('transaction', ('Transaction',), False, None),
+    ('creation_time', ('Creation Time',), False, 'to_dt'),
+    ('cust_id', ('Cust ID',), False, None),
+    ('user_name', ('User Name', 'User'), False, None),
+    ('client_side_mwg_ip', ('Client Side MWG IP',), False, None),
+    ('server_side_mwg_ip', ('Server Side MWG IP',), False, None),
+    ('cl_bytes_received', ('CL Bytes Received',), False, 'to_int'),
+    ('cl_bytes_sent', ('CL Bytes Sent',), False, 'to_int'),
+    ('srv_bytes_received', ('SRV Bytes Received',), False, 'to_int'),
+    ('srv_bytes_sent', ('SRV Bytes Sent',), False, 'to_int'),
+    ('trxn_index', ('Trxn Index',), False, 'to_int'),
+    ('age_seconds', ('Age(seconds)',), False, 'to_int'),
+    ('in_use', ('In use',), False, None),
+    ('url', ('URL', 'Uri', 'Request URL'), True, None),
+)
+
+TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M:%S')
+
+
+def to_int(v: str) -> Optional[int]:
+    try:
+        return int(v)
+    except Exception:
+        return None
+
+
+def to_dt(v: str) -> Optional[datetime]:
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(v, fmt)
+        except Exception:
+            continue
+    return None
+
+
+# TIMESTAMP_FORMATS 와 같은 순서의 고정 폭 배치: (길이, {위치: 구분 문자})
+_TIMESTAMP_LAYOUTS = (
+    (19, {4: '-', 7: '-', 10: ' ', 13: ':', 16: ':'}),
+    (16, {4: '-', 7: '-', 10: ' ', 13: ':'}),
+    (19, {4: '/', 7: '/', 10: ' ', 13: ':', 16: ':'}),
+)
+
+
+class TimestampDecoder:
+    """덤프 하나에 쓰는 creation_time 디코더 (결과는 to_dt 와 같다)
+
+    처음 해석에 성공한 값으로 장비의 시각 형식(고정 폭 배치)을 정하고,
+    이후에는 정해진 위치의 숫자를 잘라 datetime을 만든다. 배치가 맞지 않는 값
+    (공백 개수 차이, 0 채움 없는 숫자 등)만 strptime 기반 to_dt 로 처리한다.
+    같은 초에 생성된 세션이 많으므로 같은 문자열의 결과는 기억해 둔다.
+    """
+
+    def __init__(self, max_cache: int = 65536):
+        self.max_cache = max_cache
+        self.layout: Optional[Tuple[int, Dict[int, str]]] = None
+        self._cache: Dict[str, Optional[datetime]] = {}
+        self.hits = 0
+        self.fast = 0
+        self.slow = 0
+
+    @staticmethod
+    def _parse_layout(v: str, layout: Tuple[int, Dict[int, str]]) -> Optional[datetime]:
+        length, separators = layout
+        if len(v) != length or not v.isascii():
+            return None
+        for position, char in separators.items():
+            if v[position] != char:
+                return None
+        digits = v[0:4] + v[5:7] + v[8:10] + v[11:13] + v[14:16] + (v[17:19] if length == 19 else '')
+        if not digits.isdigit():
+            return None
+        try:
+            return datetime(int(v[0:4]), int(v[5:7]), int(v[8:10]), int(v[11:13]), int(v[14:16]),
+                            int(v[17:19]) if length == 19 else 0)
+        except ValueError:
+            return None
+
+    def _decode(self, v: str) -> Optional[datetime]:
+        if not v:
+            # 빈 칸/None 은 to_dt 와 같이 None (배치 판별에 쓰지 않는다)
+            return None
+        if self.layout is not None:
+            value = self._parse_layout(v, self.layout)
+            if value is not None:
+                self.fast += 1
+                return value
+        else:
+            for layout in _TIMESTAMP_LAYOUTS:
+                value = self._parse_layout(v, layout)
+                if value is not None:
+                    self.layout = layout
+                    self.fast += 1
+                    return value
+        self.slow += 1
+        return to_dt(v)
+
+    def decode(self, v: str) -> Optional[datetime]:
+        cache = self._cache
+        if v in cache:
+            self.hits += 1
+            return cache[v]
+        value = self._decode(v)
+        if len(cache) >= self.max_cache:
+            cache.clear()
+        cache[v] = value
+        return value
+
+
+def strip_port(ip: str) -> str:
+    if not ip:
+        return ''
+    return ip.split(':')[0]
+
+
+# url_host 캐시 크기 (netloc 단위, 프로세스 전체 공유)
+HOST_CACHE_SIZE = 8192
+
+# 흔한 형태의 netloc 구간: 'scheme://netloc' 또는 scheme 없는 'netloc', 뒤에 '/', '?', '#' 또는 끝.
+# urlsplit 이 지우는 탭/개행이 netloc 안에 있으면 매칭하지 않아 기존 경로로 처리한다.
+_SCHEME_NETLOC = re.compile(r'[A-Za-z][A-Za-z0-9+.\-]*://([^/?#\t\r\n]*)(?:[/?#]|\Z)')
+_BARE_NETLOC = re.compile(r'([^/?#\t\r\n]*)(?:[/?#]|\Z)')
+
+# 그룹 수집은 여러 요청 스레드에서 동시에 돌 수 있으므로 건수 갱신은 잠금 안에서 한다
+_host_counts = {'fast': 0, 'slow': 0}
+_host_counts_lock = threading.Lock()
+
+
+def _parse_host(url: str) -> str:
+    """urlparse 기반 호스트 추출 (기존 구현, 빠른 경로가 맞지 않는 url용)"""
+    try:
+        parsed = urlparse(url if '://' in url else f'//{url}', allow_fragments=True)
+        return parsed.hostname or ''
+    except Exception:
+        return ''
+
+
+@lru_cache(maxsize=HOST_CACHE_SIZE)
+def _netloc_host(netloc: str) -> str:
+    """netloc 하나의 호스트 (hostname 은 netloc 에만 의존하므로 url 대신 netloc 을 캐시 키로 쓴다)"""
+    try:
+        return urlsplit('//' + netloc).hostname or ''
+    except Exception:
+        return ''
+
+
+def extract_host(url: str) -> str:
+    """url의 호스트 (소문자). 결과는 _parse_host 와 같다
+
+    세션 url 은 경로만 다르고 호스트가 반복되므로, 'scheme://host[:port]/...' 형태는
+    정규식으로 netloc 만 잘라 LRU 캐시(_netloc_host)에서 찾는다.
+    """
+    if not url:
+        return ''
+    match = (_SCHEME_NETLOC if '://' in url else _BARE_NETLOC).match(url)
+    path = 'slow' if match is None else 'fast'
+    with _host_counts_lock:
+        _host_counts[path] += 1
+    if match is None:
+        return _parse_host(url)
+    return _netloc_host(match.group(1))
+
+
+def host_cache_stats() -> Dict[str, Any]:
+    """url_host 캐시 적중률과 빠른 경로/기존 경로 처리 건수"""
+    info = _netloc_host.cache_info()
+    with _host_counts_lock:
+        counts = dict(_host_counts)
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'fast': counts['fast'],
+        'slow': counts['slow'],
+    }
+
+
+CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    'to_int': to_int,
+    'to_dt': to_dt,
+    'strip_port': strip_port,
+}
+
+
+def _normalize(name: str) -> str:
+    return ''.join(name.lower().split())
+
+
+def _fuzzy_tokens_match(tokens: List[str], key: str) -> bool:
+    key = key.replace('_', ' ').replace('-', ' ')
+    return all(tok in key for tok in tokens)
+
+
+def pick(session: Dict[str, Any], keys: Sequence[str]) -> str:
+    """후보 키들 중 첫번째로 값이 존재하는 것을 선택 (대소문자/공백 차이 보정, 행 단위 기준 구현)"""
+    if not session:
+        return ''
+    normalized = {_normalize(k): v for k, v in session.items()}
+    for key in keys:
+        nk = _normalize(key)
+        if nk in normalized and normalized[nk] not in (None, ''):
+            return str(normalized[nk])
+    return ''
+
+
+def pick_fuzzy(session: Dict[str, Any], candidates: Sequence[str]) -> str:
+    """느슨한 키 탐색: 엄격 매칭 후 부분 문자열 매칭으로 첫 값 선택 (행 단위 기준 구현)"""
+    if not session:
+        return ''
+    lowered = {k.lower(): v for k, v in session.items() if v not in (None, '')}
+    strict = pick(session, candidates)
+    if strict:
+        return strict
+    for want in candidates:
+        tokens = [t for t in want.lower().split() if t]
+        for key, val in lowered.items():
+            if _fuzzy_tokens_match(tokens, key):
+                return str(val)
+    return ''
+
+
+class SessionFieldMapping:
+    """헤더 하나에 대해 컴파일한 세션 행 -> SessionRecord 컬럼 매핑
+
+    컬럼마다 후보 셀 위치 튜플을 미리 구해 두고, 행에서는 처음 값이 있는 셀만 고른다.
+    후보가 없는 컬럼은 변환 결과를 상수로 둔다.
+    """
+
+    def __init__(self, names: Sequence[str], fuzzy: bool = False, url_host: bool = False):
+        """
+        Args:
+            names: 세션 표 컬럼 이름 (행 dict의 키와 같은, strip된 헤더)
+            fuzzy: True이면 그룹 수집과 같이 주요 필드에 느슨한 매칭을 적용
+            url_host: True이면 url에서 추출한 url_host 컬럼도 채운다
+        """
+        self.names = tuple(names)
+        self.fuzzy = fuzzy
+        self.url_host = url_host
+        self.constants: Dict[str, Any] = {}
+        self.fields: List[Tuple[str, Tuple[int, ...], Optional[Callable[[str], Any]]]] = []
+
+        # 소문자 이름이 겹치면 위치 기반 매핑이 기존 dict 기반 결과와 달라질 수 있어 행 단위로 처리
+        self.ambiguous = len({name.lower() for name in self.names}) != len(self.names)
+
+        strict_index = {_normalize(name): position for position, name in enumerate(self.names)}
+        for column, candidates, column_fuzzy, converter_name in SESSION_FIELDS:
+            convert = CONVERTERS.get(converter_name) if converter_name else None
+            positions: List[int] = []
+            for candidate in candidates:
+                position = strict_index.get(_normalize(candidate))
+                if position is not None and position not in positions:
+                    positions.append(position)
+            if fuzzy and column_fuzzy:
+                for candidate in candidates:
+                    tokens = [t for t in candidate.lower().split() if t]
+                    for position, name in enumerate(self.names):
+                        if position not in positions and _fuzzy_tokens_match(tokens, name.lower()):
+                            positions.append(position)
+            if not positions:
+                self.constants[column] = convert('') if convert else ''
+            else:
+                self.fields.append((column, tuple(positions), convert))
+
+    def extract(self, cells: Sequence[str]) -> Dict[str, Any]:
+        """헤더 폭에 맞춘 셀 목록 한 행을 SessionRecord 컬럼 dict로 변환"""
+        return self._extract(cells, self.fields, extract_host)
+
+    def _extract(self, cells: Sequence[str], fields, host_of: Callable[[str], str]) -> Dict[str, Any]:
+        if self.ambiguous:
+            return self._extract_by_row(cells, host_of)
+        record = dict(self.constants)
+        for column, positions, convert in fields:
+            value = ''
+            for position in positions:
+                cell = cells[position]
+                if cell:
+                    value = cell
+                    break
+            record[column] = convert(value) if convert else value
+        if self.url_host:
+            record['url_host'] = host_of(record['url'])
+        return record
+
+    def _extract_by_row(self, cells: Sequence[str], host_of: Callable[[str], str]) -> Dict[str, Any]:
+        session = dict(zip(self.names, cells))
+        record: Dict[str, Any] = {}
+        for column, candidates, column_fuzzy, converter_name in SESSION_FIELDS:
+            value = pick_fuzzy(session, candidates) if self.fuzzy and column_fuzzy else pick(session, candidates)
+            convert = CONVERTERS.get(converter_name) if converter_name else None
+            record[column] = convert(value) if convert else value
+        if self.url_host:
+            record['url_host'] = host_of(record['url'])
+        return record
+
+    def records(self, rows: Iterable[Sequence[str]], interner: Optional[StringInterner] = None,
+                **fixed: Any) -> Iterator[Dict[str, Any]]:
+        """행 반복자를 받아 fixed 값(group_id, proxy_id 등)을 더한 레코드 dict를 하나씩 내보낸다
+
+        creation_time 은 덤프마다 새 TimestampDecoder 로 해석한다.
+        interner(보통 파싱에 쓴 것)를 주면 행마다 새로 만들어지는 파생 문자열
+        (포트를 뗀 IP, url_host)도 덤프 안에서 공유한다.
+        """
+        decoder = TimestampDecoder()
+        host_of = extract_host
+        convert_ip = strip_port
+        if interner is not None:
+            intern = interner.intern
+
+            def host_of(url: str) -> str:
+                return intern(extract_host(url))
+
+            def convert_ip(ip: str) -> str:
+                return intern(strip_port(ip))
+
+        replacements = {to_dt: decoder.decode, strip_port: convert_ip}
+        fields = [
+            (column, positions, replacements.get(convert, convert))
+            for column, positions, convert in self.fields
+        ]
+        extract = self._extract
+        for cells in rows:
+            record = extract(cells, fields, host_of)
+            record.update(fixed)
+            yield record
+
+
+_mapping_cache: Dict[Tuple[Tuple[str, ...], bool, bool], SessionFieldMapping] = {}
+_mapping_lock = threading.Lock()
+
+
+def compile_field_mapping(names: Sequence[str], fuzzy: bool = False, url_host: bool = False) -> SessionFieldMapping:
+    """헤더별로 한 번만 컴파일한 SessionFieldMapping (장비들이 같은 헤더를 쓰면 재사용)"""
+    key = (tuple(names), fuzzy, url_host)
+    with _mapping_lock:
+        mapping = _mapping_cache.get(key)
+        if mapping is None:
+            if len(_mapping_cache) >= 32:
+                _mapping_cache.clear()
+            mapping = SessionFieldMapping(key[0], fuzzy=fuzzy, url_host=url_host)
+            _mapping_cache[key] = mapping
+        return mapping
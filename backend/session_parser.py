@@ -0,0 +1,299 @@
+"""세션 표 파서 모듈 (platform)
+
+세션 명령 출력(파이프 구분 표)을 세션 dict로 변환한다.
+헤더 라인에서 컬럼 계획을 한 번 만들고, 데이터 라인은 ``str.split('|')`` 한 번으로 나눈다.
+결과는 ``utils.split_line`` 을 라인마다 적용하던 기존 파서와 같다.
+"""
+
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .utils import logger
+
+# 헤더 식별에 필요한 컬럼
+REQUIRED_HEADERS = frozenset({'Transaction', 'Creation Time', 'URL'})
+
+# 값 종류가 적어 사전 인코딩으로 저장하는 컬럼
+DICTIONARY_COLUMNS = frozenset({
+    'Protocol', 'Status', 'In use', 'Client Side MWG IP', 'Server Side MWG IP',
+})
+
+# 파싱 단계에서 덤프 내 같은 값을 한 객체로 공유하는 컬럼 (값 종류가 적은 컬럼)
+INTERNED_COLUMNS = DICTIONARY_COLUMNS | {'Cust ID'}
+
+# 구분선 구성 문자 (대시/플러스/이퀄스/파이프와 ASCII 공백)
+_SEPARATOR_CHARS = ' \t\n\r\x0b\x0c|+=-'
+
+
+def is_separator_line(line: str) -> bool:
+    """구분선 같은 라인 (대시/플러스/이퀄스/공백/파이프만 구성) 여부"""
+    rest = line.strip(_SEPARATOR_CHARS)
+    if not rest:
+        return True
+    if not rest[0].isspace():
+        return False
+    # ASCII 외 공백 문자가 섞인 드문 경우는 원래 규칙으로 판정
+    without_pipes = line.strip().replace('|', '').replace('+', '').replace('=', '').replace('-', '').strip()
+    return without_pipes == ''
+
+
+def split_cells(line: str) -> List[str]:
+    """파이프 구분 라인을 셀 목록으로 분리 (``utils.split_line`` 과 같은 결과)
+
+    선두/말미 파이프로 생기는 빈 셀만 제거하고 내부의 빈 셀은 유지한다.
+    """
+    cells = [cell.strip() for cell in line.strip().split('|')]
+    if cells and cells[0] == '':
+        del cells[0]
+    if cells and cells[-1] == '':
+        cells.pop()
+    return cells
+
+
+class StringInterner:
+    """덤프 하나 안에서 같은 문자열 값을 객체 하나로 공유 (파싱과 적재 단계 공용)
+
+    이미 있는 값이 다시 들어오면 기존 객체를 돌려주고, 버려지는 중복 객체 크기를 bytes_saved 로 센다.
+    """
+
+    __slots__ = ('_table', 'hits', 'bytes_saved')
+
+    def __init__(self):
+        self._table: Dict[str, str] = {}
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def intern(self, value: str) -> str:
+        existing = self._table.setdefault(value, value)
+        if existing is not value:
+            self.hits += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return existing
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def stats(self) -> Dict[str, int]:
+        return {'distinct': len(self._table), 'hits': self.hits, 'bytes_saved': self.bytes_saved}
+
+
+class SessionTableParser:
+    """헤더로부터 컬럼 계획을 만든 세션 표 행 파서"""
+
+    def __init__(self, header: List[str], interner: Optional[StringInterner] = None):
+        self.header = list(header)
+        self.columns = tuple(column.strip() for column in self.header)
+        self.width = len(self.columns)
+        self.interner = interner
+        # 공유할 컬럼 위치 (interner가 없으면 비움)
+        self._interned = tuple(
+            position for position, column in enumerate(self.columns) if column in INTERNED_COLUMNS
+        ) if interner is not None else ()
+
+    @staticmethod
+    def is_header(cells: List[str]) -> bool:
+        return REQUIRED_HEADERS.issubset(cells)
+
+    def parse_cells(self, line: str) -> Optional[List[str]]:
+        """데이터 라인 하나를 헤더 폭에 맞춘 셀 목록으로 변환 (데이터 라인이 아니면 None)
+
+        컬럼 수가 부족하면 빈 값으로 채우고, 넘치면 마지막 컬럼(URL)으로 ' | ' 로 합친다.
+        """
+        if '|' not in line:
+            return None
+        if is_separator_line(line):
+            return None
+        try:
+            cells = split_cells(line)
+            width = self.width
+            if len(cells) != width:
+                if len(cells) < width:
+                    cells.extend([''] * (width - len(cells)))
+                else:
+                    cells = cells[:width - 1] + [' | '.join(cells[width - 1:])]
+            if self._interned:
+                intern = self.interner.intern
+                for position in self._interned:
+                    cells[position] = intern(cells[position])
+            return cells
+        except Exception as e:
+            logger.error(f"세션 데이터 파싱 오류: {e}")
+            return None
+
+    def parse_row(self, line: str) -> Optional[Dict[str, Any]]:
+        """데이터 라인 하나를 세션 dict로 변환 (데이터 라인이 아니면 None)"""
+        cells = self.parse_cells(line)
+        if cells is None:
+            return None
+        return dict(zip(self.columns, cells))
+
+
+class DictionaryColumn:
+    """사전 인코딩 컬럼: 서로 다른 값은 한 번만 저장하고 행마다 4바이트 코드만 둔다"""
+
+    __slots__ = ('values', 'codes', '_index')
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes = array('I')
+        self._index: Dict[Any, int] = {}
+
+    def append(self, value: Any) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, position: int) -> Any:
+        return self.values[self.codes[position]]
+
+    def __iter__(self) -> Iterator[Any]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+
+class SessionColumns:
+    """컬럼 단위 세션 저장소
+
+    컬럼마다 값 목록 하나를 두고, DICTIONARY_COLUMNS 는 사전 인코딩한다.
+    행 접근(인덱싱/반복/to_rows)은 SessionTableParser.parse_row 와 같은 dict를 만들어 준다.
+    """
+
+    def __init__(self, headers: List[str], dictionary_columns: Iterable[str] = DICTIONARY_COLUMNS,
+                 interner: Optional[StringInterner] = None):
+        self.headers = list(headers)
+        # 파싱에 쓴 interner (적재 단계에서 파생 값 공유에 재사용)
+        self.interner = interner
+        self.names = tuple(header.strip() for header in self.headers)
+        dictionary_columns = frozenset(dictionary_columns)
+        self._data: List[Any] = [
+            DictionaryColumn() if name in dictionary_columns else []
+            for name in self.names
+        ]
+        self._appenders: List[Callable[[Any], None]] = [column.append for column in self._data]
+        # 이름이 중복되면 dict 변환과 같이 마지막 컬럼을 사용
+        self._positions = {name: position for position, name in enumerate(self.names)}
+        self._length = 0
+
+    def append(self, cells: List[Any]) -> None:
+        """헤더 폭에 맞춘 셀 목록 한 행 추가"""
+        for append, value in zip(self._appenders, cells):
+            append(value)
+        self._length += 1
+
+    def position(self, name: str) -> Optional[int]:
+        return self._positions.get(name)
+
+    def column(self, name: str) -> List[Any]:
+        """컬럼 값 목록 (사전 인코딩 컬럼은 풀어서 반환)"""
+        return list(self._data[self._positions[name]])
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        return {name: self.column(name) for name in self._positions}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return dict(zip(self.names, (column[index] for column in self._data)))
+
+    def iter_cells(self) -> Iterator[tuple]:
+        """행마다 헤더 순서의 값 튜플 (dict를 만들지 않는 적재용 반복)"""
+        if not self._data:
+            return iter([()] * self._length)
+        return zip(*self._data)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        names = self.names
+        for row in self.iter_cells():
+            yield dict(zip(names, row))
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """기존 API 직렬화용 행 목록"""
+        return list(self)
+
+
+def _iter_table(lines: Iterable[str], meta: Optional[Dict[str, Any]],
+                convert: Callable[[SessionTableParser, str], Any],
+                interner: Optional[StringInterner] = None) -> Iterator[Any]:
+    """세션 표 라인을 받아 데이터 행을 convert(parser, line) 결과로 하나씩 내보낸다
+
+    헤더를 찾은 뒤부터는 라인을 받는 즉시 파싱하므로 입력 전체를 보관하지 않는다.
+    기대 헤더가 끝내 없으면 최초의 파이프 포함 라인을 헤더로 간주하는데,
+    이 경우에만 그 이후 라인을 끝까지 모아 두었다가 파싱한다.
+    """
+    if meta is None:
+        meta = {}
+    meta['headers'] = None
+    meta['line_count'] = 0
+
+    parser: Optional[SessionTableParser] = None
+    fallback_header: Optional[List[str]] = None
+    fallback_lines: List[str] = []
+    line_count = 0
+    last_line = ''
+
+    for line in lines:
+        line_count += 1
+        last_line = line
+        if parser is not None:
+            row = convert(parser, line)
+            if row is not None:
+                yield row
+            continue
+
+        if '|' not in line:
+            if fallback_header is not None:
+                fallback_lines.append(line)
+            continue
+        if not is_separator_line(line):
+            cells = split_cells(line)
+            if SessionTableParser.is_header(cells):
+                parser = SessionTableParser(cells, interner)
+                meta['headers'] = parser.header
+                fallback_lines = []
+                continue
+        if fallback_header is None:
+            fallback_header = split_cells(line)
+        else:
+            fallback_lines.append(line)
+
+    meta['line_count'] = line_count - 1 if line_count and last_line.strip() == '' else line_count
+
+    if parser is None and fallback_header is not None:
+        # 폴백: 최초의 파이프 포함 라인을 헤더로 간주
+        parser = SessionTableParser(fallback_header, interner)
+        meta['headers'] = parser.header
+        for line in fallback_lines:
+            row = convert(parser, line)
+            if row is not None:
+                yield row
+
+
+def iter_sessions(lines: Iterable[str], meta: Optional[Dict[str, Any]] = None,
+                  interner: Optional[StringInterner] = None) -> Iterator[Dict[str, Any]]:
+    """세션 표 라인을 받아 세션 dict를 하나씩 내보낸다
+
+    Args:
+        lines: 세션 명령 출력 라인 반복자
+        meta: 전달하면 'headers' (헤더 목록 또는 None)와
+              'line_count' (마지막 빈 줄을 제외한 라인 수)를 채운다
+        interner: 전달하면 INTERNED_COLUMNS 값을 덤프 안에서 공유
+    """
+    return _iter_table(lines, meta, SessionTableParser.parse_row, interner)
+
+
+def iter_session_cells(lines: Iterable[str], meta: Optional[Dict[str, Any]] = None,
+                       interner: Optional[StringInterner] = None) -> Iterator[List[str]]:
+    """iter_sessions 와 같지만 dict 대신 헤더 폭에 맞춘 셀 목록을 내보낸다 (헤더는 meta['headers'])"""
+    return _iter_table(lines, meta, SessionTableParser.parse_cells, interner)
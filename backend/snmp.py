@@ -0,0 +1,480 @@
+"""SNMP 공용 엔진 모듈 (platform)
+
+pysnmp 7의 asyncio API(v3arch.asyncio)를 사용한다.
+SnmpEngine 하나를 전용 이벤트 루프 스레드에서 계속 유지하고, 장비별 전송 대상
+(UdpTransportTarget)과 OID 객체 목록을 캐시해 폴링마다 엔진을 새로 만들지 않는다.
+동기 코드(Flask 요청, 수집 스레드)는 ``run()`` 으로 코루틴을 이 루프에 넘겨 결과를 기다린다.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from datetime import datetime
+from collections import Counter
+from typing import Any, Coroutine, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .utils import logger
+
+try:
+    from pysnmp.hlapi.v3arch.asyncio import (  # type: ignore
+        SnmpEngine, CommunityData, ContextData, ObjectType, ObjectIdentity,
+        UdpTransportTarget, get_cmd, bulk_cmd, EndOfMibView,
+    )
+    from pyasn1.type import univ  # type: ignore
+    SNMP_AVAILABLE = True
+except ImportError:
+    SNMP_AVAILABLE = False
+    logger.warning("SNMP 라이브러리를 사용할 수 없습니다. SNMP 모니터링이 비활성화됩니다.")
+
+# (host, port, timeout, retries)
+TargetKey = Tuple[str, int, float, int]
+# (host, port, community)
+PollTarget = Tuple[str, int, str]
+
+
+# 0~100 범위를 벗어나면 잘못된 값으로 처리하는 메트릭
+PERCENT_METRICS = ('CPU', 'Memory')
+
+
+def _normalize_oid(oid: Any) -> str:
+    return str(oid).strip().lstrip('.')
+
+
+class MetricPlan:
+    """설정된 {메트릭: OID}를 한 번 컴파일한 수집 계획
+
+    - 같은 OID를 여러 메트릭이 쓰면 요청에는 한 번만 넣고(wire_oids), 응답 값을 모든 별칭에 나눠 준다
+    - 응답 OID는 정확히 일치하는 dict 조회로 찾고, 없으면 가장 긴 설정 OID 접두사로 찾는다
+      (OID 구성 요소 단위로 비교하므로 1.2.3.1 이 1.2.3.10 과 섞이지 않는다)
+    """
+
+    def __init__(self, snmp_oids: Dict[str, str]):
+        self.metrics: List[str] = list(snmp_oids.keys())
+        self.aliases: Dict[str, List[str]] = {}
+        for metric, oid in snmp_oids.items():
+            self.aliases.setdefault(_normalize_oid(oid), []).append(metric)
+        self.wire_oids: List[str] = list(self.aliases.keys())
+
+    def lookup(self, oid: Any) -> List[str]:
+        """응답 OID에 해당하는 메트릭 목록 (없으면 빈 목록)"""
+        oid_str = _normalize_oid(oid)
+        metrics = self.aliases.get(oid_str)
+        if metrics is not None:
+            return metrics
+        parts = oid_str.split('.')
+        for end in range(len(parts) - 1, 0, -1):
+            metrics = self.aliases.get('.'.join(parts[:end]))
+            if metrics is not None:
+                return metrics
+        return []
+
+    def parse(self, var_binds: Iterable[Any]) -> Dict[str, int]:
+        """varBinds를 {메트릭(소문자): 정수 값} 으로 변환. 응답이 없는 메트릭은 -1"""
+        result: Dict[str, int] = {}
+        for var_bind in var_binds:
+            try:
+                oid, value = var_bind
+                metrics = self.lookup(oid)
+                if not metrics:
+                    continue
+                try:
+                    int_value = int(value)
+                except (ValueError, TypeError):
+                    int_value = None
+                for metric in metrics:
+                    if int_value is None:
+                        result[metric.lower()] = -1
+                    elif metric in PERCENT_METRICS and not (0 <= int_value <= 100):
+                        logger.warning(f"잘못된 {metric} 값: {int_value}")
+                        result[metric.lower()] = -1
+                    else:
+                        result[metric.lower()] = int_value
+            except Exception as e:
+                logger.error(f"SNMP 응답 처리 중 에러: {e}")
+                continue
+
+        # 누락된 메트릭 처리
+        for metric in self.metrics:
+            result.setdefault(metric.lower(), -1)
+        return result
+
+
+# 자주 쓰는 SNMP 테이블 컬럼 정의 {테이블: {컬럼 이름: 컬럼 OID}}
+SNMP_TABLES: Dict[str, Dict[str, str]] = {
+    # HOST-RESOURCES-MIB hrSWRunTable
+    'processes': {
+        'name': '1.3.6.1.2.1.25.4.2.1.2',
+        'path': '1.3.6.1.2.1.25.4.2.1.4',
+        'parameters': '1.3.6.1.2.1.25.4.2.1.5',
+        'status': '1.3.6.1.2.1.25.4.2.1.7',
+    },
+    # IF-MIB ifTable
+    'interfaces': {
+        'descr': '1.3.6.1.2.1.2.2.1.2',
+        'oper_status': '1.3.6.1.2.1.2.2.1.8',
+        'in_octets': '1.3.6.1.2.1.2.2.1.10',
+        'out_octets': '1.3.6.1.2.1.2.2.1.16',
+    },
+}
+
+
+def _to_python(value: Any) -> Any:
+    """pysnmp 값을 JSON으로 직렬화 가능한 파이썬 값으로 변환"""
+    if isinstance(value, univ.Integer):
+        return int(value)
+    if isinstance(value, univ.OctetString):
+        return value.asOctets().decode('utf-8', errors='replace')
+    return value.prettyPrint()
+
+
+class SnmpTable:
+    """테이블 조회 결과 (컬럼 단위 저장)
+
+    indexes[i] 는 i번째 행의 인덱스(컬럼 OID 뒤의 접미사), columns[name][i] 는 그 행의 값.
+    행에 값이 없는 컬럼은 None.
+    """
+
+    def __init__(self, column_names: Iterable[str]):
+        self.indexes: List[str] = []
+        self.columns: Dict[str, List[Any]] = {name: [] for name in column_names}
+        self._positions: Dict[str, int] = {}
+
+    def set(self, column: str, index: str, value: Any) -> None:
+        position = self._positions.get(index)
+        if position is None:
+            position = len(self.indexes)
+            self._positions[index] = position
+            self.indexes.append(index)
+            for values in self.columns.values():
+                values.append(None)
+        self.columns[column][position] = value
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """행 단위 변환 [{'index': ..., 컬럼: 값, ...}]"""
+        names = list(self.columns.keys())
+        return [
+            dict(index=index, **{name: self.columns[name][i] for name in names})
+            for i, index in enumerate(self.indexes)
+        ]
+
+    def count_by(self, column: str) -> Dict[Any, int]:
+        """컬럼 값별 행 수 (예: 프로세스 이름별 개수), 많은 순"""
+        return dict(Counter(value for value in self.columns[column] if value is not None).most_common())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'rows': len(self.indexes), 'indexes': self.indexes, 'columns': self.columns}
+
+
+_plan_cache: Dict[Tuple[Tuple[str, str], ...], MetricPlan] = {}
+_plan_lock = threading.Lock()
+
+
+def compile_metric_plan(snmp_oids: Dict[str, str]) -> MetricPlan:
+    """설정 내용별로 한 번만 컴파일한 MetricPlan (설정이 바뀌면 새로 컴파일)"""
+    version = tuple((str(metric), str(oid)) for metric, oid in snmp_oids.items())
+    with _plan_lock:
+        plan = _plan_cache.get(version)
+        if plan is None:
+            # 이전 설정의 계획은 버린다 (설정 버전은 보통 하나만 활성)
+            _plan_cache.clear()
+            plan = MetricPlan(snmp_oids)
+            _plan_cache[version] = plan
+        return plan
+
+
+class SharedSnmpEngine:
+    """프로세스 전역 SNMP 엔진
+
+    - SnmpEngine과 이벤트 루프는 첫 요청 때 한 번만 만든다
+    - 전송 대상은 (host, port) 단위로 캐시 (주소 해석도 한 번만 수행)
+    - OID 문자열 목록에 대한 ObjectType 목록을 캐시
+    """
+
+    def __init__(self, timeout: float = 2.0, retries: int = 1,
+                 max_repetitions: int = 25, max_table_rows: int = 10000):
+        """
+        Args:
+            timeout: 요청별 응답 대기 시간 (초)
+            retries: 응답이 없을 때 재전송 횟수
+            max_repetitions: 테이블 조회 시 GETBULK 한 번에 받을 행 수
+            max_table_rows: 테이블 조회 시 컬럼별 최대 행 수 (무한 조회 방지)
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.max_repetitions = max_repetitions
+        self.max_table_rows = max_table_rows
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+        self._targets: Dict[TargetKey, Any] = {}
+        self._auth: Dict[str, Any] = {}
+        self._context = None
+        self._object_types: Dict[Tuple[str, ...], List[Any]] = {}
+        self._stats = {
+            'requests': 0,
+            'errors': 0,
+            'target_hits': 0,
+            'target_misses': 0,
+        }
+        self.last_sweep: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # 이벤트 루프 / 엔진
+    # ------------------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self._loop.is_running():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run_loop, name='snmp-loop', daemon=True)
+                thread.start()
+                started.wait()
+                self._loop = loop
+                self._thread = thread
+                # 루프가 바뀌면 이전 루프에 묶인 엔진/전송 대상은 다시 만든다
+                self._engine = None
+                self._targets.clear()
+            return self._loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """코루틴을 SNMP 루프에서 실행하고 결과를 기다린다 (동기 코드용)"""
+        if not SNMP_AVAILABLE:
+            coro.close()
+            raise RuntimeError("SNMP 라이브러리를 사용할 수 없습니다.")
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    @property
+    def engine(self):
+        """공유 SnmpEngine (SNMP 루프 안에서만 사용)"""
+        if self._engine is None:
+            self._engine = SnmpEngine()
+            logger.info("SNMP 엔진 생성")
+        return self._engine
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+    def _resolve_limits(self, timeout: Optional[float], retries: Optional[int]) -> Tuple[float, int]:
+        return (self.timeout if timeout is None else timeout,
+                self.retries if retries is None else retries)
+
+    async def get_target(self, host: str, port: int = 161,
+                         timeout: Optional[float] = None, retries: Optional[int] = None):
+        """캐시된 전송 대상 (SNMP 루프 안에서 사용)"""
+        timeout, retries = self._resolve_limits(timeout, retries)
+        key = (host, int(port or 161), timeout, retries)
+        target = self._targets.get(key)
+        if target is None:
+            target = await UdpTransportTarget.create(key[:2], timeout=timeout, retries=retries)
+            self._targets[key] = target
+            self._stats['target_misses'] += 1
+        else:
+            self._stats['target_hits'] += 1
+        return target
+
+    def get_auth(self, community: str):
+        """커뮤니티별 CommunityData (SNMPv2c)"""
+        auth = self._auth.get(community)
+        if auth is None:
+            auth = CommunityData(community, mpModel=1)
+            self._auth[community] = auth
+        return auth
+
+    def get_context(self):
+        if self._context is None:
+            self._context = ContextData()
+        return self._context
+
+    def object_types(self, oids: Iterable[str]) -> List[Any]:
+        """OID 문자열 목록에 대한 ObjectType 목록 (같은 목록이면 재사용)"""
+        key = tuple(str(oid) for oid in oids)
+        with self._lock:
+            cached = self._object_types.get(key)
+            if cached is None:
+                cached = [ObjectType(ObjectIdentity(oid)) for oid in key]
+                self._object_types[key] = cached
+            return cached
+
+    def invalidate_target(self, host: str, port: int = 161) -> None:
+        """장비 주소 변경/삭제 시 캐시된 전송 대상 제거"""
+        address = (host, int(port or 161))
+
+        def drop():
+            for key in [key for key in self._targets if key[:2] == address]:
+                del self._targets[key]
+
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(drop)
+        else:
+            drop()
+
+    # ------------------------------------------------------------------
+    # 요청
+    # ------------------------------------------------------------------
+    async def get_async(self, host: str, port: int, community: str, oids: Iterable[str],
+                        timeout: Optional[float] = None, retries: Optional[int] = None):
+        """SNMP GET (SNMP 루프 안에서 사용)
+
+        Returns:
+            (errorIndication, errorStatus, errorIndex, varBinds)
+        """
+        self._stats['requests'] += 1
+        target = await self.get_target(host, port, timeout, retries)
+        result = await get_cmd(self.engine, self.get_auth(community), target,
+                               self.get_context(), *self.object_types(oids))
+        if result[0] or result[1]:
+            self._stats['errors'] += 1
+        return result
+
+    def _wait_limit(self, timeout: Optional[float], retries: Optional[int]) -> float:
+        """응답 대기 시간과 재전송을 모두 포함한 장비별 최대 대기 시간 (초)"""
+        timeout, retries = self._resolve_limits(timeout, retries)
+        return timeout * (retries + 1) + 1
+
+    def get(self, host: str, port: int, community: str, oids: Iterable[str]):
+        """SNMP GET (동기 코드용)"""
+        return self.run(self.get_async(host, port, community, list(oids)),
+                        timeout=self._wait_limit(None, None) + 5)
+
+    async def get_many_async(self, targets: Dict[Hashable, PollTarget], oids: Iterable[str],
+                             timeout: Optional[float] = None,
+                             retries: Optional[int] = None) -> Dict[Hashable, Any]:
+        """여러 장비에 같은 OID GET을 동시에 보낸다 (SNMP 루프 안에서 사용)
+
+        Args:
+            targets: {key: (host, port, community)}
+
+        Returns:
+            {key: get_async 결과 튜플 또는 발생한 예외}
+        """
+        oids = list(oids)
+        limit = self._wait_limit(timeout, retries)
+
+        async def poll(host, port, community):
+            return await asyncio.wait_for(
+                self.get_async(host, port, community, oids, timeout, retries), limit
+            )
+
+        keys = list(targets.keys())
+        outcomes = await asyncio.gather(*(poll(*targets[key]) for key in keys), return_exceptions=True)
+        return dict(zip(keys, outcomes))
+
+    def get_many(self, targets: Dict[Hashable, PollTarget], oids: Iterable[str],
+                 timeout: Optional[float] = None, retries: Optional[int] = None) -> Dict[Hashable, Any]:
+        """전체 장비 동시 폴링 (동기 코드용). 한 번의 폴링은 장비별 최대 대기 시간 정도로 끝난다"""
+        if not targets:
+            return {}
+        start = time.perf_counter()
+        results = self.run(self.get_many_async(targets, list(oids), timeout, retries),
+                           timeout=self._wait_limit(timeout, retries) + 5)
+        elapsed = round(time.perf_counter() - start, 3)
+        answered = sum(1 for r in results.values() if isinstance(r, tuple) and not r[0] and not r[1])
+        self.last_sweep = {
+            'targets': len(targets),
+            'answered': answered,
+            'failed': len(targets) - answered,
+            'elapsed': elapsed,
+            'finished_at': datetime.now().isoformat()
+        }
+        logger.info(f"SNMP 일괄 폴링 완료: {answered}/{len(targets)} ({elapsed}s)")
+        return results
+
+    async def walk_table_async(self, host: str, port: int, community: str, columns: Dict[str, str],
+                               max_repetitions: Optional[int] = None) -> SnmpTable:
+        """GETBULK으로 테이블 컬럼들을 함께 조회 (SNMP 루프 안에서 사용)
+
+        요청마다 아직 끝나지 않은 컬럼들의 마지막 OID에서 이어서 max_repetitions 행씩 받는다.
+        응답 OID가 컬럼 범위를 벗어나거나 endOfMibView이면 그 컬럼은 끝난 것으로 본다.
+
+        Args:
+            columns: {컬럼 이름: 컬럼 OID}
+        """
+        repetitions = max(1, int(max_repetitions or self.max_repetitions))
+        prefixes = {name: _normalize_oid(oid) + '.' for name, oid in columns.items()}
+        cursors = {name: _normalize_oid(oid) for name, oid in columns.items()}
+        counts = {name: 0 for name in columns}
+        table = SnmpTable(columns.keys())
+        target = await self.get_target(host, port)
+        auth = self.get_auth(community)
+
+        while cursors:
+            names = list(cursors.keys())
+            self._stats['requests'] += 1
+            errorIndication, errorStatus, errorIndex, varBinds = await bulk_cmd(
+                self.engine, auth, target, self.get_context(), 0, repetitions,
+                *(ObjectType(ObjectIdentity(cursors[name])) for name in names)
+            )
+            if errorIndication or errorStatus:
+                self._stats['errors'] += 1
+                raise RuntimeError(f"SNMP 테이블 조회 실패 ({host}): {errorIndication or errorStatus.prettyPrint()}")
+            if not varBinds:
+                break
+
+            # 응답은 행 우선 순서: [행1 컬럼1, 행1 컬럼2, ..., 행2 컬럼1, ...]
+            finished = set()
+            for position, (oid, value) in enumerate(varBinds):
+                name = names[position % len(names)]
+                if name in finished:
+                    continue
+                oid_str = str(oid)
+                if isinstance(value, EndOfMibView) or not oid_str.startswith(prefixes[name]):
+                    finished.add(name)
+                    continue
+                table.set(name, oid_str[len(prefixes[name]):], _to_python(value))
+                cursors[name] = oid_str
+                counts[name] += 1
+                if counts[name] >= self.max_table_rows:
+                    logger.warning(f"SNMP 테이블 조회 최대 행 수 도달 ({host}, {name}): {self.max_table_rows}")
+                    finished.add(name)
+            for name in finished:
+                cursors.pop(name, None)
+        return table
+
+    def walk_table(self, host: str, port: int, community: str, columns: Dict[str, str],
+                   max_repetitions: Optional[int] = None, timeout: Optional[float] = 60) -> SnmpTable:
+        """GETBULK 테이블 조회 (동기 코드용)"""
+        return self.run(self.walk_table_async(host, port, community, columns, max_repetitions), timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['engine_started'] = self._engine is not None
+        stats['cached_targets'] = len(self._targets)
+        stats['cached_oid_lists'] = len(self._object_types)
+        stats['timeout'] = self.timeout
+        stats['retries'] = self.retries
+        stats['max_repetitions'] = self.max_repetitions
+        stats['last_sweep'] = self.last_sweep
+        return stats
+
+    def shutdown(self) -> None:
+        """루프 종료 (다음 요청 때 다시 시작)"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            engine, self._engine = self._engine, None
+            self._targets.clear()
+        if loop is not None and loop.is_running():
+            if engine is not None:
+                loop.call_soon_threadsafe(engine.close_dispatcher)
+            loop.call_soon_threadsafe(loop.stop)
+
+
+# 전역 SNMP 엔진 인스턴스
+snmp_engine = SharedSnmpEngine()
@@ -0,0 +1,244 @@
+"""SSH 연결 풀 모듈 (platform)
+
+(host, port, user) 단위로 인증된 paramiko 트랜스포트를 프로세스 전역에서 재사용한다.
+명령 실행은 기존 트랜스포트 위에 채널만 새로 열기 때문에 매 명령마다 발생하던
+SSH 핸드셰이크 비용이 사라진다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import paramiko
+
+from .utils import logger
+
+PoolKey = Tuple[str, int, str]
+
+
+class _PoolEntry:
+    """풀에 보관되는 연결 항목"""
+
+    __slots__ = ('client', 'password', 'created_at', 'last_used', 'leases')
+
+    def __init__(self, client: paramiko.SSHClient, password: Optional[str]):
+        now = time.monotonic()
+        self.client = client
+        self.password = password
+        self.created_at = now
+        self.last_used = now
+        self.leases = 0  # 연결을 사용 중인 호출 수 (0보다 크면 유휴 정리 대상에서 제외)
+
+
+class SSHConnectionPool:
+    """프로세스 전역 SSH 연결 풀
+
+    - 키: (host, port, username)
+    - 유휴 시간이 ``liveness_check_after`` 를 넘은 연결은 재사용 전에 생존 여부를 확인
+    - 유휴 시간이 ``idle_ttl`` 을 넘은 연결은 제거 (``sweep_interval`` 주기의 백그라운드 정리 스레드).
+      ``acquire`` 후 ``release`` 전인 연결(긴 덤프 스트리밍 등)은 사용 중이므로 제거하지 않는다
+    - 트랜스포트에는 ``keepalive_interval`` 주기의 keepalive 설정
+    """
+
+    def __init__(self, idle_ttl: int = 300, keepalive_interval: int = 30,
+                 liveness_check_after: int = 10, sweep_interval: int = 60):
+        """
+        Args:
+            idle_ttl: 유휴 연결 제거 기준 (초)
+            keepalive_interval: 트랜스포트 keepalive 전송 주기 (초)
+            liveness_check_after: 재사용 전 생존 확인을 수행할 유휴 시간 기준 (초)
+            sweep_interval: 유휴 연결 정리 주기 (초)
+        """
+        self.idle_ttl = idle_ttl
+        self.keepalive_interval = keepalive_interval
+        self.liveness_check_after = liveness_check_after
+        self.sweep_interval = sweep_interval
+        # 더 이상 조회하지 않는 장비의 연결도 닫히도록 첫 연결 시 정리 스레드를 시작
+        self._sweeper_stop: Optional[threading.Event] = None
+        self._entries: Dict[PoolKey, _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[PoolKey, threading.Lock] = {}
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'stale_closed': 0,
+            'invalidations': 0,
+        }
+
+    @staticmethod
+    def make_key(host: str, port: int, username: str) -> PoolKey:
+        return (host, int(port or 22), username or '')
+
+    def _key_lock(self, key: PoolKey) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._key_locks[key] = lock
+            return lock
+
+    def _is_alive(self, entry: _PoolEntry) -> bool:
+        """트랜스포트 생존 여부 확인 (유휴가 길었던 경우 ignore 패킷으로 확인)"""
+        transport = entry.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        if time.monotonic() - entry.last_used >= self.liveness_check_after:
+            try:
+                transport.send_ignore()
+            except Exception:
+                return False
+            return transport.is_active()
+        return True
+
+    def _ensure_sweeper(self) -> None:
+        with self._lock:
+            if self._sweeper_stop is not None:
+                return
+            self._sweeper_stop = threading.Event()
+            threading.Thread(target=self._sweep_loop, args=(self._sweeper_stop,),
+                             name='ssh-pool-sweeper', daemon=True).start()
+
+    def _sweep_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self.sweep_interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"SSH 풀 유휴 연결 정리 중 오류: {e}")
+
+    @staticmethod
+    def _close_client(client: paramiko.SSHClient) -> None:
+        try:
+            client.close()
+        except Exception as e:
+            logger.error(f"SSH 풀 연결 종료 중 오류: {e}")
+
+    def acquire(self, host: str, port: int, username: str, password: Optional[str],
+                connect: Callable[[], paramiko.SSHClient]) -> paramiko.SSHClient:
+        """풀에서 인증된 SSHClient를 가져온다. 없거나 끊어졌으면 ``connect()`` 로 새로 만든다.
+
+        반환된 클라이언트는 풀이 소유하므로 호출자가 close() 하지 않는다.
+        사용이 끝나면 ``release`` 를 호출한다 (``lease`` 컨텍스트 매니저 참고).
+        """
+        self.evict_idle()
+        self._ensure_sweeper()
+        key = self.make_key(host, port, username)
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                if entry.password == password and self._is_alive(entry):
+                    with self._lock:
+                        entry.last_used = time.monotonic()
+                        entry.leases += 1
+                        self._stats['hits'] += 1
+                    return entry.client
+                # 자격 증명 변경 또는 끊어진 연결은 교체
+                with self._lock:
+                    self._entries.pop(key, None)
+                    self._stats['stale_closed'] += 1
+                self._close_client(entry.client)
+
+            client = connect()
+            transport = client.get_transport()
+            if transport is not None and self.keepalive_interval:
+                transport.set_keepalive(self.keepalive_interval)
+            entry = _PoolEntry(client, password)
+            entry.leases = 1
+            with self._lock:
+                self._entries[key] = entry
+                self._stats['misses'] += 1
+            return client
+
+    def release(self, host: str, port: int, username: str, client: paramiko.SSHClient) -> None:
+        """``acquire`` 로 가져온 연결의 사용 종료 (유휴 시간은 이 시점부터 센다)
+
+        그사이 무효화/교체된 연결이면 아무것도 하지 않는다.
+        """
+        key = self.make_key(host, port, username)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.client is client and entry.leases > 0:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+
+    @contextmanager
+    def lease(self, host: str, port: int, username: str, password: Optional[str],
+              connect: Callable[[], paramiko.SSHClient]) -> Iterator[paramiko.SSHClient]:
+        """블록 안에서 연결을 사용 중으로 표시하는 ``acquire`` / ``release``"""
+        client = self.acquire(host, port, username, password, connect)
+        try:
+            yield client
+        finally:
+            self.release(host, port, username, client)
+
+    def invalidate(self, host: str, port: int, username: str, only_if_dead: bool = False) -> None:
+        """명령 실행 실패 등으로 신뢰할 수 없는 연결을 풀에서 제거
+
+        트랜스포트는 여러 스레드가 공유하므로, 채널 하나의 실패(예: MaxSessions 초과)로
+        살아 있는 연결을 닫지 않도록 ``only_if_dead=True`` 로 호출할 수 있다.
+        """
+        key = self.make_key(host, port, username)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and only_if_dead:
+                transport = entry.client.get_transport()
+                if transport is not None and transport.is_active():
+                    return
+            if entry is not None:
+                del self._entries[key]
+                self._stats['invalidations'] += 1
+        if entry is not None:
+            self._close_client(entry.client)
+
+    def evict_idle(self) -> int:
+        """유휴 TTL이 지난 연결 제거 (사용 중인 연결은 제외). 제거한 개수를 반환"""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.leases == 0 and now - entry.last_used >= self.idle_ttl:
+                    expired.append(self._entries.pop(key))
+            self._stats['evictions'] += len(expired)
+        for entry in expired:
+            self._close_client(entry.client)
+        return len(expired)
+
+    def close_all(self) -> None:
+        """풀의 모든 연결 종료 (정리 스레드도 중지)"""
+        with self._lock:
+            if self._sweeper_stop is not None:
+                self._sweeper_stop.set()
+                self._sweeper_stop = None
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close_client(entry.client)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 통계 (hit/miss/eviction 및 현재 연결 수)"""
+        with self._lock:
+            stats = dict(self._stats)
+            now = time.monotonic()
+            stats['active_connections'] = len(self._entries)
+            stats['connections'] = [
+                {
+                    'host': key[0],
+                    'port': key[1],
+                    'username': key[2],
+                    'age_seconds': round(now - entry.created_at, 1),
+                    'idle_seconds': round(now - entry.last_used, 1),
+                    'leases': entry.leases,
+                }
+                for key, entry in self._entries.items()
+            ]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['idle_ttl'] = self.idle_ttl
+        stats['keepalive_interval'] = self.keepalive_interval
+        return stats
+
+
+# 전역 SSH 연결 풀 인스턴스
+ssh_pool = SSHConnectionPool()
@@ -0,0 +1,87 @@
+"""SQLite 저장소 프로필 모듈 (platform)
+
+SQLite 연결이 새로 열릴 때마다 프로필의 PRAGMA 를 적용한다.
+기본 프로필(concurrent)은 WAL 저널을 써서 세션 적재 커밋과 UI 조회가 서로 기다리지 않게 한다.
+SQLite 가 아닌 엔진에는 아무것도 하지 않는다.
+
+설정 (app.config / 환경 변수):
+    STORAGE_PROFILE: 프로필 이름 (default, concurrent, durable; 기본 concurrent)
+"""
+
+from typing import Any, Dict
+
+import sqlalchemy as sa
+
+from .utils import logger
+
+# 프로필별 PRAGMA (적용 순서대로)
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # SQLite 기본값 그대로 (rollback 저널, 쓰기 중에는 읽기가 잠금을 기다린다)
+    'default': {},
+    # 수집 쓰기와 UI 조회 동시 접근용: 읽기는 WAL 스냅샷을 보므로 쓰기 커밋을 기다리지 않는다
+    'concurrent': {
+        'busy_timeout': 10000,       # 잠금 대기 (ms)
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',     # WAL 에서는 체크포인트 때만 fsync (장애 시 마지막 커밋만 잃을 수 있음)
+        'cache_size': -65536,        # 음수는 KiB 단위 (64 MiB)
+        'mmap_size': 268435456,      # 256 MiB
+        'temp_store': 'MEMORY',
+    },
+    # concurrent 와 같지만 커밋마다 fsync
+    'durable': {
+        'busy_timeout': 10000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+}
+
+DEFAULT_STORAGE_PROFILE = 'concurrent'
+
+
+def resolve_profile(name: str | None) -> Dict[str, Any]:
+    """프로필 이름의 PRAGMA 목록 (이름이 없으면 기본 프로필)"""
+    name = (name or DEFAULT_STORAGE_PROFILE).strip().lower()
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"알 수 없는 저장소 프로필: {name} (가능: {', '.join(STORAGE_PROFILES)})")
+    return STORAGE_PROFILES[name]
+
+
+def apply_pragmas(dbapi_connection, pragmas: Dict[str, Any]) -> None:
+    """DBAPI 연결 하나에 PRAGMA 적용"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_storage_profile(engine: sa.engine.Engine, name: str | None) -> Dict[str, Any]:
+    """SQLite 엔진이면 새 연결마다 프로필 PRAGMA 를 적용하도록 connect 이벤트를 등록
+
+    Returns:
+        적용할 PRAGMA (SQLite 가 아니거나 default 프로필이면 빈 dict)
+    """
+    pragmas = resolve_profile(name)
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return {}
+
+    def on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+    sa.event.listen(engine, 'connect', on_connect)
+    logger.info(f"저장소 프로필 적용: {name or DEFAULT_STORAGE_PROFILE} "
+                f"({', '.join(f'{key}={value}' for key, value in pragmas.items())})")
+    return dict(pragmas)
+
+
+def read_pragmas(engine: sa.engine.Engine) -> Dict[str, Any]:
+    """연결에 실제 적용된 PRAGMA 값 (SQLite 가 아니면 빈 dict)"""
+    if engine.dialect.name != 'sqlite':
+        return {}
+    names = STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE]
+    with engine.connect() as connection:
+        return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
@@ -0,0 +1,144 @@
+"""세션 표 파서 벤치마크
+
+기존 파서(라인마다 utils.split_line + 구분선 검사 + 헤더 순회로 dict 생성)와
+backend.session_parser 의 컬럼 계획 파서를 같은 입력으로 비교한다.
+엣지 케이스 비교는 tests/test_session_parser.py 에 있다.
+
+사용법:
+    python benchmarks/bench_session_parser.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from backend.utils import split_line  # noqa: E402
+from backend.session_parser import iter_sessions  # noqa: E402
+
+HEADERS = [
+    'Transaction', 'Creation Time', 'Protocol', 'Cust ID', 'User Name', 'Client IP',
+    'Client Side MWG IP', 'Server Side MWG IP', 'Server IP',
+    'CL Bytes Received', 'CL Bytes Sent', 'SRV Bytes Received', 'SRV Bytes Sent',
+    'Trxn Index', 'Age(seconds)', 'Status', 'In use', 'URL'
+]
+
+
+def legacy_parse(session_lines):
+    """기존 get_session_info 파싱 부분 (비교용 사본)"""
+    if not session_lines:
+        return None, []
+    if session_lines and session_lines[-1].strip() == '':
+        session_lines.pop()
+    if len(session_lines) < 2:
+        return None, []
+
+    def is_separator_line(line):
+        stripped = line.strip()
+        if not stripped:
+            return True
+        without_pipes = stripped.replace('|', '').replace('+', '').replace('=', '').replace('-', '').strip()
+        return without_pipes == ''
+
+    header_idx = None
+    header = []
+    for idx, ln in enumerate(session_lines):
+        if '|' not in ln:
+            continue
+        if is_separator_line(ln):
+            continue
+        cols = split_line(ln)
+        if {'Transaction', 'Creation Time', 'URL'}.issubset(set(cols)):
+            header_idx = idx
+            header = cols
+            break
+    if header_idx is None:
+        for idx, ln in enumerate(session_lines):
+            if '|' in ln:
+                header_idx = idx
+                header = split_line(ln)
+                break
+    if header_idx is None:
+        return None, []
+
+    sessions = []
+    for line in session_lines[header_idx + 1:]:
+        if '|' not in line:
+            continue
+        if is_separator_line(line):
+            continue
+        data = split_line(line)
+        if len(data) < len(header):
+            data = data + [''] * (len(header) - len(data))
+        elif len(data) > len(header):
+            data = data[:len(header) - 1] + [' | '.join(data[len(header) - 1:])]
+        session = {}
+        for i, column in enumerate(header):
+            col_name = column.strip()
+            session[col_name] = data[i] if i < len(data) else ''
+        sessions.append(session)
+    return header, sessions
+
+
+def new_parse(lines):
+    meta = {}
+    sessions = list(iter_sessions(lines, meta))
+    if meta['line_count'] < 2 or meta['headers'] is None:
+        return None, []
+    return meta['headers'], sessions
+
+
+def make_row(i, rng):
+    url = f"https://cdn{i % 97}.example.com/assets/{i}.js"
+    if i % 50 == 0:
+        url += "?a=1|b=2"  # 파이프가 섞인 URL -> 초과 컬럼 병합
+    cells = [
+        str(100000 + i), '2024-05-01 10:%02d:%02d' % (i // 60 % 60, i % 60),
+        rng.choice(['HTTP', 'HTTPS', 'FTP']), '', f'user{i % 3000}', f'10.{i % 200}.{i % 97}.{i % 251}:{30000 + i % 30000}',
+        '192.168.0.10', '192.168.0.11', f'203.0.{i % 256}.{i % 7}',
+        str(i * 3), str(i * 5), str(i * 7), str(i * 11), str(i % 1000), str(i % 3600),
+        rng.choice(['Active', 'Closed']), rng.choice(['Yes', 'No']), url,
+    ]
+    if i % 101 == 0:
+        cells = cells[:10]  # 짧은 행 -> 빈 값 패딩
+    return '| ' + ' | '.join(cells) + ' |\n'
+
+
+def build_dump(rows):
+    rng = random.Random(42)
+    separator = '+' + '+'.join('-' * (len(h) + 2) for h in HEADERS) + '+\n'
+    lines = ['MWG session list\n', separator, '| ' + ' | '.join(HEADERS) + ' |\n', separator]
+    lines.extend(make_row(i, rng) for i in range(rows))
+    lines.append(separator)
+    lines.append('\n')
+    return lines
+
+
+def timed(label, fn, lines, rows):
+    start = time.perf_counter()
+    result = fn(lines)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>8}: {elapsed:7.3f}s  ({rows / elapsed:,.0f} rows/s)")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lines = build_dump(args.rows)
+    print(f"입력: {args.rows:,} 행, {sum(len(line) for line in lines) / 1e6:.1f} MB")
+
+    legacy, legacy_elapsed = timed('legacy', lambda l: legacy_parse(list(l)), lines, args.rows)
+    new, new_elapsed = timed('new', new_parse, lines, args.rows)
+    if legacy != new:
+        raise SystemExit("결과 불일치: 기존 파서와 신규 파서의 출력이 다릅니다")
+    print(f"결과 일치, {legacy_elapsed / new_elapsed:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""SQLite 저장소 프로필 벤치마크
+
+세션 적재(session_records 에 executemany 배치 insert, 프록시 덤프 단위 커밋)가 도는 동안
+다른 연결에서 /sessions/datatables 와 같은 조회(건수 + created_at 역순 페이지)를 반복하며
+조회 지연을 잰다. backend.storage 의 프로필마다 새 DB 파일에서 같은 작업을 실행한다.
+
+사용법:
+    python benchmarks/bench_sqlite_profile.py [--rows 100000] [--profiles default,concurrent]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from models import db, SessionRecord  # noqa: E402
+from backend.storage import STORAGE_PROFILES, install_storage_profile, read_pragmas  # noqa: E402
+
+
+def make_rows(start, count, group_id):
+    base = datetime(2024, 5, 1)
+    return [
+        {
+            'group_id': group_id, 'proxy_id': 1 + i // 10000, 'client_ip': f'10.{i % 200}.{i % 97}.{i % 251}',
+            'server_ip': f'203.0.{i % 256}.{i % 7}', 'protocol': 'HTTPS', 'user': f'user{i % 3000}',
+            'category': 'Active', 'transaction': str(100000 + i), 'creation_time': base + timedelta(seconds=i),
+            'cl_bytes_received': i * 3, 'cl_bytes_sent': i * 5, 'srv_bytes_received': i * 7,
+            'srv_bytes_sent': i * 11, 'trxn_index': i % 1000, 'age_seconds': i % 3600, 'in_use': 'Yes',
+            'url': f'https://cdn{i % 97}.example.com/assets/{i}.js', 'url_host': f'cdn{i % 97}.example.com',
+            'created_at': base + timedelta(seconds=i),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def ingest(engine, rows, rows_per_commit, batch_size, group_id):
+    statement = SessionRecord.__table__.insert()
+    for start in range(0, rows, rows_per_commit):
+        count = min(rows_per_commit, rows - start)
+        with engine.begin() as connection:
+            for offset in range(0, count, batch_size):
+                connection.execute(statement, make_rows(start + offset, min(batch_size, count - offset), group_id))
+
+
+def read_loop(engine, group_id, stop, latencies, errors):
+    table = SessionRecord.__table__
+    count_query = sa.select(sa.func.count()).select_from(table).where(table.c.group_id == group_id)
+    page_query = (sa.select(table).where(table.c.group_id == group_id)
+                  .order_by(table.c.created_at.desc()).limit(10))
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(count_query).scalar()
+                connection.execute(page_query).all()
+        except sa.exc.OperationalError:
+            errors.append(time.perf_counter() - started)
+            continue
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.005)
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def run_profile(name, args):
+    directory = tempfile.mkdtemp(prefix='bench_sqlite_')
+    engine = sa.create_engine(f"sqlite:///{os.path.join(directory, 'ppat.db')}")
+    install_storage_profile(engine, name)
+    db.metadata.create_all(engine)
+    # 조회 대상이 비어 있지 않도록 미리 채워 둔다
+    ingest(engine, args.rows_per_commit, args.rows_per_commit, args.batch_size, group_id=1)
+
+    stop = threading.Event()
+    latencies, errors = [], []
+    reader = threading.Thread(target=read_loop, args=(engine, 1, stop, latencies, errors), daemon=True)
+    reader.start()
+    started = time.perf_counter()
+    ingest(engine, args.rows, args.rows_per_commit, args.batch_size, group_id=1)
+    ingest_elapsed = time.perf_counter() - started
+    stop.set()
+    reader.join()
+    pragmas = read_pragmas(engine)
+    engine.dispose()
+    shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"[{name}] journal_mode={pragmas.get('journal_mode')} synchronous={pragmas.get('synchronous')} "
+          f"busy_timeout={pragmas.get('busy_timeout')}")
+    print(f"  적재: {args.rows:,} 행 {ingest_elapsed:.2f}s ({args.rows / ingest_elapsed:,.0f} rows/s)")
+    if latencies:
+        ordered = sorted(latencies)
+        print(f"  조회: {len(latencies)}회, p50 {percentile(ordered, 0.5):.1f}ms, "
+              f"p95 {percentile(ordered, 0.95):.1f}ms, p99 {percentile(ordered, 0.99):.1f}ms, "
+              f"max {ordered[-1] * 1000:.1f}ms")
+    else:
+        print("  조회: 완료된 조회 없음")
+    if errors:
+        print(f"  조회 실패 (database is locked): {len(errors)}회")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--rows-per-commit', type=int, default=10_000, help='프록시 덤프 하나 분량 (커밋 단위)')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--profiles', default=','.join(STORAGE_PROFILES))
+    args = parser.parse_args()
+
+    for name in args.profiles.split(','):
+        run_profile(name.strip(), args)
+
+
+if __name__ == '__main__':
+    main()
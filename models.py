@@ -88,6 +88,8 @@ class MonitoringConfig(db.Model):
     
     # 세션 명령어
     session_cmd = db.Column(db.Text)
+    # 세션 덤프 전송 압축 (none / gzip)
+    session_compression = db.Column(db.String(16), default='none')
     
     # 임계값 설정
     cpu_threshold = db.Column(db.Integer, default=80)
@@ -109,6 +111,7 @@ class MonitoringConfig(db.Model):
             'description': self.description,
             'snmp_oids': self.snmp_oids,
             'session_cmd': self.session_cmd,
+            'session_compression': self.session_compression or 'none',
             'cpu_threshold': self.cpu_threshold,
             'memory_threshold': self.memory_threshold,
             'default_interval': self.default_interval,
@@ -120,6 +123,10 @@ class MonitoringConfig(db.Model):
 class SessionRecord(db.Model):
     """세션 임시 저장 레코드"""
     __tablename__ = 'session_records'
+    # 증분 동기화 키 (proxy_id, transaction, creation_time) 조회용
+    __table_args__ = (
+        db.Index('ix_session_records_sync_key', 'proxy_id', 'transaction', 'creation_time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     group_id = db.Column(db.Integer, db.ForeignKey('proxy_groups.id'), nullable=True)
@@ -179,4 +186,28 @@ class SessionRecord(db.Model):
             'url': self.url,
             'url_host': self.url_host,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+
+
+class SessionSnapshot(db.Model):
+    """세션 스냅샷 세대 목록 (행은 시간 버킷별 session_history_p* 테이블에 저장)"""
+    __tablename__ = 'session_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)  # 세대 번호
+    group_id = db.Column(db.Integer, db.ForeignKey('proxy_groups.id'), nullable=True, index=True)
+    proxy_id = db.Column(db.Integer, db.ForeignKey('proxy_servers.id'), nullable=True, index=True)
+    partition = db.Column(db.String(64), nullable=False, index=True)
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    row_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'group_id': self.group_id,
+            'proxy_id': self.proxy_id,
+            'partition': self.partition,
+            'bucket_start': self.bucket_start.isoformat() if self.bucket_start else None,
+            'row_count': self.row_count,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,157 @@
+"""장비별 회로 차단기 테스트 (모듈의 시계를 가짜 시계로 바꿔 상태 전이를 확인)"""
+
+import types
+
+import paramiko
+import pytest
+
+import backend.circuit_breaker as circuit_breaker_module
+from backend.circuit_breaker import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module, 'time', types.SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker('10.0.0.1', failure_threshold=3, base_interval=5, max_interval=12,
+                          multiplier=2, probe_timeout=30)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure('timeout')
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure('timeout')
+    breaker.record_failure('timeout')
+    breaker.record_success()
+    breaker.record_failure('timeout')
+    breaker.record_failure('timeout')
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure('timeout')
+    assert breaker.state == STATE_OPEN
+    assert breaker.snapshot()['last_failure'] == 'timeout'
+
+
+def test_open_rejects_with_remaining_interval(breaker, clock):
+    trip(breaker)
+    clock.advance(2)
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.check()
+    assert excinfo.value.retry_after == 3
+    assert not excinfo.value.probing
+    assert str(excinfo.value) == '10.0.0.1 회로 차단 중: 3초 후 재시도'
+    assert breaker.snapshot()['total_rejections'] == 1
+
+
+def test_half_open_allows_one_probe(breaker, clock):
+    trip(breaker)
+    clock.advance(5)
+    breaker.check()
+    assert breaker.state == STATE_HALF_OPEN
+
+    clock.advance(10)
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.check()
+    # 시험 요청이 진행 중일 때는 0초가 아니라 시험 요청 만료까지의 시간을 알린다
+    assert excinfo.value.probing
+    assert excinfo.value.retry_after == 20
+    assert '시험 연결 진행 중' in str(excinfo.value)
+    assert breaker.snapshot()['retry_after'] == 20
+
+
+def test_half_open_success_closes(breaker, clock):
+    trip(breaker)
+    clock.advance(5)
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.retry_after() == 0
+    trip(breaker)
+    assert breaker.retry_after() == 5
+
+
+def test_half_open_failure_reopens_with_backoff(breaker, clock):
+    trip(breaker)
+    intervals = []
+    for _ in range(3):
+        clock.advance(breaker.retry_after())
+        breaker.check()
+        breaker.record_failure('timeout')
+        assert breaker.state == STATE_OPEN
+        intervals.append(breaker.retry_after())
+    assert intervals == [10, 12, 12]
+
+
+def test_unreported_probe_expires(breaker, clock):
+    trip(breaker)
+    clock.advance(5)
+    breaker.check()
+    clock.advance(30)
+    breaker.check()
+    assert breaker.state == STATE_HALF_OPEN
+
+
+def test_registry_summary(clock):
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    registry.get('a').record_failure()
+    registry.get('b')
+    summary = registry.summary()
+    assert summary['counts'] == {STATE_CLOSED: 1, STATE_OPEN: 1, STATE_HALF_OPEN: 0}
+    assert [item['host'] for item in summary['tripped']] == ['a']
+    registry.reset('a')
+    assert registry.get('a').state == STATE_CLOSED
+
+
+@pytest.fixture
+def failing_ssh(monkeypatch):
+    attempts = []
+
+    def connect(self, *args, **kwargs):
+        attempts.append(args)
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(paramiko.SSHClient, 'connect', connect)
+    return attempts
+
+
+def test_monitor_records_one_failure_per_call(clock, failing_ssh, monkeypatch):
+    from backend.monitoring import ProxyMonitor
+    registry = CircuitBreakerRegistry(failure_threshold=3, base_interval=5)
+    monkeypatch.setattr('backend.monitoring.circuit_breakers', registry)
+    monitor = ProxyMonitor('192.0.2.10', username='u', password='pw')
+    monitor.retry_delay = 0
+
+    for call in range(3):
+        with pytest.raises(ConnectionError):
+            monitor._create_ssh_connection()
+        assert registry.get('192.0.2.10').consecutive_failures == call + 1
+    assert len(failing_ssh) == 3 * monitor.max_retries
+    assert registry.get('192.0.2.10').state == STATE_OPEN
+
+    # half_open 시험 요청은 재시도 없이 한 번만 연결을 시도한다
+    clock.advance(5)
+    failing_ssh.clear()
+    with pytest.raises(ConnectionError):
+        monitor._create_ssh_connection()
+    assert len(failing_ssh) == 1
+    assert registry.get('192.0.2.10').state == STATE_OPEN
@@ -0,0 +1,141 @@
+"""일괄 작업 병렬 실행 테스트
+
+작업은 Event 로 막아 두거나 예외를 던지는 가짜 함수로 흉내 낸다.
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.fanout import (
+    FanOutExecutor, STATUS_CANCELLED, STATUS_ERROR, STATUS_OK, STATUS_SKIPPED, STATUS_TIMEOUT, fan_out,
+)
+
+
+@pytest.fixture
+def gate():
+    """막아 둔 작업을 테스트가 끝나면 풀어 준다"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def blocking(gate, result=None):
+    def task():
+        gate.wait(10)
+        return result
+    return task
+
+
+def failing(message):
+    def task(*args):
+        raise RuntimeError(message)
+    return task
+
+
+def test_outcomes_per_status(gate):
+    outcomes = fan_out({
+        'ok': lambda: 42,
+        'error': failing('boom'),
+        'slow': blocking(gate),
+    }, host_timeout=0.3)
+    assert outcomes['ok'] == {'status': STATUS_OK, 'result': 42, 'error': None, 'elapsed': outcomes['ok']['elapsed']}
+    assert outcomes['error']['status'] == STATUS_ERROR
+    assert outcomes['error']['error'] == 'boom'
+    assert outcomes['slow']['status'] == STATUS_TIMEOUT
+    assert 0.3 <= outcomes['slow']['elapsed'] < 2
+
+
+def test_host_timeout_counts_from_task_start():
+    # 한 번에 하나씩 실행: 두 번째 작업의 제한 시간은 대기 시간이 아니라 시작 시점부터 센다
+    outcomes = fan_out({'first': lambda: time.sleep(0.3) or 'a', 'second': lambda: time.sleep(0.3) or 'b'},
+                       max_workers=1, host_timeout=0.5)
+    assert {key: o['status'] for key, o in outcomes.items()} == {'first': STATUS_OK, 'second': STATUS_OK}
+
+
+def test_outcomes_are_yielded_in_completion_order():
+    events = {key: threading.Event() for key in 'abc'}
+    executor = FanOutExecutor(max_workers=3)
+    try:
+        tasks = {key: (lambda key=key: events[key].wait(10) and key) for key in 'abc'}
+        iterator = executor.iter_completed(tasks)
+        order = []
+        for key in 'cab':
+            events[key].set()
+            done_key, outcome = next(iterator)
+            assert outcome['result'] == key
+            order.append(done_key)
+        assert order == ['c', 'a', 'b']
+        assert list(iterator) == []
+    finally:
+        for event in events.values():
+            event.set()
+        executor.shutdown()
+
+
+def test_deadline_marks_running_timeout_and_pending_skipped(gate):
+    ran = []
+    outcomes = fan_out({'running': blocking(gate), 'queued': lambda: ran.append(1)},
+                       max_workers=1, deadline=0.3)
+    assert outcomes['running']['status'] == STATUS_TIMEOUT
+    assert outcomes['queued']['status'] == STATUS_SKIPPED
+    assert outcomes['queued']['elapsed'] == 0.0
+    gate.set()
+    time.sleep(0.1)
+    assert ran == []
+
+
+def test_cancel_event_stops_running_and_queued(gate):
+    ran = []
+    cancel = threading.Event()
+    executor = FanOutExecutor(max_workers=1)
+    try:
+        timer = threading.Timer(0.2, cancel.set)
+        timer.start()
+        started = time.monotonic()
+        outcomes = executor.run({'running': blocking(gate), 'queued': lambda: ran.append(1)}, cancel_event=cancel)
+        assert time.monotonic() - started < 2
+        assert {o['status'] for o in outcomes.values()} == {STATUS_CANCELLED}
+        gate.set()
+        time.sleep(0.1)
+        assert ran == []
+    finally:
+        executor.shutdown()
+
+
+def test_stopping_iteration_cancels_unstarted_tasks(gate):
+    ran = []
+    executor = FanOutExecutor(max_workers=1)
+    try:
+        iterator = executor.iter_completed({'first': lambda: 1, 'second': blocking(gate),
+                                            'third': lambda: ran.append(1)})
+        assert next(iterator)[0] == 'first'
+        iterator.close()
+        gate.set()
+        time.sleep(0.1)
+        assert ran == []
+    finally:
+        executor.shutdown()
+
+
+def test_shared_executor_limits_concurrency():
+    lock = threading.Lock()
+    running = {'now': 0, 'max': 0}
+
+    def task():
+        with lock:
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+        time.sleep(0.05)
+        with lock:
+            running['now'] -= 1
+        return True
+
+    executor = FanOutExecutor(max_workers=2)
+    try:
+        outcomes = executor.run({i: task for i in range(6)})
+        assert all(o['status'] == STATUS_OK for o in outcomes.values())
+        assert running['max'] == 2
+    finally:
+        executor.shutdown()
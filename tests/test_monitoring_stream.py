@@ -0,0 +1,135 @@
+"""SSH 명령 출력 스트리밍 테스트
+
+풀 연결 대신 정해진 청크와 종료 상태를 돌려주는 가짜 채널을 사용한다.
+"""
+
+import gzip
+import subprocess
+import threading
+import zlib
+from contextlib import contextmanager
+
+import pytest
+
+from backend.monitoring import COMPRESSION_GZIP, ProxyMonitor, _gzip_remote_command
+
+
+class FakeChannel:
+    """stdout 청크를 차례로 돌려준 뒤 b'' 를 돌려주는 채널
+
+    exit_status 가 None 이면 종료 상태 없이 닫힌 채널 (트랜스포트 끊김)을 흉내 낸다.
+    """
+
+    def __init__(self, chunks, exit_status=0, stderr=b''):
+        self.chunks = list(chunks)
+        self.stderr = stderr
+        self.exit_status = -1 if exit_status is None else exit_status
+        self.status_event = threading.Event()
+        self.status_event.set()
+        self.command = None
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.command = command
+
+    def recv(self, size):
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        data, self.stderr = self.stderr, b''
+        return data
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        return self.channel
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """remote.channel 에 가짜 채널을 넣으면 ProxyMonitor 가 그 채널로 명령을 실행한다"""
+    state = type('Remote', (), {'channel': None})()
+
+    @contextmanager
+    def session(self):
+        yield FakeClient(state.channel)
+
+    monkeypatch.setattr(ProxyMonitor, '_ssh_session', session)
+    monkeypatch.setattr(ProxyMonitor, '_invalidate_ssh_client', lambda self: None)
+    return state
+
+
+@pytest.fixture
+def monitor():
+    return ProxyMonitor('192.0.2.1', username='u', password='pw')
+
+
+def test_clean_exit_yields_all_chunks(remote, monitor):
+    remote.channel = FakeChannel([b'a\nb', b'\nc\n'])
+    assert list(monitor._iter_ssh_command_lines('show sessions')) == ['a\n', 'b\n', 'c\n']
+    assert remote.channel.closed
+
+
+def test_missing_exit_status_raises_after_partial_output(remote, monitor):
+    remote.channel = FakeChannel([b'a\n', b'b\n'], exit_status=None)
+    received = []
+    with pytest.raises(ConnectionError, match='종료 상태'):
+        for line in monitor._iter_ssh_command_lines('show sessions'):
+            received.append(line)
+    assert received == ['a\n', 'b\n']
+
+
+def test_non_zero_exit_raises_with_stderr(remote, monitor):
+    remote.channel = FakeChannel([], exit_status=2, stderr=b'permission denied\n')
+    with pytest.raises(RuntimeError, match=r'종료 코드 2\): permission denied'):
+        list(monitor._iter_ssh_command_chunks('show sessions'))
+
+
+DUMP = b''.join(b'| %d | 2024-05-01 10:00:00 | 10.0.0.1:%d | http://a.example/%d |\n' % (i, i, i) for i in range(2000))
+
+
+def test_gzip_stream_is_decoded(remote, monitor):
+    data = gzip.compress(DUMP)
+    remote.channel = FakeChannel([data[i:i + 1000] for i in range(0, len(data), 1000)])
+    stats = {}
+    lines = list(monitor._iter_ssh_command_lines('show sessions', compression=COMPRESSION_GZIP, stats=stats))
+    assert ''.join(lines).encode() == DUMP
+    assert stats['compression'] == COMPRESSION_GZIP
+    assert 'gzip -c -1' in remote.channel.command
+
+
+def test_truncated_gzip_stream_raises(remote, monitor):
+    data = gzip.compress(DUMP)
+    # 종료 코드는 정상이지만 gzip 트레일러 전에 끊긴 출력
+    remote.channel = FakeChannel([data[:len(data) // 2]])
+    with pytest.raises(ConnectionError, match='gzip'):
+        list(monitor._iter_ssh_command_lines('show sessions', compression=COMPRESSION_GZIP))
+
+
+@pytest.mark.parametrize('command, status, output', [
+    ("printf 'a\\nb\\n'", 0, b'a\nb\n'),
+    ("printf 'a\\n'; exit 3", 3, b'a\n'),
+    ('echo denied >&2; false', 1, b''),
+])
+def test_gzip_wrapper_keeps_command_exit_status(command, status, output):
+    proc = subprocess.run(['sh', '-c', _gzip_remote_command(command)], capture_output=True, timeout=30)
+    assert proc.returncode == status
+    assert zlib.decompress(proc.stdout, 16 + zlib.MAX_WBITS) == output
@@ -0,0 +1,78 @@
+"""명령 번들 테스트
+
+build_script 결과를 로컬 sh 로 실행하고 parse 로 나눈 결과를 확인한다.
+"""
+
+import subprocess
+
+import pytest
+
+from backend.probe import ProbeBundle
+
+
+def run_bundle(bundle):
+    proc = subprocess.run(['sh', '-c', bundle.build_script()], capture_output=True, text=True, timeout=30)
+    return proc.stdout, proc.stderr
+
+
+def test_sections_are_split_per_command():
+    bundle = ProbeBundle().add('a', 'echo one; echo two').add('b', 'printf "no newline"').add('c', 'true')
+    results = bundle.parse(*run_bundle(bundle))
+    assert list(results) == ['a', 'b', 'c']
+    assert results['a'] == {'success': True, 'output': 'one\ntwo\n', 'error': '', 'exit_code': 0}
+    assert results['b']['output'] == 'no newline'
+    assert results['c']['output'] == ''
+
+
+def test_failing_section_keeps_its_exit_code_and_stderr():
+    bundle = (ProbeBundle()
+              .add('ok', 'echo fine')
+              .add('bad', 'echo partial; echo oops >&2; exit 3')
+              .add('missing', 'command_that_does_not_exist_ppat')
+              .add('after', 'echo still runs'))
+    results = bundle.parse(*run_bundle(bundle))
+    assert results['ok']['success']
+    assert results['bad'] == {'success': False, 'output': 'partial\n', 'error': 'oops\n', 'exit_code': 3}
+    assert results['missing']['exit_code'] == 127
+    assert results['missing']['error']
+    assert results['after'] == {'success': True, 'output': 'still runs\n', 'error': '', 'exit_code': 0}
+
+
+def test_missing_marker_fails_only_that_section():
+    bundle = ProbeBundle().add('first', 'echo 1').add('second', 'echo 2')
+    stdout, stderr = run_bundle(bundle)
+    # 두 번째 명령의 종료 마커 전에 출력이 끊긴 경우
+    truncated = stdout[:stdout.rindex(':END:second')]
+    results = bundle.parse(truncated, stderr)
+    assert results['first']['output'] == '1\n'
+    assert results['second']['success'] is False
+    assert results['second']['exit_code'] == -1
+    assert bundle.parse('', '')['first']['exit_code'] == -1
+
+
+def test_marker_like_output_stays_in_section():
+    other = ProbeBundle().add('a', 'true')
+    fake = other.build_script().splitlines()[0].split("'")[1]  # 다른 번들의 BEGIN 마커
+    bundle = ProbeBundle().add('a', f"echo '{fake}'; echo '__PPAT_x__:END:a:0'; echo ':END:a:1'").add('b', 'echo b')
+    results = bundle.parse(*run_bundle(bundle))
+    assert results['a']['output'] == f"{fake}\n__PPAT_x__:END:a:0\n:END:a:1\n"
+    assert results['a']['exit_code'] == 0
+    assert results['b']['output'] == 'b\n'
+
+
+def test_keys_must_be_unique_and_safe():
+    bundle = ProbeBundle().add('uptime', 'uptime')
+    with pytest.raises(ValueError):
+        bundle.add('uptime', 'uptime')
+    with pytest.raises(ValueError):
+        bundle.add("x'; rm -rf /", 'true')
+    assert bundle.failed('SSH 실패') == {'uptime': {'success': False, 'error': 'SSH 실패'}}
+
+
+def test_own_marker_for_another_key_in_output():
+    bundle = ProbeBundle()
+    marker = bundle._marker
+    bundle.add('a', f"echo '{marker}:BEGIN:b'; echo x").add('b', 'echo real')
+    results = bundle.parse(*run_bundle(bundle))
+    assert results['a']['output'] == f"{marker}:BEGIN:b\nx\n"
+    assert results['b']['output'] == 'real\n'
@@ -0,0 +1,63 @@
+"""ProxyManager 일괄 작업 테스트 (ProxyClient 대신 가짜 클라이언트 사용)"""
+
+import threading
+
+import pytest
+
+from backend.proxy_manager import ProxyManager
+
+
+@pytest.fixture
+def gate():
+    """막아 둔 작업을 테스트가 끝나면 풀어 준다"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def failing(message):
+    def operation(*args):
+        raise RuntimeError(message)
+    return operation
+
+
+class FakeClient:
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+
+    def execute_command(self, command):
+        return self.behaviour(command)
+
+
+@pytest.fixture
+def manager():
+    manager = ProxyManager(max_workers=4, host_timeout=5)
+    yield manager
+    manager._executor.shutdown()
+
+
+def test_iter_bulk_maps_failures(manager, gate):
+    manager.clients = {
+        1: FakeClient(lambda command: {'success': True, 'output': command}),
+        2: FakeClient(failing('SSH 실패')),
+        3: FakeClient(lambda command: gate.wait(10)),
+    }
+    results = manager.execute_command_on_all('uptime', timeout=0.3)
+    assert results[1] == {'success': True, 'output': 'uptime'}
+    assert results[2] == {'success': False, 'error': 'SSH 실패'}
+    assert results[3]['success'] is False
+    assert '제한 시간' in results[3]['error']
+
+
+def test_cancel_bulk_operations(manager, gate):
+    manager.clients = {1: FakeClient(lambda command: gate.wait(10)), 2: FakeClient(lambda command: gate.wait(10))}
+    cancelled = []
+    timer = threading.Timer(0.2, lambda: cancelled.append(manager.cancel_bulk_operations()))
+    timer.start()
+    results = manager.execute_command_on_all('uptime')
+    timer.join()
+    assert cancelled == [1]
+    assert results == {1: {'success': False, 'error': '작업이 취소되었습니다.'},
+                       2: {'success': False, 'error': '작업이 취소되었습니다.'}}
+    # 끝난 일괄 작업은 더 이상 취소 대상이 아니다
+    assert manager.cancel_bulk_operations() == 0
@@ -0,0 +1,107 @@
+"""세션 필터 테스트
+
+장비에서 실행하는 awk 필터(_filter_remote_command)를 로컬 sh 로 실행한 결과와
+수집기 쪽 필터(_session_matches)를 같은 덤프에 적용한 결과가 같은지 확인한다.
+"""
+
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from backend.monitoring import _filter_remote_command, _normalize_session_filters, _session_matches
+from backend.session_parser import iter_sessions
+
+pytestmark = pytest.mark.skipif(shutil.which('awk') is None, reason='awk 없음')
+
+HEADER = '| Transaction | Creation Time | Protocol | Client IP | User Name | URL |\n'
+
+DUMP = [
+    'Active sessions (Transaction | Creation Time | URL)\n',
+    '\n',
+    '+-------------+---------------------+----------+-----------------+------------+-----+\n',
+    HEADER,
+    '+=============+=====================+==========+=================+============+=====+\n',
+    '| 1 | 2024-05-01 10:00:00 | HTTP | 10.0.0.1:1000 | Alice | http://a.example/x |\n',
+    '| 2 | 2024-05-01 10:00:01 | HTTPS | 10.0.0.2:2000 | bob | http://b.example/q?a=1|b=2 |\n',
+    '| 3 | 2024-05-01 10:00:02 | HTTP | 10.0.0.12:3000 | BOB | HTTP://B.example/A | B |\n',
+    '|4|2024-05-01 10:00:03|HTTP|10.1.0.1:1|carol|http://c.example/a|b|\n',
+    '| 5 | 2024-05-01 10:00:04 | HTTP | 10.0.0.1:5 | alice smith | |\n',
+    '  | 6 | 2024-05-01 10:00:05 | FTP | 10.0.0.3:6 | Transaction |  ftp://files.example/  |  \r\n',
+    '| 7 | 2024-05-01 10:00:06 | HTTP | 10.0.0.4:7 |\n',
+    '| 8 | 2024-05-01 10:00:07 | HTTP | 10.0.0.5:8 | dave | http://d.example/?q=a||b | c |\n',
+    '+-------------+---------------------+----------+-----------------+------------+-----+\n',
+    'Total: 8\n',
+    '\n',
+]
+
+
+def remote_filter(lines, filters):
+    """장비 필터 명령을 sh 로 실행해 걸러진 라인을 돌려준다"""
+    command = _filter_remote_command('cat', filters)
+    assert command != 'cat'
+    proc = subprocess.run(['sh', '-c', command], input=''.join(lines).encode(), capture_output=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.decode().splitlines(True)
+
+
+def local_filter(lines, filters):
+    return [session for session in iter_sessions(lines) if _session_matches(session, filters)]
+
+
+@pytest.mark.parametrize('filters', [
+    {'user': 'bob'},
+    {'user': 'BOB'},
+    {'user': 'alice'},
+    {'user': 'transaction'},
+    {'client_ip': '10.0.0.1'},
+    {'client_ip': '10.0.0.1:1000'},
+    {'url': 'b.example'},
+    {'url': 'a=1|b=2'},
+    {'url': 'a=1 | b=2'},
+    {'url': '/a|b'},
+    {'url': 'a | b'},
+    {'url': '||'},
+    {'url': '|'},
+    {'url': 'ftp://files.example/'},
+    {'user': 'alice', 'url': 'a.example'},
+    {'client_ip': '10.0.0', 'user': 'b', 'url': 'example'},
+    {'user': 'nobody'},
+])
+def test_remote_filter_matches_local_filter(filters):
+    filters = _normalize_session_filters(filters)
+    remote = remote_filter(DUMP, filters)
+    # 장비가 거른 출력은 수집기 필터를 다시 적용하지 않아도 같은 결과여야 한다
+    assert list(iter_sessions(remote)) == local_filter(DUMP, filters)
+
+
+def test_remote_filter_keeps_preamble_header_and_separators():
+    remote = remote_filter(DUMP, _normalize_session_filters({'user': 'nobody'}))
+    # 헤더까지는 그대로, 이후에는 구분선/빈 줄만 남고 파이프 없는 요약 라인은 빠진다
+    assert remote == DUMP[:5] + [DUMP[-3], DUMP[-1]]
+
+
+def test_remote_filter_matches_local_filter_on_random_dumps():
+    rng = random.Random(9)
+    values = {
+        'client_ip': ['10.0.0.1:1', '10.0.0.11:2', '192.168.0.1', ''],
+        'user': ['alice', 'Bob', 'ALICE SMITH', 'bob|x', ''],
+        'url': ['http://a.example/x', 'http://a.example/a|b', 'HTTP://B.EXAMPLE/ | c', 'a||b', '|', ''],
+    }
+    for _ in range(30):
+        lines = [HEADER]
+        for i in range(20):
+            row = [str(i), '2024-05-01 10:00:00', 'HTTP', rng.choice(values['client_ip']),
+                   rng.choice(values['user']), rng.choice(values['url'])]
+            if rng.random() < 0.1:
+                row = row[:rng.randint(1, 5)]
+            separator = rng.choice([' | ', '|', '  |  '])
+            lines.append('|' + separator.join(row) + rng.choice([' |\n', '|\n', '\n']))
+        key = rng.choice(list(values))
+        source = rng.choice([v for v in values[key] if v])
+        start = rng.randint(0, len(source) - 1)
+        filters = _normalize_session_filters({key: source[start:start + rng.randint(1, 6)]})
+        if not filters:
+            continue
+        assert list(iter_sessions(remote_filter(lines, filters))) == local_filter(lines, filters), filters
@@ -0,0 +1,239 @@
+"""세션 적재 매핑 테스트
+
+컴파일한 SessionFieldMapping 의 결과를 행마다 pick/pick_fuzzy 로 찾던 기존 방식과 비교한다.
+"""
+
+import random
+import threading
+from datetime import datetime
+
+import pytest
+
+from backend.session_ingest import (
+    CONVERTERS, SESSION_FIELDS, SessionFieldMapping, TimestampDecoder, _parse_host, compile_field_mapping,
+    extract_host, host_cache_stats, pick, pick_fuzzy, to_dt,
+)
+from backend.session_parser import StringInterner
+
+STANDARD_HEADERS = [
+    'Transaction', 'Creation Time', 'Protocol', 'Cust ID', 'User Name', 'Client IP',
+    'Client Side MWG IP', 'Server Side MWG IP', 'Server IP',
+    'CL Bytes Received', 'CL Bytes Sent', 'SRV Bytes Received', 'SRV Bytes Sent',
+    'Trxn Index', 'Age(seconds)', 'Status', 'In use', 'URL',
+]
+
+
+def legacy_record(session, fuzzy=False, url_host=False):
+    """기존 행 단위 매핑 (행 dict에서 후보 이름을 매번 찾는다)"""
+    record = {}
+    for column, candidates, column_fuzzy, converter_name in SESSION_FIELDS:
+        value = pick_fuzzy(session, candidates) if fuzzy and column_fuzzy else pick(session, candidates)
+        convert = CONVERTERS.get(converter_name) if converter_name else None
+        record[column] = convert(value) if convert else value
+    if url_host:
+        record['url_host'] = extract_host(record['url'])
+    return record
+
+
+def make_cells(names, rng):
+    values = ['', '', '10.0.0.1:443', 'alice', '2024-05-01 10:00:00', '123', 'https://Example.com/a', 'Active']
+    return [rng.choice(values) for _ in names]
+
+
+@pytest.mark.parametrize('fuzzy', [False, True])
+@pytest.mark.parametrize('names', [
+    STANDARD_HEADERS,
+    # 같은 이름이 두 번 (dict 변환처럼 마지막 컬럼이 이긴다)
+    ['Transaction', 'URL', 'Creation Time', 'URL'],
+    # 대소문자만 다른 이름 (ambiguous: 행 단위 처리)
+    ['Transaction', 'User', 'user', 'Creation Time', 'URL'],
+    # 공백/대소문자 차이로 엄격 매칭되는 이름
+    ['transaction', 'CreationTime', 'client ip', 'URL'],
+    # 느슨한 매칭 대상 이름
+    ['Transaction', 'Client Address Port', 'Server_IP_Addr', 'Request URL Path', 'Proto Name', 'Age(seconds) Status'],
+    # 필수 컬럼 외에는 없는 표
+    ['Transaction', 'Creation Time', 'URL'],
+    # 아무 컬럼도 맞지 않는 표
+    ['foo', 'bar'],
+    [],
+])
+def test_mapping_matches_row_wise_pick(names, fuzzy):
+    rng = random.Random(1)
+    mapping = SessionFieldMapping(names, fuzzy=fuzzy, url_host=True)
+    for _ in range(200):
+        cells = make_cells(names, rng)
+        assert mapping.extract(cells) == legacy_record(dict(zip(names, cells)), fuzzy=fuzzy, url_host=True)
+
+
+def test_ambiguous_headers_use_row_wise_fallback():
+    assert SessionFieldMapping(['User', 'user', 'URL']).ambiguous
+    assert not SessionFieldMapping(STANDARD_HEADERS).ambiguous
+
+
+def test_first_non_empty_candidate_wins():
+    names = ['User Name', 'User', 'URL']
+    mapping = SessionFieldMapping(names)
+    assert mapping.extract(['', 'bob', ''])['user'] == 'bob'
+    assert mapping.extract(['alice', 'bob', ''])['user'] == 'alice'
+    assert mapping.extract(['', '', ''])['user'] == ''
+
+
+def test_missing_columns_become_converted_constants():
+    record = SessionFieldMapping(['Transaction', 'URL']).extract(['7', 'x'])
+    assert record['transaction'] == '7'
+    assert record['client_ip'] == ''
+    assert record['creation_time'] is None
+    assert record['cl_bytes_sent'] is None
+
+
+def test_random_headers_match_row_wise_pick():
+    rng = random.Random(7)
+    pool = STANDARD_HEADERS + ['user', 'url', 'Client', 'Server Address', 'Uri', 'In Use', 'Status Code', 'x']
+    for _ in range(300):
+        names = rng.sample(pool, rng.randint(0, 12))
+        if rng.random() < 0.2 and names:
+            names.append(rng.choice(names))
+        fuzzy = rng.random() < 0.5
+        mapping = SessionFieldMapping(names, fuzzy=fuzzy)
+        for _ in range(10):
+            cells = make_cells(names, rng)
+            assert mapping.extract(cells) == legacy_record(dict(zip(names, cells)), fuzzy=fuzzy)
+
+
+def test_records_add_fixed_values_and_share_strings():
+    names = ['Transaction', 'Creation Time', 'Client IP', 'URL']
+    rows = [['1', '2024-05-01 10:00:00', '10.0.0.1:1000', 'http://a.example/x'],
+            ['2', '2024-05-01 10:00:01', '10.0.0.1:2000', 'http://a.example/y']]
+    interner = StringInterner()
+    records = list(compile_field_mapping(names, url_host=True).records(rows, interner=interner, proxy_id=3))
+    assert [r['proxy_id'] for r in records] == [3, 3]
+    assert records == [dict(legacy_record(dict(zip(names, row)), url_host=True), proxy_id=3) for row in rows]
+    assert records[0]['client_ip'] is records[1]['client_ip']
+
+
+def test_compile_field_mapping_is_cached_per_header():
+    assert compile_field_mapping(STANDARD_HEADERS, fuzzy=True) is compile_field_mapping(list(STANDARD_HEADERS), fuzzy=True)
+    assert compile_field_mapping(STANDARD_HEADERS) is not compile_field_mapping(STANDARD_HEADERS, fuzzy=True)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-05-01 10:00:00', datetime(2024, 5, 1, 10, 0, 0)),
+    ('2024-05-01 10:00', datetime(2024, 5, 1, 10, 0)),
+    ('2024/05/01 10:00:00', datetime(2024, 5, 1, 10, 0, 0)),
+])
+def test_timestamp_decoder_detects_layout(value, expected):
+    decoder = TimestampDecoder()
+    assert decoder.decode(value) == expected
+    assert decoder.layout is not None
+    assert (decoder.fast, decoder.slow) == (1, 0)
+
+
+@pytest.mark.parametrize('value', [
+    # 배치는 맞지 않지만 strptime 은 읽는 값
+    '2024-5-1 10:00:00', '2024-05-01  10:00:00', '2024-05-01 9:05:07',
+    # 어떤 형식에도 맞지 않는 값
+    '2024-13-01 10:00:00', '2024-05-01T10:00:00', '01/05/2024 10:00', 'not a time', '２０２４-05-01 10:00:00',
+])
+def test_timestamp_decoder_falls_back_to_to_dt(value):
+    decoder = TimestampDecoder()
+    decoder.decode('2024-05-01 10:00:00')
+    assert decoder.decode(value) == to_dt(value)
+    assert decoder.slow == 1
+
+
+@pytest.mark.parametrize('value', ['', None])
+def test_timestamp_decoder_empty_values(value):
+    decoder = TimestampDecoder()
+    assert decoder.decode(value) is None
+    assert decoder.layout is None
+    assert decoder.decode('2024/05/01 10:00:00') == datetime(2024, 5, 1, 10, 0, 0)
+
+
+def test_timestamp_decoder_per_dump_layout():
+    # 덤프마다 새 디코더: 앞 덤프의 배치가 다음 덤프 해석에 영향을 주지 않는다
+    dumps = [['2024-05-01 10:00:00', '2024-05-01 10:00:01'],
+             ['2024/05/01 10:00:00', '2024/05/01 10:00:02'],
+             ['2024-05-01 10:00', '2024-05-01 10:01:00']]
+    layouts = []
+    for values in dumps:
+        decoder = TimestampDecoder()
+        assert [decoder.decode(v) for v in values] == [to_dt(v) for v in values]
+        layouts.append(decoder.layout)
+    assert len(set(map(str, layouts))) == 3
+
+    # 한 디코더 안에서 형식이 바뀌어도 결과는 같다 (배치가 다르면 to_dt 로 처리)
+    decoder = TimestampDecoder()
+    values = [v for dump in dumps for v in dump]
+    assert [decoder.decode(v) for v in values] == [to_dt(v) for v in values]
+
+
+def test_timestamp_decoder_matches_to_dt_and_caches():
+    rng = random.Random(3)
+    values = [f'{rng.choice(["2024", "1999"])}{sep}{rng.randint(1, 13):02d}{sep}{rng.randint(1, 31):02d} '
+              f'{rng.randint(0, 24):02d}:{rng.randint(0, 60):02d}:{rng.randint(0, 60):02d}'
+              for sep in '-/' for _ in range(300)]
+    for decoder in (TimestampDecoder(), TimestampDecoder(max_cache=64)):
+        for value in values + values:
+            assert decoder.decode(value) == to_dt(value)
+        assert len(decoder._cache) <= decoder.max_cache
+
+
+def test_timestamp_decoder_remembers_repeated_values():
+    decoder = TimestampDecoder()
+    for _ in range(3):
+        decoder.decode('2024-05-01 10:00:00')
+    assert (decoder.fast, decoder.hits) == (1, 2)
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('http://example.com/a', 'example.com'),
+    ('https://Example.COM/a?b=c', 'example.com'),
+    ('HTTP://WWW.EXAMPLE.COM', 'www.example.com'),
+    # 포트
+    ('http://example.com:8080/a', 'example.com'),
+    ('https://example.com:443', 'example.com'),
+    ('http://10.0.0.1:3128/x', '10.0.0.1'),
+    # userinfo
+    ('http://user:pw@example.com/a', 'example.com'),
+    ('ftp://user@Files.Example.com:21/pub', 'files.example.com'),
+    ('http://a@b@example.com/', 'example.com'),
+    # IPv6
+    ('http://[::1]:8080/a', '::1'),
+    ('https://[2001:DB8::1]/', '2001:db8::1'),
+    ('[::1]:443', '::1'),
+    # scheme 없는 값 (CONNECT 대상, 호스트만 있는 값)
+    ('example.com:443', 'example.com'),
+    ('Example.com', 'example.com'),
+    ('example.com/path?q=1', 'example.com'),
+    ('10.0.0.1', '10.0.0.1'),
+    ('', ''),
+    ('/relative/path', ''),
+])
+def test_extract_host(url, expected):
+    assert extract_host(url) == expected
+    assert _parse_host(url) == expected
+
+
+def test_extract_host_matches_urlparse_for_odd_values():
+    rng = random.Random(5)
+    parts = ['http://', 'HTTPS://', 'user:pw@', 'a@', 'Example.com', 'host', '[::1]', '[fe80::1%25eth0]',
+             ':8080', ':', ':abc', '/', '/p?q', '?x', '#f', '\t', ' ', '@', '[', ']', '://']
+    for _ in range(3000):
+        url = ''.join(rng.choice(parts) for _ in range(rng.randint(1, 6)))
+        assert extract_host(url) == _parse_host(url), url
+
+
+def test_host_counts_are_thread_safe():
+    before = host_cache_stats()
+
+    def worker():
+        for i in range(2000):
+            extract_host(f'http://h{i % 50}.example.com/{i}')
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    after = host_cache_stats()
+    assert after['fast'] + after['slow'] - before['fast'] - before['slow'] == 8 * 2000
@@ -0,0 +1,305 @@
+"""세션 표 파서 테스트
+
+backend.session_parser 의 결과를 기존 get_session_info 파서(라인마다 utils.split_line +
+구분선 검사 + 헤더 순회로 dict 생성)와 같은 입력으로 비교한다.
+"""
+
+import random
+import sys
+import types
+
+import pytest
+
+from backend.monitoring import ProxyMonitor
+from backend.session_parser import (
+    DICTIONARY_COLUMNS, INTERNED_COLUMNS, DictionaryColumn, SessionColumns, SessionTableParser, StringInterner,
+    iter_session_cells, iter_sessions,
+)
+from backend.utils import split_line
+
+HEADERS = [
+    'Transaction', 'Creation Time', 'Protocol', 'Cust ID', 'User Name', 'Client IP',
+    'Client Side MWG IP', 'Server Side MWG IP', 'Server IP',
+    'CL Bytes Received', 'CL Bytes Sent', 'SRV Bytes Received', 'SRV Bytes Sent',
+    'Trxn Index', 'Age(seconds)', 'Status', 'In use', 'URL'
+]
+
+
+def legacy_parse(session_lines):
+    """기존 get_session_info 파싱 부분 (비교용 사본)"""
+    if not session_lines:
+        return None, []
+    if session_lines and session_lines[-1].strip() == '':
+        session_lines.pop()
+    if len(session_lines) < 2:
+        return None, []
+
+    def is_separator_line(line):
+        stripped = line.strip()
+        if not stripped:
+            return True
+        without_pipes = stripped.replace('|', '').replace('+', '').replace('=', '').replace('-', '').strip()
+        return without_pipes == ''
+
+    header_idx = None
+    header = []
+    for idx, ln in enumerate(session_lines):
+        if '|' not in ln:
+            continue
+        if is_separator_line(ln):
+            continue
+        cols = split_line(ln)
+        if {'Transaction', 'Creation Time', 'URL'}.issubset(set(cols)):
+            header_idx = idx
+            header = cols
+            break
+    if header_idx is None:
+        for idx, ln in enumerate(session_lines):
+            if '|' in ln:
+                header_idx = idx
+                header = split_line(ln)
+                break
+    if header_idx is None:
+        return None, []
+
+    sessions = []
+    for line in session_lines[header_idx + 1:]:
+        if '|' not in line:
+            continue
+        if is_separator_line(line):
+            continue
+        data = split_line(line)
+        if len(data) < len(header):
+            data = data + [''] * (len(header) - len(data))
+        elif len(data) > len(header):
+            data = data[:len(header) - 1] + [' | '.join(data[len(header) - 1:])]
+        session = {}
+        for i, column in enumerate(header):
+            col_name = column.strip()
+            session[col_name] = data[i] if i < len(data) else ''
+        sessions.append(session)
+    return header, sessions
+
+
+def new_parse(lines):
+    meta = {}
+    sessions = list(iter_sessions(iter(lines), meta))
+    if meta['line_count'] < 2 or meta['headers'] is None:
+        return None, []
+    return meta['headers'], sessions
+
+
+def make_row(i, rng):
+    url = f"https://cdn{i % 97}.example.com/assets/{i}.js"
+    if i % 50 == 0:
+        url += "?a=1|b=2"  # 파이프가 섞인 URL -> 초과 컬럼 병합
+    cells = [
+        str(100000 + i), '2024-05-01 10:%02d:%02d' % (i // 60 % 60, i % 60),
+        rng.choice(['HTTP', 'HTTPS', 'FTP']), '', f'user{i % 3000}', f'10.{i % 200}.{i % 97}.{i % 251}:{30000 + i}',
+        '192.168.0.10', '192.168.0.11', f'203.0.{i % 256}.{i % 7}',
+        str(i * 3), str(i * 5), str(i * 7), str(i * 11), str(i % 1000), str(i % 3600),
+        rng.choice(['Active', 'Closed']), rng.choice(['Yes', 'No']), url,
+    ]
+    if i % 101 == 0:
+        cells = cells[:10]  # 짧은 행 -> 빈 값 패딩
+    return '| ' + ' | '.join(cells) + ' |\n'
+
+
+def build_dump(rows):
+    rng = random.Random(42)
+    separator = '+' + '+'.join('-' * (len(h) + 2) for h in HEADERS) + '+\n'
+    lines = ['MWG session list\n', separator, '| ' + ' | '.join(HEADERS) + ' |\n', separator]
+    lines.extend(make_row(i, rng) for i in range(rows))
+    lines.append(separator)
+    lines.append('\n')
+    return lines
+
+
+EDGE_CASES = [
+    [],
+    ['\n'],
+    ['| Transaction | Creation Time | URL |\n'],
+    ['| Transaction | Creation Time | URL |\n', '| 1 | t | http://a|b |\n'],
+    ['Transaction|Creation Time|URL\n', '1|t|u\n', '2|t\n', '3|t|u|v|w\n'],
+    ['|a|b|\n', '|----|\n', '| 1 | 2 | 3 |\n', 'no pipe\n', '|x|\n'],
+    ['|----|\n', '| 1 | 2 |\n'],
+    ['| Transaction | Creation Time | URL |\n', '|  |  |  |\n', '| 1 |　| u |\n', '|　-　|\n'],
+    ['| Transaction | Creation Time | URL |', '| 1 | t | u |'],
+    # 헤더 앞의 요약 라인과 구분선, 헤더 뒤의 파이프 없는 라인
+    ['Session list (Transaction | Creation Time | URL)\n', '+---+\n', '| Transaction | Creation Time | URL |\n',
+     '+===+\n', '| 1 | t | u |\n', 'Total: 1\n', '\n'],
+    # 기대 헤더가 없으면 최초의 파이프 라인이 헤더
+    ['junk\n', '| id | name |\n', 'skip\n', '| 1 | a | extra |\n', '| 2 |\n'],
+    # 중복 컬럼 이름 (dict 변환처럼 마지막 값)
+    ['| Transaction | URL | Creation Time | URL |\n', '| 1 | a | t | b |\n', '| 2 | c | t | d | e |\n'],
+    ['\r\n', '| Transaction | Creation Time | URL |\r\n', '| 1 | t | u |\r\n', '\r\n'],
+]
+
+
+@pytest.mark.parametrize('case', EDGE_CASES)
+def test_edge_cases_match_legacy_parser(case):
+    assert new_parse(list(case)) == legacy_parse(list(case))
+
+
+def test_dump_matches_legacy_parser():
+    lines = build_dump(3000)
+    assert new_parse(lines) == legacy_parse(list(lines))
+
+
+def test_random_tables_match_legacy_parser():
+    rng = random.Random(1)
+    pieces = ['| Transaction | Creation Time | Protocol | Client IP | URL |\n', '|a|b|\n', '|--+--|\n', '\n', '  \n',
+              '| 1 | 2 | 3 | 4 | 5 | 6 |\n', '| 1 | t | x | 9.9.9.9 | a|b |\n', 'zz\n', '|1|2|', '+===+\n',
+              '|　|\n', '| Transaction | Creation Time | URL |\n']
+    for _ in range(3000):
+        case = [rng.choice(pieces) for _ in range(rng.randint(0, 7))]
+        assert new_parse(list(case)) == legacy_parse(list(case)), case
+
+
+def test_cells_match_session_dicts():
+    lines = build_dump(500)
+    meta = {}
+    cells = list(iter_session_cells(iter(lines), meta))
+    names = [name.strip() for name in meta['headers']]
+    assert [dict(zip(names, row)) for row in cells] == list(iter_sessions(iter(lines)))
+
+
+def load_columns(lines, **kwargs):
+    meta = {}
+    columns = None
+    for cells in iter_session_cells(iter(lines), meta):
+        if columns is None:
+            columns = SessionColumns(meta['headers'], **kwargs)
+        columns.append(cells)
+    return columns
+
+
+def test_dictionary_column_round_trip():
+    column = DictionaryColumn()
+    values = ['HTTP', 'HTTPS', 'HTTP', '', 'HTTP', '']
+    for value in values:
+        column.append(value)
+    assert list(column) == values
+    assert [column[i] for i in range(len(values))] == values
+    assert column[-1] == ''
+    assert column.values == ['HTTP', 'HTTPS', '']
+    assert list(column.codes) == [0, 1, 0, 2, 0, 2]
+
+
+@pytest.mark.parametrize('dictionary_columns', [DICTIONARY_COLUMNS, (), HEADERS])
+def test_session_columns_round_trip_to_row_dicts(dictionary_columns):
+    lines = build_dump(1000)
+    expected = list(iter_sessions(iter(lines)))
+    columns = load_columns(lines, dictionary_columns=dictionary_columns)
+
+    assert len(columns) == len(expected)
+    assert columns.to_rows() == expected
+    assert list(columns) == expected
+    assert [columns[i] for i in range(len(columns))] == expected
+    assert columns[-1] == expected[-1]
+    assert [dict(zip(columns.names, row)) for row in columns.iter_cells()] == expected
+    assert columns.to_columns() == {name: [row[name] for row in expected] for name in expected[0]}
+    assert columns.column('URL')[50].endswith('?a=1 | b=2')
+    assert columns.column('URL')[101] == ''
+
+
+def test_session_columns_duplicate_header_uses_last_column():
+    lines = ['| Transaction | URL | Creation Time | URL |\n', '| 1 | a | t | b |\n', '| 2 | c | t | d | e |\n']
+    columns = load_columns(lines)
+    expected = list(iter_sessions(iter(lines)))
+    assert columns.to_rows() == expected == [
+        {'Transaction': '1', 'URL': 'b', 'Creation Time': 't'},
+        {'Transaction': '2', 'URL': 'd | e', 'Creation Time': 't'},
+    ]
+    assert columns.column('URL') == ['b', 'd | e']
+    assert columns.position('URL') == 3
+    assert columns.position('Client IP') is None
+
+
+def test_session_columns_index_bounds():
+    columns = load_columns(build_dump(3))
+    assert columns[-3] == columns[0]
+    for index in (3, -4):
+        with pytest.raises(IndexError):
+            columns[index]
+
+
+def test_empty_session_columns():
+    columns = SessionColumns([])
+    assert len(columns) == 0
+    assert columns.to_rows() == []
+    assert columns.to_columns() == {}
+    with pytest.raises(IndexError):
+        columns[0]
+    # 헤더 없는 행도 개수는 센다 (값은 빈 dict)
+    columns.append([])
+    assert list(columns.iter_cells()) == [()]
+    assert columns.to_rows() == [{}]
+
+
+def test_columnar_session_info_matches_rows(monkeypatch):
+    lines = build_dump(300)
+    config = types.SimpleNamespace(session_cmd='show sessions', session_compression=None)
+
+    def iter_lines(self, command, chunk_size=None, compression=None, stats=None):
+        size = sum(len(line) for line in lines)
+        stats.update({'compression': 'none', 'wire_bytes': size, 'decoded_bytes': size, 'elapsed': 0.0})
+        return iter(lines)
+
+    monkeypatch.setattr(ProxyMonitor, 'get_monitoring_config', lambda self: config)
+    monkeypatch.setattr(ProxyMonitor, '_iter_ssh_command_lines', iter_lines)
+    monitor = ProxyMonitor('192.0.2.1', username='u', password='pw')
+    for filters in (None, {'user': 'user1'}, {'url': 'a=1|b'}):
+        rows = monitor.get_session_info(filters=filters)
+        columnar = monitor.get_session_info(filters=filters, columnar=True)
+        assert columnar['sessions'].to_rows() == rows['sessions']
+        assert 'error' not in rows and rows['sessions']
+        assert (columnar['total_sessions'], columnar['unique_clients']) == \
+            (rows['total_sessions'], rows['unique_clients'])
+
+
+def fresh(value):
+    """같은 값의 새 문자열 객체 (리터럴 공유를 피한다)"""
+    return ''.join(list(value))
+
+
+def test_string_interner_shares_equal_values():
+    interner = StringInterner()
+    first = fresh('HTTPS')
+    second = fresh('HTTPS')
+    assert first is not second
+    assert interner.intern(first) is first
+    assert interner.intern(second) is first
+    assert interner.intern(first) is first
+    assert interner.intern(fresh('HTTP')) == 'HTTP'
+    assert len(interner) == 2
+    # 같은 객체가 다시 들어오면 버려지는 객체가 없으므로 절약으로 세지 않는다
+    assert interner.stats() == {'distinct': 2, 'hits': 1, 'bytes_saved': sys.getsizeof(second)}
+
+
+def test_parser_interns_only_low_cardinality_columns():
+    interner = StringInterner()
+    parser = SessionTableParser(HEADERS, interner)
+    rows = [parser.parse_row(fresh(line)) for line in build_dump(200)[4:-2]]
+    interned = [name for name in HEADERS if name in INTERNED_COLUMNS]
+    for name in interned:
+        values = {}
+        for row in rows:
+            assert values.setdefault(row[name], row[name]) is row[name]
+    assert len(interner) == len({row[name] for row in rows for name in interned})
+    # 빈 문자열처럼 이미 공유되는 객체는 중복으로 세지 않는다
+    assert 0 < interner.hits <= len(rows) * len(interned) - len(interner)
+    assert interner.bytes_saved > 0
+    assert SessionTableParser(HEADERS).parse_row(build_dump(1)[4]) == rows[0]
+
+
+def test_interned_parse_matches_plain_parse():
+    lines = build_dump(1000)
+    interner = StringInterner()
+    meta, plain_meta = {}, {}
+    assert list(iter_sessions(iter(lines), meta, interner)) == list(iter_sessions(iter(lines), plain_meta))
+    assert meta == plain_meta
+    assert list(iter_session_cells(iter(lines), None, StringInterner())) == list(iter_session_cells(iter(lines)))
+    # 폴백 헤더 경로도 같은 결과
+    case = ['junk\n', '| Protocol | Status |\n', '| HTTP | Active |\n', '| HTTP | Active | x |\n']
+    assert list(iter_sessions(iter(case), None, StringInterner())) == list(iter_sessions(iter(case)))
@@ -0,0 +1,219 @@
+"""세션 증분 동기화 테스트
+
+SSH 출력은 ProxyMonitor._iter_ssh_command_lines 를 대체하거나(FakeDevice)
+가짜 채널로 실제 스트리밍 경로를 태워 흉내 낸다.
+조회에 실패했거나 출력이 온전하지 않은 프록시의 저장 레코드가 지워지지 않는지 확인한다.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from backend.monitoring import ProxyMonitor
+from test_monitoring_stream import FakeChannel, FakeClient
+
+DUMP = [
+    '| Transaction | Creation Time | Client IP | User Name | URL |\n',
+    '+----+----+----+----+----+\n',
+    '| 1 | 2024-05-01 10:00:00 | 10.0.0.1:1000 | alice | http://a.example/x |\n',
+    '| 2 | 2024-05-01 10:00:01 | 10.0.0.2:2000 | bob | http://b.example/y |\n',
+]
+
+
+class FakeDevice:
+    """세션 명령 출력 흉내 (error가 있으면 lines를 내보낸 뒤 SSH 실패)"""
+
+    def __init__(self):
+        self.lines = list(DUMP)
+        self.error = None
+
+    def iter_lines(self, command, chunk_size=None, compression=None, stats=None):
+        if self.error is not None:
+            yield from self.lines
+            raise self.error
+        if stats is not None:
+            size = sum(len(line) for line in self.lines)
+            stats.update({'compression': 'none', 'wire_bytes': size, 'decoded_bytes': size, 'elapsed': 0.0})
+        yield from self.lines
+
+
+@pytest.fixture
+def device(monkeypatch):
+    fake = FakeDevice()
+    monkeypatch.setattr(ProxyMonitor, '_iter_ssh_command_lines', fake.iter_lines)
+    return fake
+
+
+@pytest.fixture
+def proxy(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'ppat.db'}")
+    from app import create_app
+    from models import db, MonitoringConfig, ProxyGroup, ProxyServer
+    app = create_app()
+    with app.app_context():
+        MonitoringConfig.query.filter_by(is_active=True).first().session_cmd = 'show sessions'
+        group = ProxyGroup.query.first()
+        server = ProxyServer(name='p1', host='192.0.2.1', username='u', password='pw',
+                             group_id=group.id, is_active=True)
+        db.session.add(server)
+        db.session.commit()
+        yield server
+
+
+def stored_transactions(proxy_id):
+    from models import SessionRecord
+    return sorted(r.transaction for r in SessionRecord.query.filter_by(proxy_id=proxy_id))
+
+
+def test_failed_fetch_keeps_group_records(proxy, device):
+    from backend import monitoring_service
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['inserted'] == 2
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+    device.lines = []
+    device.error = ConnectionError('SSH 연결 실패')
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 1
+    assert stats['deleted'] == 0
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+    device.lines = list(DUMP)
+    device.error = None
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert (stats['inserted'], stats['deleted'], stats['unchanged']) == (0, 0, 2)
+
+
+def test_failed_fetch_keeps_proxy_records(proxy, device):
+    from backend import monitoring_service
+    monitoring_service.collect_sessions_by_proxy(proxy.id)
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+    device.lines = []
+    device.error = ConnectionError('SSH 연결 실패')
+    stats = monitoring_service.collect_sessions_by_proxy(proxy.id)
+    assert stats['failed'] == 1
+    assert stats['deleted'] == 0
+    assert 'SSH 연결 실패' in stats['error']
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+
+def test_successful_empty_dump_still_removes_records(proxy, device):
+    from backend import monitoring_service
+    monitoring_service.collect_sessions_by_group(proxy.group_id)
+    device.lines = DUMP[:2]
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 0
+    assert stats['deleted'] == 2
+    assert stored_transactions(proxy.id) == []
+
+
+def test_truncated_dump_keeps_records(proxy, device):
+    from backend import monitoring_service
+    monitoring_service.collect_sessions_by_group(proxy.group_id)
+
+    # 헤더와 첫 행까지만 받고 스트림이 끊기면 부분 덤프로 동기화하지 않는다
+    device.lines = DUMP[:3]
+    device.error = ConnectionError('원격 명령 종료 상태를 받지 못했습니다 (출력이 중간에 끊겼을 수 있음)')
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 1
+    assert (stats['inserted'], stats['deleted']) == (0, 0)
+    assert '종료 상태' in stats['errors'][proxy.id]
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+    stats = monitoring_service.collect_sessions_by_proxy(proxy.id)
+    assert stats['failed'] == 1
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+
+def test_non_zero_exit_with_empty_output_keeps_records(proxy, device):
+    from backend import monitoring_service
+    monitoring_service.collect_sessions_by_group(proxy.group_id)
+
+    # 빈 출력은 정상 종료일 때만 "세션 없음"으로 본다
+    device.lines = []
+    device.error = RuntimeError('원격 명령 실패 (종료 코드 1)')
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 1
+    assert stats['deleted'] == 0
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+
+@pytest.fixture
+def channel(monkeypatch):
+    """실제 _iter_ssh_command_lines 가 읽을 가짜 채널 (state.channel 에 넣는다)"""
+    state = type('Remote', (), {'channel': None})()
+
+    @contextmanager
+    def session(self):
+        yield FakeClient(state.channel)
+
+    monkeypatch.setattr(ProxyMonitor, '_ssh_session', session)
+    monkeypatch.setattr(ProxyMonitor, '_invalidate_ssh_client', lambda self: None)
+    return state
+
+
+@pytest.mark.parametrize('chunks, exit_status, clean_result', [
+    ([''.join(DUMP[:3]).encode()], None, ['1']),
+    ([], 1, []),
+    ([''.join(DUMP[:2]).encode()], 1, []),
+])
+def test_incomplete_stream_skips_sync(proxy, channel, chunks, exit_status, clean_result):
+    from backend import monitoring_service
+    channel.channel = FakeChannel([''.join(DUMP).encode()])
+    monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+    channel.channel = FakeChannel(chunks, exit_status=exit_status)
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 1
+    assert stats['deleted'] == 0
+    assert stored_transactions(proxy.id) == ['1', '2']
+
+    # 같은 출력이라도 정상 종료면 동기화한다
+    channel.channel = FakeChannel(chunks)
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 0
+    assert stored_transactions(proxy.id) == clean_result
+
+
+def test_get_session_info_reports_error(proxy, device):
+    device.error = ConnectionError('SSH 연결 실패')
+    info = ProxyMonitor('192.0.2.1', username='u', password='pw').get_session_info()
+    assert info['sessions'] == []
+    assert 'SSH 연결 실패' in info['error']
+
+
+def test_group_stats_report_each_failed_proxy(proxy, device):
+    from backend import monitoring_service
+    device.error = ConnectionError('SSH 연결 실패')
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['failed'] == 1
+    assert stats['timed_out'] == 0
+    assert 'SSH 연결 실패' in stats['errors'][proxy.id]
+
+
+def test_history_is_opt_in(proxy, device):
+    from flask import current_app
+    from backend import monitoring_service
+    from models import SessionSnapshot
+    assert current_app.config['SESSION_HISTORY_ENABLED'] is False
+    monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert SessionSnapshot.query.count() == 0
+
+
+def test_failed_fetch_leaves_no_snapshot(proxy, device):
+    from flask import current_app
+    from backend import monitoring_service
+    from models import SessionSnapshot
+    current_app.config['SESSION_HISTORY_ENABLED'] = True
+    device.error = ConnectionError('SSH 연결 실패')
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert 'snapshot_id' not in stats
+    monitoring_service.collect_sessions_by_proxy(proxy.id)
+    assert SessionSnapshot.query.count() == 0
+
+    device.error = None
+    stats = monitoring_service.collect_sessions_by_group(proxy.group_id)
+    assert stats['snapshot_rows'] == 2
+    assert [s.row_count for s in SessionSnapshot.query] == [2]
@@ -0,0 +1,89 @@
+"""SNMP 메트릭 수집 계획 테스트
+
+컴파일한 MetricPlan 의 결과를 응답마다 설정 OID를 부분 문자열로 찾던 기존 방식과 비교한다.
+varBind 는 (OID 문자열, 값) 튜플로 흉내 낸다.
+"""
+
+import random
+
+import pytest
+
+from backend.snmp import MetricPlan, compile_metric_plan
+
+OIDS = {
+    'CPU': '1.3.6.1.4.1.1230.2.7.2.1.2.0',
+    'Memory': '1.3.6.1.4.1.1230.2.7.2.1.4.0',
+    'cc': '1.3.6.1.4.1.1230.2.7.2.5.1.0',
+    'cs': '1.3.6.1.4.1.1230.2.7.2.5.2.0',
+    'http': '1.3.6.1.4.1.1230.2.7.2.6.1',
+    'https': '1.3.6.1.4.1.1230.2.7.2.6.2',
+}
+
+
+def legacy_parse(var_binds, snmp_oids):
+    """기존 응답 처리 (설정 OID가 응답 OID의 부분 문자열인 첫 메트릭에 값을 넣는다)"""
+    result = {}
+    for oid, value in var_binds:
+        metric = next((desc for desc, cfg_oid in snmp_oids.items() if str(cfg_oid) in str(oid)), None)
+        if metric:
+            try:
+                int_value = int(value)
+                if metric in ['CPU', 'Memory'] and not (0 <= int_value <= 100):
+                    int_value = -1
+                result[metric.lower()] = int_value
+            except (ValueError, TypeError):
+                result[metric.lower()] = -1
+    for metric in snmp_oids:
+        result.setdefault(metric.lower(), -1)
+    return result
+
+
+def test_exact_responses_match_legacy_parse():
+    rng = random.Random(2)
+    plan = MetricPlan(OIDS)
+    for _ in range(200):
+        var_binds = [(oid, rng.choice([0, 7, 55, 100, 101, -3, 'x', None, '12']))
+                     for oid in rng.sample(list(OIDS.values()), rng.randint(0, len(OIDS)))]
+        assert plan.parse(var_binds) == legacy_parse(var_binds, OIDS)
+
+
+def test_instance_suffix_uses_longest_prefix():
+    plan = MetricPlan({'http': '1.3.6.1.4.1.1230.2.7.2.6', 'http_1': '1.3.6.1.4.1.1230.2.7.2.6.1'})
+    assert plan.lookup('1.3.6.1.4.1.1230.2.7.2.6.1.0') == ['http_1']
+    assert plan.lookup('1.3.6.1.4.1.1230.2.7.2.6.2.0') == ['http']
+    assert plan.lookup('1.3.6.1.4.1.1230.2.7.2.7.0') == []
+    var_binds = [('1.3.6.1.4.1.1230.2.7.2.6.2.0', 42)]
+    assert plan.parse(var_binds) == {'http': 42, 'http_1': -1}
+
+
+def test_prefix_matches_whole_oid_components():
+    # 기존 부분 문자열 비교는 1.2.3.1 이 1.2.3.10 응답에도 걸렸다
+    plan = MetricPlan({'a': '1.2.3.1', 'b': '1.2.3.10'})
+    assert plan.lookup('1.2.3.10') == ['b']
+    assert plan.lookup('1.2.3.1.5') == ['a']
+    assert plan.lookup('1.2.3.11') == []
+    assert legacy_parse([('1.2.3.10', 5)], {'a': '1.2.3.1', 'b': '1.2.3.10'}) == {'a': 5, 'b': -1}
+    assert plan.parse([('1.2.3.10', 5)]) == {'a': -1, 'b': 5}
+
+
+def test_aliases_share_one_wire_oid():
+    plan = MetricPlan({'cc': '1.2.3.4.0', 'clients': '.1.2.3.4.0 ', 'cs': '1.2.3.5.0'})
+    assert plan.wire_oids == ['1.2.3.4.0', '1.2.3.5.0']
+    assert plan.lookup('1.2.3.4.0') == ['cc', 'clients']
+    assert plan.parse([('1.2.3.4.0', 9), ('1.2.3.5.0', 'bad')]) == {'cc': 9, 'clients': 9, 'cs': -1}
+
+
+@pytest.mark.parametrize('metric, value, expected', [
+    ('CPU', 100, 100), ('CPU', 101, -1), ('Memory', -1, -1), ('cc', 5000, 5000), ('cc', '7', 7), ('cc', 'n/a', -1),
+])
+def test_value_conversion(metric, value, expected):
+    plan = MetricPlan({metric: '1.2.3'})
+    assert plan.parse([('1.2.3', value)]) == {metric.lower(): expected}
+
+
+def test_compiled_plan_is_cached_per_config():
+    plan = compile_metric_plan(OIDS)
+    assert compile_metric_plan(dict(OIDS)) is plan
+    changed = dict(OIDS, CPU='1.2.3')
+    assert compile_metric_plan(changed) is not plan
+    assert compile_metric_plan(changed).lookup('1.2.3') == ['CPU']
@@ -0,0 +1,79 @@
+"""SSH 연결 풀 테스트 (paramiko 연결 대신 가짜 클라이언트 사용)"""
+
+import pytest
+
+from backend.ssh_pool import SSHConnectionPool
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def set_keepalive(self, interval):
+        pass
+
+    def send_ignore(self):
+        pass
+
+
+class FakeClient:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+@pytest.fixture
+def pool():
+    pool = SSHConnectionPool(idle_ttl=0, sweep_interval=3600)
+    yield pool
+    pool.close_all()
+
+
+def test_leased_connection_is_not_evicted(pool):
+    with pool.lease('10.0.0.1', 22, 'u', 'pw', FakeClient) as client:
+        # 다른 장비의 acquire 와 정리 스레드가 호출하는 evict_idle
+        with pool.lease('10.0.0.2', 22, 'u', 'pw', FakeClient):
+            pass
+        assert pool.evict_idle() == 1
+        assert not client.closed
+    assert pool.evict_idle() == 1
+    assert client.closed
+
+
+def test_leases_are_counted_per_caller(pool):
+    first = pool.acquire('10.0.0.1', 22, 'u', 'pw', FakeClient)
+    second = pool.acquire('10.0.0.1', 22, 'u', 'pw', FakeClient)
+    assert first is second
+    assert pool.get_stats()['connections'][0]['leases'] == 2
+    pool.release('10.0.0.1', 22, 'u', first)
+    assert pool.evict_idle() == 0
+    pool.release('10.0.0.1', 22, 'u', second)
+    assert pool.evict_idle() == 1
+
+
+def test_release_of_replaced_connection_is_ignored(pool):
+    old = pool.acquire('10.0.0.1', 22, 'u', 'pw', FakeClient)
+    # 비밀번호 변경으로 교체된 뒤 이전 연결을 반납
+    new = pool.acquire('10.0.0.1', 22, 'u', 'pw2', FakeClient)
+    assert old.closed and new is not old
+    pool.release('10.0.0.1', 22, 'u', old)
+    assert pool.evict_idle() == 0
+    pool.release('10.0.0.1', 22, 'u', new)
+    assert pool.evict_idle() == 1
+
+
+def test_invalidate_closes_leased_connection(pool):
+    with pool.lease('10.0.0.1', 22, 'u', 'pw', FakeClient) as client:
+        pool.invalidate('10.0.0.1', 22, 'u')
+        assert client.closed
+    assert pool.get_stats()['active_connections'] == 0